@@ -13,137 +13,23 @@ import requests
 from PIL import Image
 import io
 from manim.opengl import *
+from image_service import get_image_service
+from video_utils import get_background_mobject
 
 
 def get_wikipedia_images(article_title, num_images=2, save_dir="./downloaded_images"):
     """
-    Fetches images from a Wikipedia article or related articles using the search API.
+    Fetches images for a Wikipedia article or related articles through the shared image service.
 
     Parameters:
     - article_title (str): The title or keyword to search for on Wikipedia.
     - num_images (int): The number of images to fetch.
-    - save_dir (str): The directory where images will be saved.
+    - save_dir (str): The image store directory.
 
     Returns:
     - list: A list of file paths to the downloaded images.
     """
-    # Ensure the save directory exists
-    os.makedirs(save_dir, exist_ok=True)
-
-    # Define a custom User-Agent header
-    headers = {
-        "User-Agent": "DocVideoMaker/1.0 (https://example.com; contact@example.com)"
-    }
-
-    # Step 1: Check if the article exists
-    url = "https://en.wikipedia.org/w/api.php"
-    params = {
-        "action": "query",
-        "format": "json",
-        "titles": article_title,
-        "prop": "images",
-        "imlimit": 20  
-    }
-    
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
-    print("Image data:", data)  # Debug API response
-    
-    pages = data.get("query", {}).get("pages", {})
-    page_id = list(pages.keys())[0] if pages else None
-
-    # Step 2: If the article is missing, use the search API
-    if not page_id or "missing" in pages[page_id]:
-        print(f"No article found for topic: {article_title}. Searching for related articles...")
-        search_url = "https://en.wikipedia.org/w/api.php"
-        search_params = {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": article_title,
-            "srlimit": 1  # Get the top result
-        }
-        search_response = requests.get(search_url, params=search_params, headers=headers)
-        search_data = search_response.json()
-        print("Search response:", search_data)  # Debug search response
-        
-        if "query" in search_data and "search" in search_data["query"]:
-            # Use the title of the top search result
-            article_title = search_data["query"]["search"][0]["title"]
-            print(f"Using related article: {article_title}")
-        else:
-            print(f"No related articles found for topic: {article_title}")
-            return []
-
-    # Step 3: Fetch images from the (possibly updated) article title
-    params["titles"] = article_title
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
-    print("Updated image data:", data)  # Debug updated API response
-    
-    pages = data.get("query", {}).get("pages", {})
-    page_id = list(pages.keys())[0] if pages else None
-    if not page_id or "images" not in pages[page_id]:
-        print(f"No images found for the article: {article_title}")
-        return []
-    
-    image_titles = [
-        img["title"] for img in pages[page_id]["images"]
-        if not img["title"].lower().endswith(".svg") and "logo" not in img["title"].lower() and "icon" not in img["title"].lower()
-    ]
-    print("Filtered image titles:", image_titles)  # Debug filtered titles
-    
-    image_titles = image_titles[:num_images]
-    image_paths = []
-    
-    for title in image_titles:
-        img_params = {
-            "action": "query",
-            "format": "json",
-            "titles": title,
-            "prop": "imageinfo",
-            "iiprop": "url"
-        }
-        
-        img_response = requests.get(url, params=img_params, headers=headers)
-        img_data = img_response.json()
-        print("Image URL data:", img_data)  # Debug URL response
-        
-        img_pages = img_data.get("query", {}).get("pages", {})
-        img_id = list(img_pages.keys())[0] if img_pages else None
-        if img_id and "imageinfo" in img_pages[img_id]:
-            img_url = img_pages[img_id]["imageinfo"][0]["url"]
-            print("Downloading image from:", img_url)  # Debug image URL
-            
-            try:
-                img_response = requests.get(img_url, headers=headers)
-                img_response.raise_for_status()  # Ensure the request was successful
-                
-                # Validate content type
-                if "image" not in img_response.headers.get("Content-Type", ""):
-                    print(f"Invalid content type for URL: {img_url}")
-                    continue
-                
-                # Save the image to the specified directory
-                file_name = os.path.basename(img_url)
-                save_path = os.path.join(save_dir, file_name)
-                with open(save_path, "wb") as img_file:
-                    img_file.write(img_response.content)
-                
-                # Validate the image using PIL
-                try:
-                    with Image.open(save_path) as img:
-                        img.verify()  # Verify the image is valid
-                    image_paths.append(save_path)
-                except Exception as e:
-                    print(f"Invalid image file: {save_path}, error: {e}")
-                    os.unlink(save_path)  # Remove invalid file
-                
-            except Exception as e:
-                print(f"Error downloading image: {e}")
-    
-    print("Downloaded image paths:", image_paths)  # Debug downloaded paths
-    return image_paths
+    return get_image_service(save_dir).get_images(article_title, num_images)
 
 class ComprehensiveVideoGenerator(CodeScene, VoiceoverSequenceDiagramScene):
     def __init__(self, content=None):
@@ -361,7 +247,7 @@ class ComprehensiveVideoGenerator(CodeScene, VoiceoverSequenceDiagramScene):
 
     def add_background(self, path):
         try:
-            background = OpenGLImageMobject(path)
+            background = get_background_mobject(path)
             self.add(background)
         except OSError as e:
             print(f"Error loading background image: {e}")
@@ -905,130 +791,16 @@ class ComprehensiveVideoGenerator(CodeScene, VoiceoverSequenceDiagramScene):
         # Helper methods needed for the timeline scene
     def get_wikimedia_image(self, search_term, save_dir="./downloaded_images"):
         """
-        Fetch image from Wikimedia with proper User-Agent, debugging, validation, and saving to a directory.
+        Fetch a single image for a search term through the shared image service.
 
         Parameters:
         - search_term (str): The term to search for on Wikimedia.
-        - save_dir (str): The directory where images will be saved.
+        - save_dir (str): The image store directory.
 
         Returns:
-        - str: The file path of the saved image, or None if no valid image is found.
+        - str: The file path of the stored image, or None if no valid image is found.
         """
-        print(f"Searching Wikimedia for: {search_term}")
-        
-        # Ensure the save directory exists
-        os.makedirs(save_dir, exist_ok=True)
-
-        try:
-            # Search for articles
-            search_params = {
-                "action": "query",
-                "format": "json",
-                "list": "search",
-                "srsearch": search_term,
-                "srlimit": 3
-            }
-            response = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params=search_params,
-                headers=self.headers
-            )
-            data = response.json()
-            print(f"Search response: {data}")  # Debugging
-
-            if "query" in data and data["query"]["search"]:
-                article_title = data["query"]["search"][0]["title"]
-                print(f"Found article: {article_title}")
-                
-                # Get images from the article
-                img_params = {
-                    "action": "query",
-                    "format": "json",
-                    "titles": article_title,
-                    "prop": "images",
-                    "imlimit": 10
-                }
-                img_response = requests.get(
-                    "https://en.wikipedia.org/w/api.php",
-                    params=img_params,
-                    headers=self.headers
-                )
-                img_data = img_response.json()
-                print(f"Image data: {img_data}")  # Debugging
-                
-                pages = img_data["query"]["pages"]
-                page_id = list(pages.keys())[0]
-                
-                if "images" in pages[page_id]:
-                    image_titles = [
-                        img["title"] for img in pages[page_id]["images"]
-                        if not img["title"].lower().endswith(".svg") 
-                        and "logo" not in img["title"].lower()
-                        and "icon" not in img["title"].lower()
-                    ]
-                    print(f"Filtered image titles: {image_titles}")  # Debugging
-                    
-                    if image_titles:
-                        # Get the URL of the first image
-                        img_info_params = {
-                            "action": "query",
-                            "format": "json",
-                            "titles": image_titles[0],
-                            "prop": "imageinfo",
-                            "iiprop": "url"
-                        }
-                        img_info_response = requests.get(
-                            "https://en.wikipedia.org/w/api.php",
-                            params=img_info_params,
-                            headers=self.headers
-                        )
-                        img_info_data = img_info_response.json()
-                        print(f"Image info data: {img_info_data}")  # Debugging
-                        
-                        img_info_pages = img_info_data["query"]["pages"]
-                        img_info_id = list(img_info_pages.keys())[0]
-                        
-                        if "imageinfo" in img_info_pages[img_info_id]:
-                            img_url = img_info_pages[img_info_id]["imageinfo"][0]["url"]
-                            print(f"Found image URL: {img_url}")
-                            
-                            try:
-                                # Download the image
-                                img_response = requests.get(img_url, headers=self.headers)
-                                img_response.raise_for_status()  # Ensure the request was successful
-                                
-                                # Validate content type
-                                if "image" not in img_response.headers.get("Content-Type", ""):
-                                    print(f"Invalid content type for URL: {img_url}")
-                                    return None
-                                
-                                # Save the image to the specified directory
-                                file_name = os.path.basename(img_url)
-                                save_path = os.path.join(save_dir, file_name)
-                                with open(save_path, "wb") as img_file:
-                                    img_file.write(img_response.content)
-                                
-                                # Validate the image using PIL
-                                try:
-                                    with Image.open(save_path) as img:
-                                        img.verify()  # Verify the image is valid
-                                    print(f"Image saved and validated: {save_path}")
-                                    return save_path
-                                except Exception as e:
-                                    print(f"Invalid image file: {save_path}, error: {e}")
-                                    os.unlink(save_path)  # Remove invalid file
-                                    return None
-                            
-                            except Exception as img_err:
-                                print(f"Error downloading or processing image: {img_err}")
-                                return None
-            
-            print(f"No image found for: {search_term}")
-            return None
-        
-        except Exception as e:
-            print(f"Error in get_wikimedia_image: {str(e)}")
-            return None
+        return get_image_service(save_dir).get_image(search_term)
 
     # Modify the construct method to include the new scene type
     def construct(self):
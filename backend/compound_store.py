@@ -0,0 +1,194 @@
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import requests
+
+from locked_json import update_json_file
+
+DEFAULT_STORE_DIR = "./compound_store"
+PUBCHEM_URL = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+PROPERTIES = "MolecularFormula,MolecularWeight,IUPACName"
+REQUEST_TIMEOUT = 10  # seconds
+OUTAGE_BACKOFF = 60  # seconds to stay offline after PubChem fails
+INDEX_FILE = "index.json"
+LOCK_FILE = ".index.lock"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_compound_store(store_dir=DEFAULT_STORE_DIR):
+    """Return the shared CompoundStore for a directory, creating it on first use"""
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = CompoundStore(store_dir)
+        return _stores[key]
+
+
+def normalize_name(name):
+    return " ".join(str(name).lower().split())
+
+
+class CompoundStore:
+    """
+    Local cache of PubChem compounds.
+
+    index.json maps normalized compound names to CIDs and keeps the properties
+    returned by the name lookup, and sdf/<cid>.sdf holds the structure files.
+    Known compounds never touch the network. After a failed request PubChem is
+    treated as unavailable for OUTAGE_BACKOFF seconds so an outage costs one
+    timeout rather than one per scene. Processes sharing the store merge the
+    names they resolved into index.json under a file lock (see locked_json).
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.sdf_dir = os.path.join(store_dir, "sdf")
+        self.index_path = os.path.join(store_dir, INDEX_FILE)
+        self.lock_path = os.path.join(store_dir, LOCK_FILE)
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+        self._lock = threading.RLock()
+        self._offline_until = 0
+        os.makedirs(self.sdf_dir, exist_ok=True)
+        self._index = self._load_index()
+        # Names resolved here and not yet merged into index.json
+        self._changed_names = {}
+        self._changed_properties = {}
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            index.setdefault("names", {})
+            index.setdefault("properties", {})
+            return index
+        except FileNotFoundError:
+            return {"names": {}, "properties": {}}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Compound index unreadable, starting empty: {e}")
+            return {"names": {}, "properties": {}}
+
+    def _save_index(self):
+        """Merge the names resolved here into index.json under the store's file lock"""
+        def merge(index):
+            index["names"].update(self._changed_names)
+            index["properties"].update(self._changed_properties)
+            self._index = index
+            return index
+
+        update_json_file(self.index_path, self.lock_path, self._load_index, merge)
+        self._changed_names.clear()
+        self._changed_properties.clear()
+
+    def _sdf_path(self, cid):
+        return os.path.join(self.sdf_dir, f"{cid}.sdf")
+
+    def _get(self, url):
+        """GET a PubChem URL, returning None while PubChem is considered down"""
+        if time.time() < self._offline_until:
+            return None
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            self.logger.error(f"PubChem unreachable, backing off for {OUTAGE_BACKOFF}s: {e}")
+            self._offline_until = time.time() + OUTAGE_BACKOFF
+            return None
+        if response.status_code >= 500:
+            self.logger.error(f"PubChem returned {response.status_code}, backing off for {OUTAGE_BACKOFF}s")
+            self._offline_until = time.time() + OUTAGE_BACKOFF
+            return None
+        return response
+
+    def _lookup_name(self, name):
+        """Resolve one name to a CID and its properties with a single request"""
+        response = self._get(f"{PUBCHEM_URL}/compound/name/{quote(name)}/property/{PROPERTIES}/JSON")
+        if response is None or response.status_code != 200:
+            return None
+        props_list = response.json().get("PropertyTable", {}).get("Properties", [])
+        return props_list[0] if props_list else None
+
+    def resolve_many(self, names):
+        """Return {name: cid} for every name PubChem or the index knows"""
+        keys = {name: normalize_name(name) for name in names}
+        with self._lock:
+            missing = sorted({key for key in keys.values() if key not in self._index["names"]})
+
+        if missing:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(5, len(missing))) as executor:
+                lookups = dict(zip(missing, executor.map(self._lookup_name, missing)))
+            with self._lock:
+                for key, props in lookups.items():
+                    if props is None:
+                        self.logger.warning(f"Compound not found: {key}")
+                        continue
+                    cid = props["CID"]
+                    self._index["names"][key] = self._changed_names[key] = cid
+                    self._index["properties"][str(cid)] = self._changed_properties[str(cid)] = props
+                self._save_index()
+
+        with self._lock:
+            return {
+                name: self._index["names"][key]
+                for name, key in keys.items() if key in self._index["names"]
+            }
+
+    def _download_sdfs(self, cids):
+        """Fetch several SDF records in one request and split them per CID"""
+        response = self._get(f"{PUBCHEM_URL}/compound/cid/{','.join(str(cid) for cid in cids)}/SDF")
+        if response is None or response.status_code != 200:
+            return
+        wanted = {str(cid) for cid in cids}
+        for record in response.text.split("$$$$"):
+            record = record.lstrip("\n")
+            # PubChem puts the CID on the title line of every record.
+            cid = record.split("\n", 1)[0].strip()
+            if cid not in wanted:
+                continue
+            path = self._sdf_path(cid)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(record + "$$$$\n")
+            os.replace(tmp_path, path)
+
+    def get_sdf_paths(self, names):
+        """Return {name: local SDF path} for every compound that could be resolved"""
+        resolved = self.resolve_many(names)
+        missing = sorted({cid for cid in resolved.values() if not os.path.exists(self._sdf_path(cid))})
+        if missing:
+            self._download_sdfs(missing)
+        return {
+            name: self._sdf_path(cid)
+            for name, cid in resolved.items()
+            if os.path.exists(self._sdf_path(cid))
+        }
+
+    def get_sdf_path(self, name):
+        """Return the local SDF path for a compound, or None"""
+        return self.get_sdf_paths([name]).get(name)
+
+    def get_cached_sdf_path(self, name):
+        """Return the local SDF path for a compound without touching the network, or None"""
+        with self._lock:
+            cid = self._index["names"].get(normalize_name(name))
+        if cid is None or not os.path.exists(self._sdf_path(cid)):
+            return None
+        return self._sdf_path(cid)
+
+    def get_properties(self, name):
+        """Return the cached PubChem properties for a compound, or None"""
+        cid = self.resolve_many([name]).get(name)
+        if cid is None:
+            return None
+        with self._lock:
+            return self._index["properties"].get(str(cid))
+
+    def prefetch(self, names):
+        """Resolve and download a batch of compounds ahead of rendering"""
+        return self.get_sdf_paths(list(dict.fromkeys(names)))
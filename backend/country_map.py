@@ -0,0 +1,130 @@
+import io
+import logging
+
+import matplotlib.pyplot as plt
+import numpy as np
+from manim import WHITE, config
+from manim.mobject.opengl.opengl_vectorized_mobject import OpenGLVGroup, OpenGLVMobject
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path as MplPath
+
+from image_store import get_image_store
+
+DEFAULT_FILL_COLOR = "#2E8B57"  # Sea green
+DEFAULT_STROKE_COLOR = WHITE
+DEFAULT_BACKGROUND_COLOR = "black"
+DEFAULT_MAP_DPI = 300
+DEFAULT_FIGSIZE = (10, 6)
+RASTER_CACHE_VERSION = 1  # bump when the plotting code changes the output
+
+logger = logging.getLogger(__name__)
+
+
+def _simplify_ring(ring, pixel_size):
+    """
+    Snap a ring to the output pixel grid and drop vertices that land on the
+    same pixel as their predecessor. Returns None for rings that collapse
+    below a visible size.
+    """
+    snapped = np.round(ring / pixel_size) * pixel_size
+    keep = np.ones(len(snapped), dtype=bool)
+    keep[1:] = (snapped[1:] != snapped[:-1]).any(axis=1)
+    snapped = snapped[keep]
+    if len(snapped) < 4:
+        return None
+    if (snapped[0] != snapped[-1]).any():
+        snapped = np.vstack([snapped, snapped[:1]])
+    return snapped
+
+
+def _ring_points(ring):
+    """Quadratic bezier points for a closed polyline, as OpenGL VMobjects store them"""
+    starts = np.column_stack([ring[:-1], np.zeros(len(ring) - 1)])
+    ends = np.column_stack([ring[1:], np.zeros(len(ring) - 1)])
+    return np.stack([starts, (starts + ends) / 2, ends], axis=1).reshape(-1, 3)
+
+
+def create_country_mobject(country, width=4.5, fill_color=DEFAULT_FILL_COLOR,
+                           stroke_color=DEFAULT_STROKE_COLOR, stroke_width=2):
+    """
+    Build a filled vector map of a country from its stored lon/lat rings.
+
+    The map is scaled to the given width in scene units and centered at the
+    origin. Vertices closer together than one output pixel are merged, so the
+    mobject carries no more detail than the frame can show.
+    """
+    min_lon, min_lat, max_lon, max_lat = country.bounds
+    scale = width / max(max_lon - min_lon, 1e-9)
+    center = np.array([(min_lon + max_lon) / 2, (min_lat + max_lat) / 2])
+    pixel_size = config.frame_width / config.pixel_width
+
+    country_map = OpenGLVGroup()
+    for polygon in country.polygons:
+        rings = [_simplify_ring((ring - center) * scale, pixel_size) for ring in polygon]
+        # Islands smaller than a pixel disappear along with their holes.
+        if rings[0] is None:
+            continue
+        shape = OpenGLVMobject(fill_color=fill_color, fill_opacity=1,
+                               stroke_color=stroke_color, stroke_width=stroke_width)
+        # Exterior and holes go into one mobject so the fill leaves the holes empty.
+        shape.set_points(np.vstack([_ring_points(ring) for ring in rings if ring is not None]))
+        country_map.add(shape)
+    return country_map
+
+
+def _raster_cache_key(country, fill_color, stroke_color, background_color, dpi, figsize, linewidth):
+    params = "&".join(f"{name}={value}" for name, value in [
+        ("fill", fill_color),
+        ("stroke", stroke_color),
+        ("background", background_color),
+        ("dpi", dpi),
+        ("figsize", "x".join(str(n) for n in figsize)),
+        ("linewidth", linewidth),
+        ("v", RASTER_CACHE_VERSION),
+    ])
+    return f"country-map://{country.name}?{params}"
+
+
+def render_country_png(country, fill_color=DEFAULT_FILL_COLOR, stroke_color="white",
+                       background_color=DEFAULT_BACKGROUND_COLOR, dpi=DEFAULT_MAP_DPI,
+                       figsize=DEFAULT_FIGSIZE, linewidth=3, store=None):
+    """
+    Return the path of a PNG map of a country, plotting it only on a cache miss.
+
+    Rendered maps live in the shared image store under a key made of the
+    country and every style and resolution parameter, so repeat scenes for the
+    same country skip matplotlib and the PNG encode.
+    """
+    store = store or get_image_store()
+    key = _raster_cache_key(country, fill_color, stroke_color, background_color, dpi, figsize, linewidth)
+    path = store.lookup_url(key)
+    if path is not None:
+        logger.info(f"Map cache hit for {country.name}")
+        return path
+
+    fig, ax = plt.subplots(figsize=figsize)
+    try:
+        vertices = np.concatenate(country.rings)
+        codes = np.concatenate([
+            [MplPath.MOVETO] + [MplPath.LINETO] * (len(ring) - 2) + [MplPath.CLOSEPOLY]
+            for ring in country.rings
+        ])
+        ax.add_patch(PathPatch(MplPath(vertices, codes),
+                               facecolor=fill_color, edgecolor=stroke_color, linewidth=linewidth))
+        min_lon, min_lat, max_lon, max_lat = country.bounds
+        ax.set_xlim(min_lon, max_lon)
+        ax.set_ylim(min_lat, max_lat)
+        ax.set_aspect('equal')
+
+        fig.patch.set_facecolor(background_color)
+        ax.set_facecolor(background_color)
+        ax.set_axis_off()
+        plt.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches='tight',
+                    facecolor=background_color, edgecolor='none')
+    finally:
+        plt.close(fig)
+
+    return store.add(buffer.getvalue(), source_url=key)
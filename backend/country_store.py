@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+NATURAL_EARTH_URL = "https://naturalearth.s3.amazonaws.com/110m_cultural/ne_110m_admin_0_countries.zip"
+DEFAULT_STORE_DIR = "./country_store"
+GEOMETRY_FILE = "countries.npz"
+ALIAS_FILE = "aliases.json"
+SIMPLIFY_TOLERANCE = 0.01  # degrees; well below a pixel for a whole-country map
+# Name columns in lookup priority order. Earlier columns win when two
+# countries share an alias, which keeps the old NAME -> NAME_LONG precedence.
+ALIAS_COLUMNS = ["NAME", "NAME_LONG", "ADMIN", "NAME_EN", "FORMAL_EN", "SOVEREIGNT", "ISO_A3", "ISO_A2", "ABBREV"]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_country_store(store_dir=DEFAULT_STORE_DIR):
+    """Return the worker-wide CountryStore for a directory, loading it on first use"""
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        # A missing store is checked again on each call, so building it takes effect without a restart
+        if key not in _stores or not _stores[key].available:
+            _stores[key] = CountryStore(store_dir)
+        return _stores[key]
+
+
+def normalize_name(name):
+    return " ".join(str(name).lower().replace(".", "").split())
+
+
+def build_country_store(store_dir=DEFAULT_STORE_DIR, source=NATURAL_EARTH_URL, tolerance=SIMPLIFY_TOLERANCE):
+    """
+    Ingest the Natural Earth countries dataset into a local store.
+
+    Only this step needs GeoPandas and network access. It writes simplified
+    polygons as flat NumPy arrays to countries.npz and the name/alias index to
+    aliases.json. Exterior rings are stored counter-clockwise and holes
+    clockwise so renderers can fill them with a nonzero winding rule.
+    """
+    import geopandas as gpd
+    from shapely.geometry.polygon import orient
+
+    logger = logging.getLogger(__name__)
+    logger.info(f"Ingesting country geometry from {source}")
+    world = gpd.read_file(source)
+    os.makedirs(store_dir, exist_ok=True)
+
+    names, bounds = [], []
+    country_offsets, polygon_offsets, ring_offsets = [0], [0], [0]
+    coords = []
+    for _, row in world.iterrows():
+        geometry = row.geometry
+        if geometry is None or geometry.is_empty:
+            continue
+        if tolerance:
+            geometry = geometry.simplify(tolerance, preserve_topology=True)
+        polygons = list(geometry.geoms) if geometry.geom_type == "MultiPolygon" else [geometry]
+
+        for polygon in polygons:
+            polygon = orient(polygon, sign=1.0)
+            for ring in [polygon.exterior, *polygon.interiors]:
+                ring_coords = np.asarray(ring.coords, dtype=np.float32)[:, :2]
+                coords.append(ring_coords)
+                ring_offsets.append(ring_offsets[-1] + len(ring_coords))
+            polygon_offsets.append(len(ring_offsets) - 1)
+        country_offsets.append(len(polygon_offsets) - 1)
+        names.append(row["NAME"])
+        bounds.append(geometry.bounds)
+
+    aliases = {}
+    for column in ALIAS_COLUMNS:
+        if column not in world.columns:
+            continue
+        index = 0
+        for _, row in world.iterrows():
+            if row.geometry is None or row.geometry.is_empty:
+                continue
+            value = row[column]
+            # Natural Earth uses "-99" for missing codes.
+            if isinstance(value, str) and value and value != "-99":
+                aliases.setdefault(normalize_name(value), index)
+            index += 1
+
+    geometry_path = os.path.join(store_dir, GEOMETRY_FILE)
+    tmp_path = f"{geometry_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            names=np.array(names),
+            bounds=np.array(bounds, dtype=np.float32),
+            country_offsets=np.array(country_offsets, dtype=np.int32),
+            polygon_offsets=np.array(polygon_offsets, dtype=np.int32),
+            ring_offsets=np.array(ring_offsets, dtype=np.int32),
+            coords=np.concatenate(coords),
+        )
+    os.replace(tmp_path, geometry_path)
+
+    alias_path = os.path.join(store_dir, ALIAS_FILE)
+    tmp_path = f"{alias_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(aliases, f)
+    os.replace(tmp_path, alias_path)
+
+    logger.info(f"Stored {len(names)} countries, {len(aliases)} aliases, {sum(len(c) for c in coords)} vertices")
+
+
+class Country:
+    """Geometry of one country as lists of (N, 2) lon/lat rings"""
+
+    def __init__(self, name, bounds, polygons):
+        self.name = name
+        self.bounds = bounds  # (min_lon, min_lat, max_lon, max_lat)
+        # Each polygon is [exterior, *holes].
+        self.polygons = polygons
+
+    @property
+    def rings(self):
+        return [ring for polygon in self.polygons for ring in polygon]
+
+
+class CountryStore:
+    """
+    Read-only country geometry and name index, loaded once per worker.
+
+    Lookups are a dict hit on the normalized name or any alias (long name,
+    formal name, ISO codes, ...). Only names missing from the index fall back
+    to a substring scan, and those results are memoized too. The store is
+    built offline by running this module (build_country_store); a worker
+    never downloads it. Without it every lookup returns None, so map scenes
+    show their "Map not found" placeholder.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        geometry_path = os.path.join(store_dir, GEOMETRY_FILE)
+        alias_path = os.path.join(store_dir, ALIAS_FILE)
+        self._countries = {}
+        self.available = os.path.exists(geometry_path) and os.path.exists(alias_path)
+        if not self.available:
+            self.logger.error(
+                f"Country store missing in {store_dir}; run `python country_store.py` to build it. "
+                f"Country maps will show a placeholder until then."
+            )
+            self.names = []
+            self.aliases = {}
+            return
+
+        with np.load(geometry_path) as data:
+            self.names = [str(name) for name in data["names"]]
+            self.bounds = data["bounds"]
+            self.country_offsets = data["country_offsets"]
+            self.polygon_offsets = data["polygon_offsets"]
+            self.ring_offsets = data["ring_offsets"]
+            self.coords = data["coords"]
+        with open(alias_path, "r") as f:
+            self.aliases = json.load(f)
+
+    def _country(self, index):
+        with self._lock:
+            if index in self._countries:
+                return self._countries[index]
+
+        polygons = []
+        for p in range(self.country_offsets[index], self.country_offsets[index + 1]):
+            rings = []
+            for r in range(self.polygon_offsets[p], self.polygon_offsets[p + 1]):
+                rings.append(self.coords[self.ring_offsets[r]:self.ring_offsets[r + 1]])
+            polygons.append(rings)
+        country = Country(self.names[index], tuple(float(b) for b in self.bounds[index]), polygons)
+
+        with self._lock:
+            self._countries[index] = country
+        return country
+
+    def lookup(self, name):
+        """Return the Country for a name, alias or ISO code, or None"""
+        key = normalize_name(name)
+        index = self.aliases.get(key)
+        if index is None and key:
+            index = next((i for i, n in enumerate(self.names) if key in normalize_name(n)), None)
+            if index is None:
+                return None
+            # Remember partial matches so the scan runs once per name.
+            with self._lock:
+                self.aliases[key] = index
+        return self._country(index) if index is not None else None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_country_store()
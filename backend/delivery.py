@@ -0,0 +1,239 @@
+"""
+Two-phase video delivery.
+
+start_render renders a low-fidelity preview of the scene JSON, records it in a
+manifest and returns straight away, while a detached process renders the full
+video and swaps the manifest over to it when done. Clients keep showing
+manifest["video_path"] and re-read the manifest until status is "ready".
+
+Both renders go through the render scheduler, so they wait their turn when
+the host is busy and are rejected with a retry hint when the queue is full.
+render_status adds the live queue position to the manifest.
+
+The full render is checkpointed scene by scene (see render_checkpoint), so
+retry_render after a crash resumes from the first unfinished scene instead
+of starting over.
+
+start_render takes an optional latency target for the full render, counted
+from the request; render_full degrades quality to meet what is left of it
+(see render_deadline) and records the degradations in the manifest.
+
+Run as a script to perform the full render of a queued job:
+
+    python delivery.py media/manifests/<output_name>.job.json
+"""
+import json
+import logging
+import os
+import sys
+import time
+
+from render_options import FULL_RENDER_OPTIONS, PREVIEW_RENDER_OPTIONS, make_render_options
+from render_scheduler import RenderRejected, estimate_job_demand, get_render_scheduler
+from scene_schemas import validate_video_json
+
+DEFAULT_MANIFEST_DIR = "./media/manifests"
+# A deadline already missed still degrades as far as possible rather than not at all
+MIN_DEADLINE_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def manifest_path(output_name, manifest_dir=DEFAULT_MANIFEST_DIR):
+    return os.path.join(manifest_dir, f"{output_name}.json")
+
+
+def read_manifest(output_name, manifest_dir=DEFAULT_MANIFEST_DIR):
+    """Return the delivery manifest for a video, or None if there is none"""
+    try:
+        with open(manifest_path(output_name, manifest_dir), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(manifest, manifest_dir):
+    path = manifest_path(manifest["output_name"], manifest_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    manifest["updated_at"] = time.time()
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    # Readers see either the old or the new manifest, never a partial one.
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def start_render(json_content, manifest_dir=DEFAULT_MANIFEST_DIR, queue_timeout=None, deadline_seconds=None):
+    """
+    Render a preview now and the full video in the background.
+
+    Returns the manifest, whose video_path points at the preview until the
+    full render replaces it. Raises ValueError for invalid scene JSON and
+    render_scheduler.RenderRejected when the render queue has no room for
+    both renders; its retry_after says when to try again. With
+    deadline_seconds the full render is degraded as needed to be ready that
+    many seconds after this call.
+    """
+    from direct_video_generator import generate_video_from_json
+
+    requested_at = time.time()
+    # Bad JSON fails here, before it takes a place in the queue.
+    json_content, _ = validate_video_json(json_content)
+    os.makedirs(manifest_dir, exist_ok=True)
+    output_name = json_content.get('output_name', 'GeneratedVideo')
+    scheduler = get_render_scheduler()
+    # The full render is queued after the preview; turn the request away now
+    # rather than render a preview whose full render has no place to go.
+    scheduler.ensure_room(2)
+
+    # The preview always uses the preview encoder settings.
+    preview_json = {k: v for k, v in json_content.items() if k not in ('encoding_profile', 'deadline_at')}
+    preview_json['output_name'] = f"{output_name}_preview"
+
+    def report_queued(ticket):
+        _write_manifest({
+            "output_name": output_name,
+            "status": "queued",
+            "queue_position": ticket["position"],
+            "estimated_wait": ticket["estimated_wait"],
+            "video_path": None,
+            "preview_path": None,
+            "full_path": None,
+        }, manifest_dir)
+
+    preview_demand = estimate_job_demand(preview_json, PREVIEW_RENDER_OPTIONS, in_process=True)
+    with scheduler.slot(f"{output_name}:preview", preview_demand, queue_timeout, on_queued=report_queued):
+        preview_path = generate_video_from_json(preview_json, PREVIEW_RENDER_OPTIONS)
+
+    job_path = os.path.join(manifest_dir, f"{output_name}.job.json")
+    if deadline_seconds:
+        json_content = dict(json_content, deadline_at=requested_at + deadline_seconds)
+    with open(job_path, "w") as f:
+        json.dump(json_content, f)
+    manifest = _submit_full_render({
+        "output_name": output_name,
+        "status": "preview",
+        "video_path": preview_path,
+        "preview_path": preview_path,
+        "full_path": None,
+    }, json_content, job_path, manifest_dir)
+    logger.info(f"Preview for {output_name} ready at {preview_path}; full render {manifest['full_status']}")
+    return manifest
+
+
+def _submit_full_render(manifest, json_content, job_path, manifest_dir):
+    """
+    Queue the full render of a job with the scheduler and record its ticket in the manifest.
+
+    Raises RenderRejected if the queue filled up in the meantime; the manifest
+    keeps full_status "rejected" and retry_after, and retry_render queues the
+    job again.
+    """
+    full_demand = estimate_job_demand(json_content, FULL_RENDER_OPTIONS)
+    ticket = get_render_scheduler().submit(
+        f"{manifest['output_name']}:full",
+        full_demand,
+        argv=[sys.executable, os.path.abspath(__file__), job_path, manifest_dir],
+        log_path=os.path.join(manifest_dir, f"{manifest['output_name']}.log"),
+    )
+    manifest.update(
+        full_status=ticket["status"],
+        queue_position=ticket["position"],
+        estimated_wait=ticket.get("estimated_wait"),
+        estimated_seconds=full_demand["seconds"],
+        retry_after=ticket.get("retry_after"),
+    )
+    _write_manifest(manifest, manifest_dir)
+    if ticket["status"] == "rejected":
+        raise RenderRejected(
+            f"Full render of {manifest['output_name']} rejected, queue is full", ticket["retry_after"]
+        )
+    return manifest
+
+
+def retry_render(output_name, manifest_dir=DEFAULT_MANIFEST_DIR):
+    """
+    Queue the full render of a job again after it failed, its worker died or
+    the queue turned it away.
+
+    Scenes finished by earlier attempts are reused from the checkpoint.
+    Returns the updated manifest, or None if the job is unknown or done;
+    raises RenderRejected if the queue is still full.
+    """
+    job_path = os.path.join(manifest_dir, f"{output_name}.job.json")
+    manifest = read_manifest(output_name, manifest_dir)
+    if manifest is None or manifest.get("status") == "ready" or not os.path.exists(job_path):
+        return None
+    with open(job_path, "r") as f:
+        json_content = json.load(f)
+    manifest.pop("full_error", None)
+    return _submit_full_render(manifest, json_content, job_path, manifest_dir)
+
+
+def render_status(output_name, manifest_dir=DEFAULT_MANIFEST_DIR):
+    """The manifest of a video with the live state of its full render in this process"""
+    manifest = read_manifest(output_name, manifest_dir)
+    ticket = get_render_scheduler().status(f"{output_name}:full")
+    if manifest is not None and ticket is not None and manifest.get("status") != "ready":
+        manifest.update(
+            full_status=ticket["status"],
+            queue_position=ticket["position"],
+            estimated_wait=ticket["estimated_wait"],
+        )
+    return manifest
+
+
+def render_full(job_path, manifest_dir=DEFAULT_MANIFEST_DIR):
+    """Render the full video for a queued job and point its manifest at it"""
+    from direct_video_generator import generate_video_with_checkpoints
+    from render_checkpoint import RenderCheckpoint
+
+    with open(job_path, "r") as f:
+        json_content = json.load(f)
+    output_name = json_content.get('output_name', 'GeneratedVideo')
+    manifest = read_manifest(output_name, manifest_dir) or {
+        "output_name": output_name,
+        "preview_path": None,
+        "video_path": None,
+    }
+
+    options = FULL_RENDER_OPTIONS
+    if json_content.get('deadline_at'):
+        # Time spent on the preview and in the queue counts against the deadline
+        options = make_render_options(
+            FULL_RENDER_OPTIONS,
+            deadline_seconds=max(json_content['deadline_at'] - time.time(), MIN_DEADLINE_SECONDS),
+        )
+
+    report = {}
+    try:
+        full_path = generate_video_with_checkpoints(json_content, options, report=report)
+    except Exception as e:
+        logger.error(f"Full render of {output_name} failed: {e}")
+        done, total = RenderCheckpoint(output_name).progress()
+        manifest.update(
+            status="failed" if manifest.get("preview_path") is None else "preview",
+            full_status="failed",
+            full_error=str(e),
+            scenes_completed=done,
+            scenes_total=total,
+        )
+        _write_manifest(manifest, manifest_dir)
+        raise
+
+    manifest.update(
+        status="ready",
+        video_path=full_path,
+        full_path=full_path,
+        full_status="finished",
+        fallback_scenes=report.get("fallback_scenes", []),
+        deadline=report.get("deadline"),
+    )
+    _write_manifest(manifest, manifest_dir)
+    os.remove(job_path)
+    return manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    render_full(sys.argv[1], *sys.argv[2:3])
@@ -0,0 +1,67 @@
+"""
+Compare encoding profiles on a rendered video.
+
+Usage: python encoding_benchmark.py media/videos/480p15/SomeVideo.mp4 [--runs 3] [--mbps 1.5] [--fps 15]
+
+Each profile re-encodes the input (best of N runs) and the table reports
+encode time, output size, average bitrate and the estimated download time on
+a mobile link of the given speed. Keyframe intervals follow the input's own
+frame rate unless --fps overrides it.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from encoding_profiles import ENCODING_PROFILES, encode_video, probe_duration, probe_frame_rate
+
+
+def run_benchmark(input_path, runs=3, link_mbps=1.5, fps=None):
+    """Encode input_path with every profile; fps defaults to the input's frame rate"""
+    duration = probe_duration(input_path)
+    if not duration:
+        raise RuntimeError(f"Could not read the duration of {input_path}")
+    fps = fps or probe_frame_rate(input_path)
+    if not fps:
+        raise RuntimeError(f"Could not read the frame rate of {input_path}; pass --fps")
+    input_size = os.path.getsize(input_path)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ENCODING_PROFILES:
+            output_path = os.path.join(tmp_dir, f"{name}.mp4")
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                if encode_video(input_path, output_path, name, fps=fps) is None:
+                    raise RuntimeError(f"Profile '{name}' failed to encode {input_path}")
+                timings.append(time.perf_counter() - start)
+            size = os.path.getsize(output_path)
+            rows.append({
+                "profile": name,
+                "encode_s": min(timings),
+                "size_kb": size / 1024,
+                "kbps": size * 8 / 1000 / duration,
+                "download_s": size * 8 / (link_mbps * 1_000_000),
+                "vs_input": size / input_size,
+            })
+    return duration, fps, input_size, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark encoding profiles on a rendered video")
+    parser.add_argument("input", help="Rendered mp4 to re-encode")
+    parser.add_argument("--runs", type=int, default=3, help="Encodes per profile; the fastest is reported")
+    parser.add_argument("--mbps", type=float, default=1.5, help="Mobile link speed for download estimates")
+    parser.add_argument("--fps", type=float, default=None, help="Frame rate the keyframe interval is based on; defaults to the input's")
+    args = parser.parse_args()
+
+    duration, fps, input_size, rows = run_benchmark(args.input, args.runs, args.mbps, args.fps)
+    print(f"Input: {args.input} ({duration:.1f}s at {fps:g} fps, {input_size / 1024:.0f} KB)")
+    print(f"{'profile':<10} {'encode s':>9} {'size KB':>9} {'kbps':>7} {'dl s @' + str(args.mbps) + 'Mbps':>14} {'vs input':>9}")
+    for row in rows:
+        print(f"{row['profile']:<10} {row['encode_s']:>9.2f} {row['size_kb']:>9.0f} {row['kbps']:>7.0f} "
+              f"{row['download_s']:>14.1f} {row['vs_input']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
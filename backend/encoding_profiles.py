@@ -0,0 +1,199 @@
+import logging
+import os
+import re
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# x264 settings for flat-colour slides, diagrams and text. "tune animation"
+# favours large flat areas and more reference frames, and the long GOP lets
+# static holds cost almost nothing. Scene-cut detection stays on, so every
+# real cut still gets a keyframe for seeking.
+ENCODING_PROFILES = {
+    # Fast turnaround for previews; bigger files are fine.
+    "preview": {"preset": "ultrafast", "crf": 30, "tune": "animation", "gop_seconds": 10},
+    # Default delivery for phones on mobile data.
+    "mobile": {"preset": "medium", "crf": 27, "tune": "animation", "gop_seconds": 10},
+    "standard": {"preset": "medium", "crf": 23, "tune": "animation", "gop_seconds": 10},
+    # Highest quality, for keeping masters.
+    "archive": {"preset": "slow", "crf": 18, "tune": "animation", "gop_seconds": 5},
+}
+DEFAULT_PROFILE = "mobile"
+
+
+def get_profile(name):
+    """Return an encoding profile by name, falling back to the default profile"""
+    if name not in ENCODING_PROFILES:
+        logger.warning(f"Unknown encoding profile '{name}', using '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+    return ENCODING_PROFILES[name]
+
+
+def ffmpeg_video_args(profile_name, fps=30):
+    """ffmpeg output arguments for the video stream of a profile"""
+    profile = get_profile(profile_name)
+    gop = max(1, int(round(fps * profile["gop_seconds"])))
+    return [
+        "-c:v", "libx264",
+        "-preset", profile["preset"],
+        "-tune", profile["tune"],
+        "-crf", str(profile["crf"]),
+        "-g", str(gop),
+        "-keyint_min", str(min(gop, int(fps))),
+        "-pix_fmt", "yuv420p",
+    ]
+
+
+def encode_video(input_path, output_path=None, profile_name=DEFAULT_PROFILE, fps=30, ffmpeg_executable="ffmpeg"):
+    """
+    Re-encode a rendered video with an encoding profile.
+
+    Audio is copied unchanged and the moov atom is moved to the front of the
+    file (faststart), so players can start streaming before the download
+    finishes. Without output_path the input file is replaced. Returns the
+    path of the encoded file, or None if ffmpeg failed; a failed in-place
+    encode leaves the original file untouched.
+    """
+    output_path = output_path or input_path
+    root, ext = os.path.splitext(output_path)
+    tmp_path = f"{root}.{os.getpid()}.encoding{ext}"
+    command = [
+        ffmpeg_executable, "-y",
+        "-loglevel", "error",
+        "-i", input_path,
+        *ffmpeg_video_args(profile_name, fps),
+        "-c:a", "copy",
+        "-movflags", "+faststart",
+        tmp_path,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"Encoding {input_path} with profile '{profile_name}' failed: {result.stderr.strip()}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+    os.replace(tmp_path, output_path)
+    logger.info(f"Encoded {output_path} with profile '{profile_name}' ({os.path.getsize(output_path)} bytes)")
+    return output_path
+
+
+def probe_audio(path, ffmpeg_executable="ffmpeg"):
+    """Return (sample_rate, channel_layout) of a file's first audio stream, or None without one"""
+    result = subprocess.run([ffmpeg_executable, "-hide_banner", "-i", path], capture_output=True, text=True)
+    match = re.search(r"Audio: .*?(\d+) Hz, ([\w.()]+)", result.stderr)
+    return (int(match.group(1)), match.group(2)) if match else None
+
+
+def probe_duration(path, ffmpeg_executable="ffmpeg"):
+    """Return the duration of a media file in seconds, or None if ffmpeg cannot read it"""
+    result = subprocess.run([ffmpeg_executable, "-hide_banner", "-i", path], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_frame_rate(path, ffmpeg_executable="ffmpeg"):
+    """Return the frame rate of a file's first video stream, or None without one"""
+    result = subprocess.run([ffmpeg_executable, "-hide_banner", "-i", path], capture_output=True, text=True)
+    match = re.search(r"Video: .*?(\d+(?:\.\d+)?) fps", result.stderr)
+    return float(match.group(1)) if match else None
+
+
+def concat_videos(input_paths, output_path, ffmpeg_executable="ffmpeg"):
+    """
+    Join clips rendered with the same video settings into one file.
+
+    Video is stream-copied. Clips without sound get a silent track matching
+    the others, so every input has the same streams, and audio is
+    re-encoded so the joins stay in sync. Returns output_path, or None if
+    ffmpeg failed.
+    """
+    audio = {path: probe_audio(path, ffmpeg_executable) for path in input_paths}
+    audio_format = next((fmt for fmt in audio.values() if fmt), None)
+    work_dir = os.path.dirname(os.path.abspath(output_path))
+    temp_paths = []
+    try:
+        sources = []
+        for path in input_paths:
+            if audio_format and not audio[path]:
+                silent_path = os.path.join(work_dir, f"{os.getpid()}.silent.{len(temp_paths)}.mp4")
+                sample_rate, layout = audio_format
+                result = subprocess.run([
+                    ffmpeg_executable, "-y", "-loglevel", "error",
+                    "-i", path,
+                    "-f", "lavfi", "-i", f"anullsrc=channel_layout={layout}:sample_rate={sample_rate}",
+                    "-c:v", "copy", "-c:a", "aac", "-shortest",
+                    silent_path,
+                ], capture_output=True, text=True)
+                temp_paths.append(silent_path)
+                if result.returncode != 0:
+                    logger.error(f"Adding a silent track to {path} failed: {result.stderr.strip()}")
+                    return None
+                path = silent_path
+            sources.append(path)
+
+        list_path = os.path.join(work_dir, f"{os.getpid()}.concat.txt")
+        temp_paths.append(list_path)
+        with open(list_path, "w") as f:
+            for path in sources:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        command = [
+            ffmpeg_executable, "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c:v", "copy",
+            *(["-c:a", "aac"] if audio_format else ["-an"]),
+            "-movflags", "+faststart",
+            output_path,
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.error(f"Joining {len(sources)} clips into {output_path} failed: {result.stderr.strip()}")
+            return None
+        logger.info(f"Joined {len(sources)} clips into {output_path}")
+        return output_path
+    finally:
+        for path in temp_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def mix_background_music(video_path, music_path, ffmpeg_executable="ffmpeg"):
+    """
+    Mix a music track under the sound of a video, in place.
+
+    The music is looped and cut to the length of the video, so it plays
+    across every scene of a video joined from clips. Video is stream-copied.
+    Returns video_path, or None if ffmpeg failed; the video is then left
+    untouched.
+    """
+    root, ext = os.path.splitext(video_path)
+    tmp_path = f"{root}.{os.getpid()}.music{ext}"
+    if probe_audio(video_path, ffmpeg_executable):
+        # amix halves each input; the volume filter restores the voiceover level
+        audio_args = [
+            "-filter_complex", "[0:a][1:a]amix=inputs=2:duration=first:dropout_transition=0,volume=2[a]",
+            "-map", "0:v", "-map", "[a]",
+        ]
+    else:
+        audio_args = ["-map", "0:v", "-map", "1:a", "-shortest"]
+    command = [
+        ffmpeg_executable, "-y", "-loglevel", "error",
+        "-i", video_path,
+        "-stream_loop", "-1", "-i", music_path,
+        *audio_args,
+        "-c:v", "copy", "-c:a", "aac",
+        tmp_path,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"Mixing {music_path} into {video_path} failed: {result.stderr.strip()}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    os.replace(tmp_path, video_path)
+    logger.info(f"Mixed background music {music_path} into {video_path}")
+    return video_path
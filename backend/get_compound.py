@@ -1,50 +1,39 @@
-import requests
+import shutil
+from compound_store import get_compound_store
 
 def download_mol_file(filename, compound_name):
-    """Download MOL file from PubChem"""
+    """Copy the MOL file for a compound from the local compound store, fetching it from PubChem if needed"""
     try:
-        # Get compound CID
-        search_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{compound_name}/property/MolecularFormula/JSON"
-        response = requests.get(search_url, timeout=600)
-        
-        if response.status_code == 200:
-            data = response.json()
-            cid = data['PropertyTable']['Properties'][0]['CID']
-            
-            # Download MOL file
-            mol_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/SDF"
-            mol_response = requests.get(mol_url, timeout=600)
-            
-            if mol_response.status_code == 200:
-                with open(filename, 'w') as f:
-                    f.write(mol_response.text)
-                print(f"Downloaded {filename}")
-                return True
+        sdf_path = get_compound_store().get_sdf_path(compound_name)
+        if sdf_path:
+            shutil.copyfile(sdf_path, filename)
+            print(f"Downloaded {filename}")
+            return True
     except Exception as e:
         print(f"Download failed: {e}")
     
     return False
 
 def get_compound_info(compound_name):
-    """Get additional compound information from PubChem"""
+    """Get additional compound information from the local compound store"""
     try:
-        info_url = (
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/"
-            f"{compound_name}/property/MolecularFormula,MolecularWeight,IUPACName/JSON"
-        )
-        response = requests.get(info_url, timeout=600)
-        if response.status_code == 200:
-            data = response.json()
-            props_list = data.get('PropertyTable', {}).get('Properties', [])
-            if not props_list:
-                return "No compound information found."
-            props = props_list[0]
-            iupac = props.get('IUPACName', 'N/A')
-            info_lines = [
-                f"Molecular Formula: {props.get('MolecularFormula', 'N/A')}",
-                f"Molecular Weight: {props.get('MolecularWeight', 'N/A')}",
-                f"IUPAC Name: {iupac[:50]}..." if iupac and len(iupac) > 50 else f"IUPAC Name: {iupac}"
-            ]
-            return "\n".join(info_lines)
+        props = get_compound_store().get_properties(compound_name)
+        if not props:
+            return "No compound information found."
+        iupac = props.get('IUPACName', 'N/A')
+        info_lines = [
+            f"Molecular Formula: {props.get('MolecularFormula', 'N/A')}",
+            f"Molecular Weight: {props.get('MolecularWeight', 'N/A')}",
+            f"IUPAC Name: {iupac[:50]}..." if iupac and len(iupac) > 50 else f"IUPAC Name: {iupac}"
+        ]
+        return "\n".join(info_lines)
     except Exception as e:
-        print(f"Error getting compound info: {e}")
\ No newline at end of file
+        print(f"Error getting compound info: {e}")
+
+def get_mol_files(compound_names):
+    """Resolve several compounds at once and return {name: local SDF path}"""
+    try:
+        return get_compound_store().prefetch(compound_names)
+    except Exception as e:
+        print(f"Batch compound lookup failed: {e}")
+        return {}
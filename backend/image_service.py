@@ -0,0 +1,186 @@
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from PIL import Image, ImageDraw
+from requests.adapters import HTTPAdapter
+
+from image_store import DEFAULT_STORE_DIR, DEFAULT_SVG_RASTER_WIDTH, get_image_store
+from locked_json import update_json_file
+from wikipedia_image_fetcher import WikipediaImageFetcher
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'DocVideoMaker/1.0 (https://example.com; contact@example.com)'
+}
+TOPIC_INDEX_FILE = "topics.json"
+TOPIC_LOCK_FILE = ".topics.lock"
+TOPIC_TTL = 7 * 24 * 3600  # resolved topics are refreshed after a week
+EMPTY_TOPIC_TTL = 3600  # topics without images are retried after an hour
+POOL_SIZE = 16
+PLACEHOLDER_SIZE = (800, 600)
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_image_service(store_dir=DEFAULT_STORE_DIR):
+    """Return the process-wide ImageService for a store directory"""
+    key = os.path.abspath(store_dir)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = ImageService(store_dir)
+        return _services[key]
+
+
+def _normalize_topic(topic):
+    return " ".join(str(topic).lower().split())
+
+
+class ImageService:
+    """
+    Single entry point for topic images used by every scene generator.
+
+    Topics resolved once are remembered in topics.json next to the image store,
+    so later requests for the same topic skip the Wikipedia/Openverse round trips
+    entirely. Worker processes sharing the store merge their new topics into
+    the file under a file lock (see locked_json). All HTTP traffic goes through one pooled keep-alive session and
+    images are downloaded concurrently by WikipediaImageFetcher.
+
+    SVG results are rasterized at the width asked for (see
+    image_store.svg_raster_width); a cached topic with SVG rasters narrower
+    than that is fetched again.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, headers=None, svg_raster_width=DEFAULT_SVG_RASTER_WIDTH):
+        self.store = get_image_store(store_dir)
+        self.topics_path = os.path.join(store_dir, TOPIC_INDEX_FILE)
+        self.topics_lock_path = os.path.join(store_dir, TOPIC_LOCK_FILE)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._topics = self._load_topics()
+        # Topics resolved here and not yet merged into topics.json
+        self._changed_topics = {}
+        self._placeholder_path = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.headers = headers or DEFAULT_HEADERS
+        self.svg_raster_width = svg_raster_width
+        self._fetchers = {}
+        self.fetcher = self._fetcher(svg_raster_width)
+
+    def _fetcher(self, svg_raster_width):
+        """Fetcher rasterizing SVGs at a width; all of them share the session and store"""
+        with self._lock:
+            if svg_raster_width not in self._fetchers:
+                self._fetchers[svg_raster_width] = WikipediaImageFetcher(
+                    headers=self.headers,
+                    store=self.store,
+                    session=self.session,
+                    svg_raster_width=svg_raster_width,
+                )
+            return self._fetchers[svg_raster_width]
+
+    def _load_topics(self):
+        try:
+            with open(self.topics_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Topic cache unreadable, starting empty: {e}")
+            return {}
+
+    def _save_topics(self):
+        """Merge the topics resolved here into topics.json; the newer resolution of a topic wins"""
+        def merge(topics):
+            for key, entry in self._changed_topics.items():
+                if key not in topics or topics[key].get("resolved_at", 0) <= entry["resolved_at"]:
+                    topics[key] = entry
+            self._topics = topics
+            return topics
+
+        update_json_file(self.topics_path, self.topics_lock_path, self._load_topics, merge)
+        self._changed_topics.clear()
+
+    def _cached_images(self, key, num_images, svg_raster_width):
+        with self._lock:
+            entry = self._topics.get(key)
+        if entry is None:
+            return None
+        if entry.get("svg_raster_width") and entry["svg_raster_width"] < svg_raster_width:
+            return None
+
+        paths = entry["paths"]
+        ttl = TOPIC_TTL if paths else EMPTY_TOPIC_TTL
+        if time.time() - entry["resolved_at"] > ttl:
+            return None
+        if paths and len(paths) < num_images and not entry.get("exhausted"):
+            return None
+        # Evicted images invalidate the topic so it is fetched again.
+        if not all(self.store.touch(path) for path in paths[:num_images]):
+            return None
+        return paths[:num_images]
+
+    def get_cached_images(self, topic, num_images=2, svg_raster_width=None):
+        """Return the stored image paths for a topic, or None if it would need a fetch"""
+        return self._cached_images(_normalize_topic(topic), num_images, svg_raster_width or self.svg_raster_width)
+
+    def get_images(self, topic, num_images=2, svg_raster_width=None):
+        """Return up to num_images local image paths for a topic, rasterizing SVGs at svg_raster_width"""
+        key = _normalize_topic(topic)
+        svg_raster_width = svg_raster_width or self.svg_raster_width
+        cached = self._cached_images(key, num_images, svg_raster_width)
+        if cached is not None:
+            self.logger.info(f"Topic cache hit for '{topic}' ({len(cached)} images)")
+            return cached
+
+        try:
+            paths, complete = self._fetcher(svg_raster_width).fetch_images(topic, num_images, self.store.store_dir)
+        except Exception as e:
+            self.logger.error(f"Image lookup failed for '{topic}': {e}")
+            return []
+        if len(paths) < num_images and not complete:
+            # A timeout or rate limit is not an answer; ask the sources again next time
+            self.logger.warning(f"Image lookup for '{topic}' hit errors, not caching its {len(paths)} images")
+            return paths
+
+        with self._lock:
+            self._topics[key] = self._changed_topics[key] = {
+                "paths": paths,
+                "resolved_at": time.time(),
+                # Every source answered, so fewer images than asked for means they have nothing more.
+                "exhausted": len(paths) < num_images,
+                # Only topics with SVG results depend on the raster width
+                "svg_raster_width": min(
+                    (width for width in map(self.store.svg_width, paths) if width), default=None
+                ),
+            }
+            self._save_topics()
+        return paths
+
+    def get_image(self, topic):
+        """Return a single local image path for a topic, or None"""
+        paths = self.get_images(topic, num_images=1)
+        return paths[0] if paths else None
+
+    def get_placeholder_image(self):
+        """Return a local neutral placeholder image, used instead of fetching in previews"""
+        if self._placeholder_path is None or not self.store.touch(self._placeholder_path):
+            img = Image.new("RGB", PLACEHOLDER_SIZE, (60, 60, 60))
+            draw = ImageDraw.Draw(img)
+            width, height = PLACEHOLDER_SIZE
+            draw.rectangle([8, 8, width - 9, height - 9], outline=(140, 140, 140), width=6)
+            draw.line([8, 8, width - 9, height - 9], fill=(100, 100, 100), width=4)
+            draw.line([8, height - 9, width - 9, 8], fill=(100, 100, 100), width=4)
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG")
+            # Same bytes every time, so the store keeps a single copy.
+            self._placeholder_path = self.store.add(buffer.getvalue())
+        return self._placeholder_path
@@ -0,0 +1,457 @@
+import atexit
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from locked_json import update_json_file
+
+DEFAULT_STORE_DIR = "./downloaded_images"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+INDEX_FILE = "index.json"
+LOCK_FILE = ".index.lock"
+# Access times are only written back this often; structural changes are saved at once
+TOUCH_SAVE_INTERVAL = 30  # seconds
+NORMALIZED_MAX_SIZE = 1024  # longest side, in pixels, of the pre-decoded RGBA copy
+NORMALIZED_SUFFIX = ".rgba.npy"
+# Stored images are shown at most about a third of the frame wide, so SVGs
+# are rasterized at half the output width, rounded up to a multiple of
+# SVG_WIDTH_STEP so nearby output sizes share one raster.
+SVG_FRAME_SHARE = 0.5
+SVG_WIDTH_STEP = 256
+
+
+def svg_raster_width(pixel_width):
+    """Pixel width to rasterize SVGs at for output pixel_width pixels wide"""
+    return max(SVG_WIDTH_STEP, math.ceil(pixel_width * SVG_FRAME_SHARE / SVG_WIDTH_STEP) * SVG_WIDTH_STEP)
+
+
+DEFAULT_SVG_RASTER_WIDTH = svg_raster_width(1920)  # 1080p output
+
+_FORMAT_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "GIF": ".gif",
+    "WEBP": ".webp",
+    "BMP": ".bmp",
+    "TIFF": ".tif",
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_image_store(store_dir=DEFAULT_STORE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Return the shared ImageStore for a directory, creating it on first use"""
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ImageStore(store_dir, max_bytes)
+        return _stores[key]
+
+
+def find_image_store(path):
+    """Return the ImageStore that owns a file path, or None if it is not a stored image"""
+    store_dir = os.path.dirname(os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(store_dir)
+    if store is None and os.path.exists(os.path.join(store_dir, INDEX_FILE)):
+        store = get_image_store(store_dir)
+    return store
+
+
+def _normalize(img):
+    """Convert a decoded image to RGBA capped at NORMALIZED_MAX_SIZE"""
+    img = img.convert("RGBA")
+    if max(img.size) > NORMALIZED_MAX_SIZE:
+        img.thumbnail((NORMALIZED_MAX_SIZE, NORMALIZED_MAX_SIZE), Image.LANCZOS)
+    return np.asarray(img, dtype=np.uint8)
+
+
+class ImageStore:
+    """
+    Content-addressed image store with a metadata index and LRU eviction.
+
+    Files are named after the SHA-256 of their bytes, so the same image fetched
+    from different URLs or topics is only kept once. The index maps source URLs
+    to content hashes and records dimensions, format, size and last access time
+    for every stored image. Next to each original the store keeps a capped RGBA
+    copy as a .npy file that scenes memory-map instead of decoding.
+
+    SVG sources are kept as-is and rasterized on demand; each PNG is remembered
+    per (source hash, width) so a diagram is only rasterized once per size.
+
+    Several worker processes may share a store. Each keeps the index in
+    memory and, when saving, re-reads index.json under a file lock and merges
+    its own changes into it, so no process overwrites another's entries.
+    Access times are batched and written every TOUCH_SAVE_INTERVAL seconds.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(store_dir, INDEX_FILE)
+        self.lock_path = os.path.join(store_dir, LOCK_FILE)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        os.makedirs(store_dir, exist_ok=True)
+        self._index = self._load_index()
+        # Local changes not yet merged into index.json
+        self._changed = set()
+        self._forgotten = set()
+        self._touched = set()
+        self._changed_urls = {}
+        self._saved_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            index.setdefault("images", {})
+            index.setdefault("urls", {})
+            return index
+        except FileNotFoundError:
+            return {"images": {}, "urls": {}}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Image store index unreadable, starting empty: {e}")
+            return {"images": {}, "urls": {}}
+
+    def _merge_into(self, index):
+        """Apply this process's pending changes to an index read from disk"""
+        images = index["images"]
+        for digest in self._forgotten:
+            entry = images.pop(digest, None)
+            for url in (entry or {}).get("source_urls", []):
+                if index["urls"].get(url) == digest:
+                    del index["urls"][url]
+        for digest in self._changed:
+            local = self._index["images"].get(digest)
+            if local is None:
+                continue
+            disk = images.get(digest)
+            if disk is None:
+                # Ours, unless another process evicted it and its file is gone
+                if os.path.exists(self._path_for(digest, local)):
+                    images[digest] = local
+                continue
+            merged = dict(disk, **local)
+            merged["source_urls"] = disk.get("source_urls", []) + [
+                url for url in local.get("source_urls", []) if url not in disk.get("source_urls", [])
+            ]
+            if "rasters" in disk or "rasters" in local:
+                merged["rasters"] = dict(disk.get("rasters", {}), **local.get("rasters", {}))
+            merged["last_access"] = max(disk["last_access"], local["last_access"])
+            images[digest] = merged
+        for digest in self._touched - self._changed:
+            if digest in images and digest in self._index["images"]:
+                images[digest]["last_access"] = max(
+                    images[digest]["last_access"], self._index["images"][digest]["last_access"]
+                )
+        for url, digest in self._changed_urls.items():
+            if digest in images:
+                index["urls"][url] = digest
+
+    def _save_index(self, keep=None):
+        """Merge pending changes into index.json under the store's file lock, evicting if over budget"""
+        def merge(index):
+            self._merge_into(index)
+            self._index = index
+            self._evict(keep=keep)
+            return self._index
+
+        update_json_file(self.index_path, self.lock_path, self._load_index, merge)
+        self._changed.clear()
+        self._forgotten.clear()
+        self._touched.clear()
+        self._changed_urls.clear()
+        self._saved_at = time.monotonic()
+
+    def _save_touches(self):
+        """Save batched access times once TOUCH_SAVE_INTERVAL has passed since the last save"""
+        if self._touched and time.monotonic() - self._saved_at >= TOUCH_SAVE_INTERVAL:
+            self._save_index()
+
+    def flush(self):
+        """Write any batched access times to index.json"""
+        with self._lock:
+            if self._touched or self._changed or self._forgotten or self._changed_urls:
+                try:
+                    self._save_index()
+                except OSError as e:
+                    self.logger.warning(f"Could not save image store index: {e}")
+
+    def _path_for(self, digest, entry):
+        return os.path.join(self.store_dir, digest + entry["ext"])
+
+    def _normalized_path_for(self, digest):
+        return os.path.join(self.store_dir, digest + NORMALIZED_SUFFIX)
+
+    def _write_normalized(self, digest, pixels):
+        path = self._normalized_path_for(digest)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, pixels)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _touch(self, digest):
+        self._index["images"][digest]["last_access"] = time.time()
+        self._touched.add(digest)
+
+    def _changed_entry(self, digest):
+        self._changed.add(digest)
+        self._forgotten.discard(digest)
+
+    def _add_url(self, url, digest):
+        self._index["urls"][url] = digest
+        self._changed_urls[url] = digest
+
+    def get_entry(self, path):
+        """Return the index entry for a stored file path, or None"""
+        digest = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            entry = self._index["images"].get(digest)
+            return dict(entry, hash=digest) if entry else None
+
+    def touch(self, path):
+        """Mark a stored file as recently used. Returns False if it is no longer stored."""
+        digest = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            entry = self._index["images"].get(digest)
+            if entry is None or not os.path.exists(self._path_for(digest, entry)):
+                return False
+            self._touch(digest)
+            self._save_touches()
+            return True
+
+    def lookup_url(self, url):
+        """Return the local path for an already stored URL, or None"""
+        with self._lock:
+            digest = self._index["urls"].get(url)
+            entry = self._index["images"].get(digest) if digest else None
+            if entry is None or entry["format"] == "SVG":
+                return None
+            path = self._path_for(digest, entry)
+            if not os.path.exists(path):
+                self._forget(digest)
+                self._save_index()
+                return None
+            self._touch(digest)
+            self._save_touches()
+            return path
+
+    def add(self, content, source_url=None):
+        """
+        Verify and store image bytes.
+
+        Returns the local path of the stored image, or None if the bytes are not
+        a readable image.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            entry = self._index["images"].get(digest)
+            if entry and os.path.exists(self._path_for(digest, entry)):
+                self._touch(digest)
+                if source_url and self._index["urls"].get(source_url) != digest:
+                    self._add_url(source_url, digest)
+                    entry.setdefault("source_urls", [])
+                    if source_url not in entry["source_urls"]:
+                        entry["source_urls"].append(source_url)
+                    self._changed_entry(digest)
+                    self._save_index()
+                else:
+                    self._save_touches()
+                return self._path_for(digest, entry)
+
+        try:
+            # Decoding here both validates the image and produces the
+            # render-ready RGBA copy, so scenes never decode it again.
+            with Image.open(io.BytesIO(content)) as img:
+                img.load()
+                width, height = img.size
+                image_format = img.format
+                pixels = _normalize(img)
+        except Exception as e:
+            self.logger.error(f"Rejected invalid image from {source_url}: {e}")
+            return None
+
+        entry = {
+            "ext": _FORMAT_EXTENSIONS.get(image_format, ".img"),
+            "source_urls": [source_url] if source_url else [],
+            "width": width,
+            "height": height,
+            "format": image_format,
+            "normalized_width": int(pixels.shape[1]),
+            "normalized_height": int(pixels.shape[0]),
+            "last_access": time.time(),
+        }
+        path = self._path_for(digest, entry)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        entry["size"] = len(content) + self._write_normalized(digest, pixels)
+
+        with self._lock:
+            self._index["images"][digest] = entry
+            self._changed_entry(digest)
+            if source_url:
+                self._add_url(source_url, digest)
+            self._save_index(keep=digest)
+
+        self.logger.info(f"Stored image {digest[:12]} ({width}x{height} {image_format}, {len(content)} bytes)")
+        return path
+
+    def lookup_svg(self, url):
+        """Return the content hash of an already stored SVG source URL, or None"""
+        with self._lock:
+            digest = self._index["urls"].get(url)
+            entry = self._index["images"].get(digest) if digest else None
+            if entry is None or entry["format"] != "SVG":
+                return None
+            if not os.path.exists(self._path_for(digest, entry)):
+                self._forget(digest)
+                self._save_index()
+                return None
+            return digest
+
+    def add_svg(self, content, source_url=None):
+        """Store SVG source bytes and return their content hash"""
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            entry = self._index["images"].get(digest)
+            if entry is None:
+                entry = {
+                    "ext": ".svg",
+                    "source_urls": [],
+                    "width": None,
+                    "height": None,
+                    "format": "SVG",
+                    "size": len(content),
+                    "rasters": {},
+                    "last_access": time.time(),
+                }
+                path = self._path_for(digest, entry)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+                self._index["images"][digest] = entry
+            if source_url:
+                self._add_url(source_url, digest)
+                if source_url not in entry["source_urls"]:
+                    entry["source_urls"].append(source_url)
+            self._touch(digest)
+            self._changed_entry(digest)
+            self._save_index(keep=digest)
+        return digest
+
+    def rasterize_svg(self, svg_digest, width=DEFAULT_SVG_RASTER_WIDTH):
+        """
+        Return a PNG of a stored SVG rendered at the given pixel width,
+        rasterizing it only if that size is not cached yet.
+        """
+        with self._lock:
+            entry = self._index["images"][svg_digest]
+            svg_path = self._path_for(svg_digest, entry)
+            raster_digest = entry["rasters"].get(str(width))
+            raster_entry = self._index["images"].get(raster_digest) if raster_digest else None
+            self._touch(svg_digest)
+        if raster_entry is not None:
+            raster_path = self._path_for(raster_digest, raster_entry)
+            if self.touch(raster_path):
+                return raster_path
+
+        self.logger.info(f"Rasterizing SVG {svg_digest[:12]} at {width}px wide")
+        import cairosvg  # needs the cairo library, so only loaded for SVGs
+
+        png = cairosvg.svg2png(url=svg_path, output_width=width)
+        raster_path = self.add(png)
+        if raster_path is None:
+            return None
+
+        raster_digest = os.path.splitext(os.path.basename(raster_path))[0]
+        with self._lock:
+            entry = self._index["images"].get(svg_digest)
+            if entry is not None:
+                entry["rasters"][str(width)] = raster_digest
+                self._changed_entry(svg_digest)
+            raster_entry = self._index["images"].get(raster_digest)
+            if raster_entry is not None:
+                raster_entry["svg_width"] = width
+                self._changed_entry(raster_digest)
+            self._save_index()
+        return raster_path
+
+    def svg_width(self, path):
+        """Width a stored PNG was rasterized from an SVG at, or None if it is not an SVG raster"""
+        entry = self.get_entry(path)
+        return entry.get("svg_width") if entry else None
+
+    def load_normalized(self, path):
+        """
+        Return the pre-decoded RGBA pixels of a stored image as a read-only,
+        memory-mapped array of shape (height, width, 4).
+
+        The array is rebuilt from the original file if it is missing, e.g. for
+        entries created before normalization was added.
+        """
+        digest = os.path.splitext(os.path.basename(path))[0]
+        normalized_path = self._normalized_path_for(digest)
+        if not os.path.exists(normalized_path):
+            with Image.open(path) as img:
+                pixels = _normalize(img)
+            normalized_size = self._write_normalized(digest, pixels)
+            with self._lock:
+                entry = self._index["images"].get(digest)
+                if entry is not None:
+                    entry["size"] += normalized_size
+                    entry["normalized_width"] = int(pixels.shape[1])
+                    entry["normalized_height"] = int(pixels.shape[0])
+                    self._changed_entry(digest)
+                    self._save_index()
+        return np.load(normalized_path, mmap_mode="r")
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["size"] for entry in self._index["images"].values())
+
+    def _forget(self, digest):
+        entry = self._index["images"].pop(digest, None)
+        if entry is None:
+            return None
+        self._forgotten.add(digest)
+        self._changed.discard(digest)
+        for url in entry.get("source_urls", []):
+            if self._index["urls"].get(url) == digest:
+                del self._index["urls"][url]
+        return entry
+
+    def _evict(self, keep=None):
+        total = sum(entry["size"] for entry in self._index["images"].values())
+        if total <= self.max_bytes:
+            return
+        by_age = sorted(self._index["images"].items(), key=lambda item: item[1]["last_access"])
+        for digest, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            path = self._path_for(digest, entry)
+            self._forget(digest)
+            total -= entry["size"]
+            for stale_path in (path, self._normalized_path_for(digest)):
+                try:
+                    os.unlink(stale_path)
+                except FileNotFoundError:
+                    pass
+            self.logger.info(f"Evicted image {digest[:12]} ({entry['size']} bytes)")
@@ -1,6 +1,22 @@
+import bisect
 import json
+import logging
 import re
-from typing import Any
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_CHUNK = re.compile(r'[^"\\]*')
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_FENCE = re.compile(r'```[a-zA-Z]*[ \t]*\n?')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_LITERALS = (('true', True), ('false', False), ('null', None))
+_VALUE_START = set('{["-0123456789tfn')
+_OBJECT_START = re.compile(r'\{')
+_ARRAY_START = re.compile(r'\[')
+_MAX_START_ATTEMPTS = 8  # per bracket kind; bounds the retries when prose is full of brackets
+
 
 def clean_generated_text(generated_text: str) -> dict[str, Any]:
     """
@@ -8,111 +24,392 @@ def clean_generated_text(generated_text: str) -> dict[str, Any]:
     Specifically handles common issues in AI-generated JSON.
     """
     try:
-        # First try direct parsing
-        try:
-            return json.loads(generated_text)
-        except json.JSONDecodeError:
-            pass
-
-        # Try to extract JSON from markdown code blocks first
-        code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', generated_text, re.DOTALL)
-        if code_block_match:
-            json_text = code_block_match.group(1)
-        else:
-            # Extract JSON content between curly braces
-            json_match = re.search(r'\{.*\}', generated_text, re.DOTALL)
-            if not json_match:
-                raise ValueError("No valid JSON found in generated text")
-            json_text = json_match.group(0)
-        
-        # Debug: Show what we extracted
-        print(f"Extracted JSON length: {len(json_text)}")
-        print(f"First 200 chars: {json_text[:200]}")
-        
-        # Apply specific fixes for this AI's output patterns
-        json_text = _fix_ai_json_issues(json_text)
-        
-        # Final parsing attempt
+        return json.loads(generated_text)
+    except json.JSONDecodeError:
+        pass
+
+    result, repairs = parse_generated_json(generated_text)
+    if repairs:
+        logger.info(f"Repaired generated JSON: {summarize_repairs(repairs)}")
+    return result
+
+
+def parse_generated_json(generated_text: str) -> tuple[Any, list[dict[str, Any]]]:
+    """
+    Parse JSON out of model output in a single linear pass per start.
+
+    Tolerates surrounding prose (brackets in it are skipped in favour of an
+    object that parses to the end of the text), ``` code fences, missing commas between
+    members or elements, trailing commas, raw newlines inside strings and
+    output that stops before its containers are closed. Returns the parsed
+    value and the list of repairs that were needed, each a dict with "type",
+    "position", "line" and "column". Raises ValueError if the text cannot be
+    read as JSON even with those repairs.
+    """
+    parser = _TolerantParser(generated_text)
+    result = parser.parse()
+    return result, parser.located_repairs()
+
+
+def summarize_repairs(repairs: list[dict[str, Any]]) -> dict[str, int]:
+    """Count repairs by type"""
+    summary: dict[str, int] = {}
+    for repair in repairs:
+        summary[repair["type"]] = summary.get(repair["type"], 0) + 1
+    return summary
+
+
+class _TolerantParser:
+    """Recursive-descent JSON parser that records the repairs it makes instead of failing"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.repairs: list[tuple[str, int]] = []
+
+    def repair(self, repair_type: str, position: Optional[int] = None):
+        self.repairs.append((repair_type, self.pos if position is None else position))
+
+    def located_repairs(self) -> list[dict[str, Any]]:
+        if not self.repairs:
+            return []
+        newlines = [i for i, char in enumerate(self.text) if char == '\n']
+        located = []
+        for repair_type, position in self.repairs:
+            line = bisect.bisect_left(newlines, position)
+            line_start = newlines[line - 1] + 1 if line else 0
+            located.append({
+                "type": repair_type,
+                "position": position,
+                "line": line + 1,
+                "column": position - line_start + 1,
+            })
+        return located
+
+    def error(self, message: str):
+        context = self.text[max(0, self.pos - 50):self.pos + 50]
+        raise ValueError(f"Failed to parse JSON: {message} at position {self.pos}\nProblem area: {context}")
+
+    def skip_whitespace(self):
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+
+    def peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def parse(self) -> Any:
+        text = self.text
+        object_starts = [match.start() for match in _OBJECT_START.finditer(text)][:_MAX_START_ATTEMPTS]
+        array_starts = [match.start() for match in _ARRAY_START.finditer(text)][:_MAX_START_ATTEMPTS]
+        if not object_starts and not array_starts:
+            raise ValueError("No valid JSON found in generated text")
+        # Brackets in prose ("see [1]", "{name}") are not the document. Objects
+        # are tried before arrays, and the first candidate that is an object
+        # and reaches the end of the text wins; otherwise the first object
+        # that parsed (or failing that, the first array) is used.
+        best = None
+        first_error = None
+        for start in object_starts + array_starts:
+            self.repairs = []
+            try:
+                result = self.parse_from(start)
+            except ValueError as e:
+                first_error = first_error or e
+                continue
+            complete = not any(repair == "ignored_trailing_text" for repair, _ in self.repairs)
+            if isinstance(result, dict) and complete:
+                return result
+            if best is None or (isinstance(result, dict) and not isinstance(best[0], dict)):
+                best = (result, self.repairs)
+        if best is None:
+            raise first_error
+        result, self.repairs = best
+        return result
+
+    def parse_from(self, start: int) -> Any:
+        text = self.text
+        self.pos = start
+        # Only a fence before the JSON wraps it; fences inside strings are content.
+        fence = _FENCE.search(text, 0, self.pos)
+        if fence:
+            self.repair("stripped_code_fence", fence.start())
+        elif text[:self.pos].strip():
+            self.repair("skipped_leading_text", 0)
+
+        result = self.parse_value()
+
+        self.skip_whitespace()
+        trailing = text[self.pos:]
+        if trailing and trailing.strip().strip('`').strip():
+            self.repair("ignored_trailing_text")
+        return result
+
+    def parse_value(self) -> Any:
+        self.skip_whitespace()
+        char = self.peek()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char == '"':
+            return self.parse_string()
+        if char == '-' or char.isdigit():
+            return self.parse_number()
+        for literal, value in _LITERALS:
+            if self.text.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return value
+        if not char:
+            self.error("unexpected end of input")
+        self.error(f"unexpected character {char!r}")
+
+    def parse_object(self) -> dict[str, Any]:
+        self.pos += 1
+        result: dict[str, Any] = {}
+        while True:
+            self.skip_whitespace()
+            char = self.peek()
+            if char == '}':
+                self.pos += 1
+                return result
+            if not char:
+                self.repair("closed_unterminated_object")
+                return result
+            if char != '"':
+                self.error("expected a property name")
+            key = self.parse_string()
+            self.skip_whitespace()
+            if self.peek() == ':':
+                self.pos += 1
+            elif self.peek() in _VALUE_START:
+                self.repair("missing_colon")
+            else:
+                self.error("expected ':' after property name")
+            result[key] = self.parse_value()
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                comma = self.pos
+                self.pos += 1
+                self.skip_whitespace()
+                if self.peek() == '}':
+                    self.repair("removed_trailing_comma", comma)
+            elif char == '"':
+                self.repair("inserted_missing_comma")
+            elif char != '}' and char:
+                self.error("expected ',' or '}' after property value")
+
+    def parse_array(self) -> list[Any]:
+        self.pos += 1
+        result: list[Any] = []
+        while True:
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ']':
+                self.pos += 1
+                return result
+            if not char:
+                self.repair("closed_unterminated_array")
+                return result
+            result.append(self.parse_value())
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                comma = self.pos
+                self.pos += 1
+                self.skip_whitespace()
+                if self.peek() == ']':
+                    self.repair("removed_trailing_comma", comma)
+            elif char in _VALUE_START:
+                self.repair("inserted_missing_comma")
+            elif char != ']' and char:
+                self.error("expected ',' or ']' after array element")
+
+    def parse_string(self) -> str:
+        text = self.text
+        start = self.pos
+        self.pos += 1
+        chunks = []
+        while True:
+            end = _STRING_CHUNK.match(text, self.pos).end()
+            chunks.append(text[self.pos:end])
+            self.pos = end
+            if end >= len(text):
+                self.repair("closed_unterminated_string", start)
+                break
+            if text[end] == '"':
+                self.pos += 1
+                break
+            # Backslash escape
+            escape = text[end + 1:end + 2]
+            if escape == 'u' and re.fullmatch(r'[0-9a-fA-F]{4}', text[end + 2:end + 6]):
+                code = int(text[end + 2:end + 6], 16)
+                self.pos = end + 6
+                if 0xD800 <= code < 0xDC00 and text.startswith('\\u', self.pos):
+                    low = text[self.pos + 2:self.pos + 6]
+                    if re.fullmatch(r'[dD][c-fC-F][0-9a-fA-F]{2}', low):
+                        code = 0x10000 + ((code - 0xD800) << 10) + (int(low, 16) - 0xDC00)
+                        self.pos += 6
+                chunks.append(chr(code))
+            elif escape in _ESCAPES:
+                chunks.append(_ESCAPES[escape])
+                self.pos = end + 2
+            else:
+                # Keep an invalid escape such as "\d" literally.
+                self.repair("kept_invalid_escape", end)
+                chunks.append('\\' + escape)
+                self.pos = end + 1 + len(escape)
+        raw = text[start:self.pos]
+        if '\n' in raw or '\r' in raw or '\t' in raw:
+            self.repair("kept_control_character", start)
+        return ''.join(chunks)
+
+    def parse_number(self) -> Union[int, float]:
+        match = _NUMBER.match(self.text, self.pos)
+        if not match or not match.group(0).lstrip('-'):
+            self.error("invalid number")
+        self.pos = match.end()
+        number = match.group(0)
+        if '.' in number or 'e' in number or 'E' in number:
+            return float(number)
+        return int(number)
+
+
+_STRUCTURE = re.compile(r'[{}\[\]",:]')
+_STRING_END = re.compile(r'["\\]')
+
+
+class SceneStreamParser:
+    """
+    Incremental parser for a streamed video JSON document.
+
+    Feed it chunks of model output as they arrive; feed() returns every object
+    of the top-level "scenes" array that was closed by that chunk, parsed with
+    the same tolerance rules as parse_generated_json and with Pango markup
+    stripped as clean_json does. Scanning is linear in the total input, and
+    only the text of the scene currently being generated is buffered for
+    parsing. close() parses the whole document once the stream has ended.
+    """
+
+    def __init__(self, scene_types_to_clean=None):
+        self.scene_types_to_clean = scene_types_to_clean
+        self.repairs: list[dict[str, Any]] = []
+        self.scenes_emitted = 0
+        self._chunks: list[str] = []
+        self._stack: list[str] = []
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._string_parts: list[str] = []
+        # The last key of the top-level object, and whether a ':' was just
+        # seen there, so string values are never taken for keys.
+        self._top_level_key = None
+        self._after_colon = False
+        self._scenes_level = None
+        self._scene_parts = None
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Consume a chunk of output and return the scenes it completed"""
+        from json_cleaner import clean_json
+
+        self._chunks.append(chunk)
+        completed = []
+        scene_from = 0 if self._scene_parts is not None else None
+        pos = 0
+        length = len(chunk)
+
+        while pos < length:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    if len(self._stack) == 1:
+                        self._string_parts.append(chunk[pos])
+                    pos += 1
+                    continue
+                match = _STRING_END.search(chunk, pos)
+                end = match.start() if match else length
+                if len(self._stack) == 1:
+                    self._string_parts.append(chunk[pos:end])
+                if not match:
+                    break
+                if match.group() == '\\':
+                    self._escaped = True
+                    if len(self._stack) == 1:
+                        self._string_parts.append('\\')
+                    pos = end + 1
+                    continue
+                self._in_string = False
+                if len(self._stack) == 1:
+                    self._end_top_level_string()
+                pos = end + 1
+                continue
+
+            match = _STRUCTURE.search(chunk, pos)
+            if not match:
+                break
+            char = match.group()
+            pos = match.end()
+            if not self._started:
+                # Prose and code fences before the document are skipped.
+                if char not in '{[':
+                    continue
+                self._started = True
+
+            if char == '"':
+                self._in_string = True
+                self._string_parts = []
+            elif char in ',:':
+                if len(self._stack) == 1:
+                    self._after_colon = char == ':'
+            elif char in '{[':
+                self._after_colon = False
+                if (char == '{' and self._scenes_level is not None
+                        and len(self._stack) == self._scenes_level and self._scene_parts is None):
+                    self._scene_parts = []
+                    scene_from = pos - 1
+                self._stack.append(char)
+                if (char == '[' and self._scenes_level is None and self._stack[:1] == ['{']
+                        and len(self._stack) == 2 and self._top_level_key == 'scenes'):
+                    self._scenes_level = 2
+            elif self._stack:
+                self._stack.pop()
+                if self._scenes_level is not None and len(self._stack) < self._scenes_level:
+                    # The scenes array itself closed.
+                    self._scenes_level = None if char == ']' else self._scenes_level
+                if (char == '}' and self._scene_parts is not None
+                        and len(self._stack) == self._scenes_level):
+                    self._scene_parts.append(chunk[scene_from:pos])
+                    scene_text = ''.join(self._scene_parts)
+                    self._scene_parts = None
+                    scene_from = None
+                    completed.append(self._parse_scene(scene_text, clean_json))
+
+        if self._scene_parts is not None and scene_from is not None:
+            self._scene_parts.append(chunk[scene_from:])
+        return completed
+
+    def _end_top_level_string(self):
+        raw = ''.join(self._string_parts)
         try:
-            return json.loads(json_text)
-        except json.JSONDecodeError as e:
-            _log_json_error(e, json_text)
-            raise ValueError(
-                f"Failed to parse JSON after cleaning: {str(e)}\n"
-                f"Problem area: {json_text[max(0,e.pos-50):e.pos+50]}"
-            ) from e
-
-    except Exception as e:
-        if 'json_text' in locals():
-            print(f"Full problematic JSON content:\n{json_text[:500]}...")
-        raise ValueError(f"JSON processing failed: {str(e)}") from e
-
-def _fix_ai_json_issues(json_text: str) -> str:
-    """Fix specific issues found in this AI's JSON output"""
-    
-    # Debug: Print the original JSON to see what we're working with
-    print(f"Original JSON snippet: {json_text[:200]}...")
-    
-    # MAIN FIX: Handle the specific pattern where commas are missing between key-value pairs
-    # This is a more aggressive approach that looks for the exact pattern from the error
-    
-    # Step 1: Fix the most common pattern: "value""key": should be "value","key":
-    # This handles cases like: "Indirect_CP_Violation""scenes":
-    json_text = re.sub(r'("(?:[^"\\]|\\.)*")(\s*)("(?:[^"\\]|\\.)*"\s*:)', r'\1,\2\3', json_text)
-    
-    # Step 2: Fix missing commas after closing braces/brackets before keys
-    json_text = re.sub(r'([}\]])(\s*)("(?:[^"\\]|\\.)*"\s*:)', r'\1,\2\3', json_text)
-    
-    # Step 3: Fix missing commas after numbers before keys
-    json_text = re.sub(r'(\d)(\s*)("(?:[^"\\]|\\.)*"\s*:)', r'\1,\2\3', json_text)
-    
-    # Step 4: Fix missing commas after booleans/null before keys
-    json_text = re.sub(r'(true|false|null)(\s*)("(?:[^"\\]|\\.)*"\s*:)', r'\1,\2\3', json_text)
-    
-    # Step 5: Remove trailing commas before closing braces/brackets
-    json_text = re.sub(r',\s*([}\]])', r'\1', json_text)
-    
-    # Step 6: Handle any remaining edge cases with a more general approach
-    # Look for any case where we have two consecutive strings without comma
-    lines = json_text.split('\n')
-    fixed_lines = []
-    
-    for i, line in enumerate(lines):
-        # Check if this line ends with a string and next line starts with a string (key)
-        if i < len(lines) - 1:
-            current_stripped = line.strip()
-            next_stripped = lines[i + 1].strip()
-            
-            # Pattern: line ends with quoted string, next line starts with quoted string followed by colon
-            if (current_stripped.endswith('"') and 
-                next_stripped.startswith('"') and 
-                ':' in next_stripped and
-                not current_stripped.endswith(',') and
-                not current_stripped.endswith(',"')):
-                # Add comma to current line
-                if current_stripped == line:
-                    line = line + ','
-                else:
-                    line = line.replace(current_stripped, current_stripped + ',')
-        
-        fixed_lines.append(line)
-    
-    json_text = '\n'.join(fixed_lines)
-    
-    # Debug: Print the fixed JSON to see what changed
-    print(f"Fixed JSON snippet: {json_text[:200]}...")
-    
-    return json_text
-
-def _log_json_error(error: json.JSONDecodeError, json_text: str):
-    """Enhanced error logging for JSON parsing issues"""
-    error_context = json_text[max(0, error.pos-50):error.pos+50]
-    print("\n--- JSON PARSE ERROR DETAILS ---")
-    print(f"Error Type: {error.msg}")
-    print(f"Position: {error.pos} (Line: {error.lineno}, Column: {error.colno})")
-    print(f"Problem Area: ...{error_context}...")
-    print("Suggested Fix: Check for:")
-    print("- Missing quotes around values")
-    print("- Missing commas between key-value pairs")
-    print("- Stray commas inside quotes")
-    print("- Unescaped special characters")
\ No newline at end of file
+            # Escapes were kept raw; decode them so "sc\u0065nes" is "scenes"
+            value = json.loads(f'"{raw}"', strict=False)
+        except ValueError:
+            value = raw
+        self._top_level_key = None if self._after_colon else value
+        self._after_colon = False
+
+    def _parse_scene(self, scene_text, clean_json):
+        scene, repairs = parse_generated_json(scene_text)
+        self.repairs.extend(dict(repair, scene=self.scenes_emitted) for repair in repairs)
+        self.scenes_emitted += 1
+        return clean_json(scene, self.scene_types_to_clean)
+
+    def close(self) -> Any:
+        """Parse and clean the complete document once the stream has ended"""
+        from json_cleaner import clean_json
+
+        document, repairs = parse_generated_json(''.join(self._chunks))
+        if repairs:
+            logger.info(f"Repaired streamed JSON: {summarize_repairs(repairs)}")
+        return clean_json(document, self.scene_types_to_clean)
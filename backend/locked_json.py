@@ -0,0 +1,32 @@
+"""
+JSON index files shared by several worker processes.
+
+Each process keeps its own copy of an index in memory and records what it
+changed. Saving re-reads the file under an exclusive file lock, applies the
+pending changes to what is on disk and atomically replaces the file, so no
+process overwrites entries another one added in the meantime.
+"""
+import fcntl
+import json
+import os
+
+
+def update_json_file(path, lock_path, load, merge):
+    """
+    Read-merge-replace a JSON file under the file lock at lock_path.
+
+    load() returns the current contents of the file (or an empty index);
+    merge(data) applies this process's pending changes and returns what to
+    write. Returns the written data.
+    """
+    with open(lock_path, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = merge(load())
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return data
@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+from manim import ORIGIN, PI, TAU
+from manim.mobject.opengl.opengl_mobject import OpenGLGroup
+from manim.mobject.opengl.opengl_surface import OpenGLSurface
+from manim.utils.color import rgb_to_hex
+from manim_chemistry import ThreeDMolecule
+
+DEFAULT_CACHE_DIR = "./molecule_cache"
+CACHE_VERSION = 1
+SURFACE_EPSILON = 1e-5  # matches OpenGLSurface's default nudge for normals
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_molecule_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Return the shared MoleculeCache for a directory, creating it on first use"""
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = MoleculeCache(cache_dir)
+        return _caches[key]
+
+
+def parse_molfile(text):
+    """
+    Parse the first record of a V2000 MOL/SDF file into compact tables.
+
+    Returns (atom_coords, atom_elements, bonds) where bonds rows are
+    (from_atom, to_atom, bond_type) with 1-based atom indices.
+    """
+    lines = text.splitlines()
+    counts = lines[3]
+    num_atoms = int(counts[0:3])
+    num_bonds = int(counts[3:6])
+
+    atom_coords = np.zeros((num_atoms, 3), dtype=np.float64)
+    atom_elements = []
+    for i, line in enumerate(lines[4:4 + num_atoms]):
+        fields = line.split()
+        atom_coords[i] = [float(fields[0]), float(fields[1]), float(fields[2])]
+        atom_elements.append(fields[3])
+
+    bonds = np.zeros((num_bonds, 3), dtype=np.int32)
+    for i, line in enumerate(lines[4 + num_atoms:4 + num_atoms + num_bonds]):
+        bonds[i] = [int(line[0:3]), int(line[3:6]), int(line[6:9])]
+
+    return atom_coords, np.array(atom_elements, dtype="U3"), bonds
+
+
+def _uv_grid(u_values, v_values, uv_func, epsilon=SURFACE_EPSILON):
+    """Vectorized equivalent of OpenGLSurface.init_points for a numpy uv_func"""
+    point_lists = []
+    for du, dv in [(0, 0), (epsilon, 0), (0, epsilon)]:
+        u, v = np.meshgrid(u_values + du, v_values + dv, indexing="ij")
+        point_lists.append(np.stack(uv_func(u, v), axis=-1).reshape(-1, 3))
+    return np.vstack(point_lists)
+
+
+_sphere_templates = {}
+
+
+def _unit_sphere(resolution):
+    """Unit sphere mesh laid out like manim_chemistry's OpenGLSphere"""
+    if resolution not in _sphere_templates:
+        nu, nv = resolution
+        _sphere_templates[resolution] = _uv_grid(
+            np.linspace(0, TAU, nu),
+            np.linspace(0, PI, nv),
+            lambda u, v: (np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), -np.cos(v)),
+        )
+    return _sphere_templates[resolution]
+
+
+def _cylinder(start, end, radius, resolution):
+    """Cylinder mesh between two points laid out like manim_chemistry's ThreeDLine"""
+    nu, nv = resolution
+    vect = end - start
+    height = np.linalg.norm(vect)
+    points = _uv_grid(
+        np.linspace(-height / 2, height / 2, nu),
+        np.linspace(0, TAU, nv),
+        lambda u, v: (radius * np.cos(v), radius * np.sin(v), u),
+    )
+    # Same orientation as ThreeDCylinder: tilt from the z axis, then spin about it.
+    theta = np.arccos(np.clip(vect[2] / height, -1, 1)) if height > 0 else 0
+    phi = np.arctan2(vect[1], vect[0])
+    rot_y = np.array([[np.cos(theta), 0, np.sin(theta)], [0, 1, 0], [-np.sin(theta), 0, np.cos(theta)]])
+    rot_z = np.array([[np.cos(phi), -np.sin(phi), 0], [np.sin(phi), np.cos(phi), 0], [0, 0, 1]])
+    return points @ (rot_z @ rot_y).T + (start + end) / 2
+
+
+class MeshSurface(OpenGLSurface):
+    """OpenGLSurface whose points are given up front instead of sampled from a uv_func"""
+
+    def __init__(self, points, resolution, **kwargs):
+        self.mesh_points = points
+        super().__init__(resolution=tuple(int(n) for n in resolution), **kwargs)
+
+    def init_points(self):
+        self.set_points(self.mesh_points)
+
+
+class MoleculeCache:
+    """
+    Cache of parsed molecules and their 3D geometry, keyed by the SHA-256 of the
+    structure file.
+
+    The first render of a compound builds ThreeDMolecule as before and records
+    the atom/bond tables plus every atom sphere (center, radius, color) and bond
+    cylinder (end points, radius, color) in <hash>.v<N>.npz. Every render,
+    the first included, builds the molecule from those primitives with
+    vectorized numpy, so later renders skip parsing the file, looking up
+    element data and sampling each surface point by point, and all of them
+    get the same mobject.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._memory = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.v{CACHE_VERSION}.npz")
+
+    def _load(self, path):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            if digest in self._memory:
+                return digest, content, self._memory[digest]
+        cache_path = self._cache_path(digest)
+        if not os.path.exists(cache_path):
+            return digest, content, None
+        try:
+            with np.load(cache_path) as data:
+                geometry = {name: data[name] for name in data.files}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable molecule cache {cache_path}: {e}")
+            return digest, content, None
+        with self._lock:
+            self._memory[digest] = geometry
+        return digest, content, geometry
+
+    def _save(self, digest, geometry):
+        cache_path = self._cache_path(digest)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **geometry)
+        os.replace(tmp_path, cache_path)
+        with self._lock:
+            self._memory[digest] = geometry
+
+    def get_tables(self, path):
+        """Return (atom_coords, atom_elements, bonds) for a structure file"""
+        _, content, geometry = self._load(path)
+        if geometry is not None:
+            return geometry["atom_coords"], geometry["atom_elements"], geometry["bonds"]
+        return parse_molfile(content.decode("utf-8", errors="replace"))
+
+    def _extract_geometry(self, molecule, content):
+        """
+        Record the surfaces of a freshly built molecule as compact primitives.
+
+        Raises ValueError if the molecule has parts other than surfaces,
+        which the primitives could not reproduce.
+        """
+        atom_coords, atom_elements, bonds = parse_molfile(content.decode("utf-8", errors="replace"))
+        spheres, sphere_colors, sphere_resolution = [], [], (0, 0)
+        cylinders, cylinder_colors, cylinder_resolution = [], [], (0, 0)
+
+        for surface in molecule.get_family():
+            if not isinstance(surface, OpenGLSurface):
+                if surface.has_points():
+                    raise ValueError(f"molecule has a {type(surface).__name__} part that is not a surface")
+                continue
+            nu, nv = surface.resolution
+            grid = surface.get_surface_points_and_nudged_points()[0].reshape(nu, nv, 3)
+            # Every u sample of a sphere meets at the v=0 pole; a cylinder's do not.
+            if np.ptp(grid[:, 0], axis=0).max() < 1e-6:
+                center = surface.get_center()
+                radius = np.linalg.norm(grid - center, axis=-1).max()
+                spheres.append([*center, radius])
+                sphere_colors.append(surface.rgbas[0])
+                sphere_resolution = (nu, nv)
+            else:
+                start = grid[0, :-1].mean(axis=0)
+                end = grid[-1, :-1].mean(axis=0)
+                radius = np.linalg.norm(grid[0, 0] - start)
+                cylinders.append([*start, *end, radius])
+                cylinder_colors.append(surface.rgbas[0])
+                cylinder_resolution = (nu, nv)
+
+        return {
+            "atom_coords": atom_coords,
+            "atom_elements": atom_elements,
+            "bonds": bonds,
+            "spheres": np.array(spheres, dtype=np.float64).reshape(-1, 4),
+            "sphere_colors": np.array(sphere_colors, dtype=np.float64).reshape(-1, 4),
+            "sphere_resolution": np.array(sphere_resolution, dtype=np.int32),
+            "cylinders": np.array(cylinders, dtype=np.float64).reshape(-1, 7),
+            "cylinder_colors": np.array(cylinder_colors, dtype=np.float64).reshape(-1, 4),
+            "cylinder_resolution": np.array(cylinder_resolution, dtype=np.int32),
+        }
+
+    def _build_from_geometry(self, geometry):
+        sphere_resolution = tuple(int(n) for n in geometry["sphere_resolution"])
+        cylinder_resolution = tuple(int(n) for n in geometry["cylinder_resolution"])
+
+        bonds = OpenGLGroup()
+        for (x0, y0, z0, x1, y1, z1, radius), rgba in zip(geometry["cylinders"], geometry["cylinder_colors"]):
+            points = _cylinder(np.array([x0, y0, z0]), np.array([x1, y1, z1]), radius, cylinder_resolution)
+            bonds.add(MeshSurface(points, cylinder_resolution, color=rgb_to_hex(rgba[:3]), opacity=rgba[3]))
+
+        atoms = OpenGLGroup()
+        for (x, y, z, radius), rgba in zip(geometry["spheres"], geometry["sphere_colors"]):
+            points = np.array([x, y, z]) + radius * _unit_sphere(sphere_resolution)
+            atoms.add(MeshSurface(points, sphere_resolution, color=rgb_to_hex(rgba[:3]), opacity=rgba[3]))
+
+        molecule = OpenGLGroup(bonds, atoms)
+        molecule.bonds = bonds
+        molecule.atoms = atoms
+        return molecule
+
+    def load_molecule(self, path):
+        """
+        Return a 3D molecule for a MOL/SDF file, centered at the origin: an
+        OpenGLGroup of bond and atom surfaces with .bonds and .atoms subgroups.
+
+        Misses build ThreeDMolecule.molecule_from_file once to populate the
+        cache; hits and misses alike are then built from the stored geometry.
+        """
+        digest, content, geometry = self._load(path)
+        if geometry is None:
+            molecule = ThreeDMolecule.molecule_from_file(path)
+            molecule.move_to(ORIGIN)
+            try:
+                geometry = self._extract_geometry(molecule, content)
+            except Exception as e:
+                # ThreeDMolecule is also an OpenGLGroup with .bonds and .atoms
+                self.logger.warning(f"Could not extract molecule geometry for {path}, not caching it: {e}")
+                return molecule
+            try:
+                self._save(digest, geometry)
+                self.logger.info(f"Cached molecule geometry {digest[:12]} for {path}")
+            except OSError as e:
+                self.logger.warning(f"Could not cache molecule geometry for {path}: {e}")
+        return self._build_from_geometry(geometry)
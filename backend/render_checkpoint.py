@@ -0,0 +1,146 @@
+"""
+Checkpoints for resumable renders.
+
+A checkpointed render draws every scene (and the goodbye) as its own clip
+and records each finished clip here before starting the next, so a worker
+crash costs only the scene it was drawing. A retry re-renders from the first
+unfinished scene and joins the clips with ffmpeg.
+
+Each clip is keyed by a hash of its scene JSON, the video-level fields and
+the render options that fix its stream format, so a clip is only reused
+for the exact scene it was drawn from. Downloaded images, molecules and synthesized
+voiceovers already live in their persistent caches (image_store,
+compound_store, the manim-voiceover cache), so a resumed render finds them
+without fetching or synthesizing again.
+
+Layout, under media/checkpoints/<output_name>/:
+    checkpoint.json   state: video JSON, render options, finished clips
+    clips/            one mp4 per finished scene
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+DEFAULT_CHECKPOINT_DIR = "./media/checkpoints"
+STATE_FILE = "checkpoint.json"
+
+# Render options clips must share to be joined by stream copy. Quality
+# degradations (images, camera moves, holds) may differ from scene to scene
+# under a deadline, so a clip rendered with any of them is still reusable.
+CLIP_OPTIONS = ("quality", "frame_rate")
+
+
+def segment_key(json_content, index, render_options):
+    """Hash identifying the clip of one scene; index len(scenes) is the goodbye"""
+    scenes = json_content["scenes"]
+    video_fields = {
+        key: value for key, value in json_content.items()
+        # Music and encoding are applied to the joined video, not to clips
+        if key not in ("scenes", "output_name", "encoding_profile", "deadline_at", "background_music")
+    }
+    payload = {
+        "scene": scenes[index] if index < len(scenes) else "goodbye",
+        # The last scene has no transition after it
+        "last": index == len(scenes) - 1,
+        "video": video_fields,
+        "options": {key: render_options.get(key) for key in CLIP_OPTIONS},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RenderCheckpoint:
+    """Finished scene clips of one video, kept until the video is assembled"""
+
+    def __init__(self, output_name, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+        self.output_name = output_name
+        self.dir = os.path.join(checkpoint_dir, output_name)
+        self.clips_dir = os.path.join(self.dir, "clips")
+        self.path = os.path.join(self.dir, STATE_FILE)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Checkpoint {self.path} unreadable, starting over: {e}")
+            return None
+
+    def _save(self):
+        self.state["updated_at"] = time.time()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def exists(self):
+        return self.state is not None
+
+    def start(self, json_content, render_options):
+        """Record the video being rendered, keeping clips from an earlier attempt"""
+        with self._lock:
+            os.makedirs(self.clips_dir, exist_ok=True)
+            previous = self.state or {}
+            self.state = {
+                "output_name": self.output_name,
+                "video": json_content,
+                "render_options": render_options,
+                "segments": previous.get("segments", {}),
+                "attempts": previous.get("attempts", 0) + 1,
+            }
+            self._save()
+
+    def completed_clip(self, index, key):
+        """
+        Path of the finished clip for a segment, or None if it must be rendered.
+        A fallback card is never reused, so a scene that timed out once gets
+        another try on resume.
+        """
+        with self._lock:
+            segment = (self.state or {}).get("segments", {}).get(str(index))
+        if segment and segment["key"] == key and not segment.get("fallback") and os.path.exists(segment["path"]):
+            return segment["path"]
+        return None
+
+    def complete(self, index, key, clip_path, fallback=None):
+        """Move a freshly rendered clip into the checkpoint and record it; fallback says why it is a stand-in"""
+        path = os.path.join(self.clips_dir, f"scene_{index:03d}.mp4")
+        shutil.move(clip_path, path)
+        with self._lock:
+            self.state["segments"][str(index)] = {
+                "key": key,
+                "path": path,
+                "fallback": fallback,
+                "completed_at": time.time(),
+            }
+            self._save()
+        return path
+
+    def has_clips(self):
+        with self._lock:
+            return bool((self.state or {}).get("segments"))
+
+    def progress(self):
+        """(finished segments, total segments) of the recorded video"""
+        if not self.state:
+            return 0, 0
+        total = len(self.state["video"]["scenes"]) + 1
+        done = sum(
+            1 for index in range(total)
+            if self.completed_clip(index, segment_key(self.state["video"], index, self.state["render_options"]))
+        )
+        return done, total
+
+    def clear(self):
+        """Delete the checkpoint once the video has been assembled"""
+        with self._lock:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            self.state = None
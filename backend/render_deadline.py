@@ -0,0 +1,135 @@
+"""
+Deadline-aware quality degradation.
+
+A checkpointed render may carry a latency target (render option
+"deadline_seconds"). DeadlinePlanner predicts the cost of the video from its
+scene JSON with the learned cost model and applies DEGRADATIONS in order,
+cheapest loss of quality first, until the prediction fits:
+
+    placeholder_images  skip optional image downloads
+    camera_moves        drop camera animations (timelines, concept maps)
+    frame_rate          render fewer frames per second
+    hold_scale          shorten static holds
+
+Before every scene it compares the time left with the prediction for the
+remaining scenes and degrades further if the render has fallen behind. The
+frame rate is only lowered before the first clip is rendered, because the
+clips are joined by stream copy and must share it.
+"""
+import time
+
+from render_history import get_render_history
+from render_options import options_frame_rate
+from scene_types import estimate_scene_cost
+from scene_watchdog import SCENE_PROCESS_OVERHEAD
+
+DEGRADATIONS = (
+    ("placeholder_images", True),
+    ("camera_moves", False),
+    ("frame_rate", 10),
+    ("frame_rate", 8),
+    ("hold_scale", 0.5),
+    ("hold_scale", 0.25),
+)
+
+# Scene types whose builders animate the camera
+CAMERA_SCENE_TYPES = ("timeline", "visual_concept_map")
+# Rough shares of frame cost, used to scale the model's prediction
+CAMERA_FRAME_SHARE = 0.3
+HOLD_FRAME_SHARE = 0.3
+
+
+def predict_seconds(json_content, render_options, start_index=0, model=None):
+    """Predicted seconds to render the scenes from start_index on with these options"""
+    model = model or get_render_history().model()
+    frame_rate = options_frame_rate(render_options)
+    scenes = json_content["scenes"][start_index:]
+    # Predicted as a full render; the savings of each degradation are taken off below
+    prediction = model.predict_video(
+        dict(json_content, scenes=scenes), frame_rate, encoding_profile=render_options.get("encoding_profile")
+    )
+    total = prediction["total_seconds"]
+    for scene, predicted in zip(scenes, prediction["scenes"]):
+        estimate = estimate_scene_cost(scene, frame_rate)
+        if not estimate["total_seconds"]:
+            continue
+        frame_share = (estimate["render_seconds"] + estimate["encode_seconds"]) / estimate["total_seconds"]
+        fetch_share = estimate["fetch_seconds"] / estimate["total_seconds"]
+        frame_factor = 1 - HOLD_FRAME_SHARE * (1 - render_options.get("hold_scale", 1.0))
+        if not render_options["camera_moves"] and scene.get("type") in CAMERA_SCENE_TYPES:
+            frame_factor *= 1 - CAMERA_FRAME_SHARE
+        saved = frame_share * (1 - frame_factor)
+        if render_options["placeholder_images"]:
+            saved += fetch_share
+        total -= predicted * saved
+    if render_options.get("isolate_scenes"):
+        # Each scene and the goodbye start their own process
+        total += SCENE_PROCESS_OVERHEAD * (len(scenes) + 1)
+    return max(total, 0.0)
+
+
+class DeadlinePlanner:
+    """Chooses render options for each scene so the video finishes within deadline_seconds"""
+
+    def __init__(self, json_content, render_options, deadline_seconds, allow_frame_rate=True, model=None):
+        self.json_content = json_content
+        self.deadline_seconds = deadline_seconds
+        self.options = dict(render_options)
+        self.degradations = []
+        self.model = model or get_render_history().model()
+        self.started = time.monotonic()
+        self.allow_frame_rate = allow_frame_rate
+        self.predicted_seconds = self._fit(0)
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining_seconds(self):
+        return self.deadline_seconds - self.elapsed()
+
+    def _degrades(self, option, value):
+        if option == "frame_rate":
+            return self.allow_frame_rate and value < options_frame_rate(self.options)
+        if option == "hold_scale":
+            return value < self.options.get("hold_scale", 1.0)
+        return self.options[option] != value
+
+    def _fit(self, start_index):
+        budget = self.remaining_seconds()
+        predicted = predict_seconds(self.json_content, self.options, start_index, self.model)
+        for option, value in DEGRADATIONS:
+            if predicted <= budget:
+                break
+            if not self._degrades(option, value):
+                continue
+            self.options[option] = value
+            degraded = predict_seconds(self.json_content, self.options, start_index, self.model)
+            self.degradations.append({
+                "option": option,
+                "value": value,
+                "from_scene": start_index,
+                "predicted_seconds": round(predicted, 2),
+                "predicted_seconds_after": round(degraded, 2),
+                "budget_seconds": round(budget, 2),
+            })
+            predicted = degraded
+        return predicted
+
+    def options_for_scene(self, index):
+        """Render options for a scene, degrading further if the render is behind"""
+        if index > 0:
+            # Clips already rendered fix the frame rate
+            self.allow_frame_rate = False
+            self._fit(index)
+        return dict(self.options)
+
+    def report(self):
+        elapsed = self.elapsed()
+        return {
+            "deadline_seconds": round(self.deadline_seconds, 2),
+            "predicted_seconds": round(self.predicted_seconds, 2),
+            "elapsed_seconds": round(elapsed, 2),
+            "met": elapsed <= self.deadline_seconds,
+            "degradations": self.degradations,
+            "render_options": dict(self.options),
+        }
@@ -0,0 +1,293 @@
+"""
+Render history and the cost model learned from it.
+
+Every real render appends one record per scene to a JSONL file: the scene
+type, features taken from its JSON (expected frames, voiceovers, images,
+text length, list items, code lines) and from the render options that
+change the work (placeholder images, a static camera, shortened holds), and
+the wall time it took, split into TTS, fetch and render phases. Job-level phases (molecule prefetch, encoding,
+and the LLM call when the server reports it through record_phase) are kept
+as job records; encoding is learned per encoding profile, and the job
+records of single-scene segments are kept apart from whole videos.
+
+CostModel fits a least-squares model per scene type once a type has enough
+samples, and otherwise scales the static estimate from scene_types by how
+far off it has been on this worker. The scheduler uses the prediction for
+queue ETAs and to run short jobs first.
+"""
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from scene_types import estimate_scene_cost, estimate_video_cost, get_scene_type
+
+DEFAULT_HISTORY_PATH = "./media/render_history.jsonl"
+MAX_RECORDS = 5000  # only the most recent records are used for fitting
+FEATURES = ("frames", "voiceovers", "images", "text_chars", "items", "code_lines", "static_camera", "hold_cut")
+MIN_SAMPLES = 2 * (len(FEATURES) + 1)
+RIDGE = 1e-3  # keeps the fit stable when a feature never varies for a type
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def get_render_history(path=DEFAULT_HISTORY_PATH):
+    """Return the shared RenderHistory for a file, creating it on first use"""
+    key = os.path.abspath(path)
+    with _histories_lock:
+        if key not in _histories:
+            _histories[key] = RenderHistory(path)
+        return _histories[key]
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def is_degraded(render_options):
+    """Whether render options cut work compared with a full render"""
+    options = render_options or {}
+    return bool(
+        options.get("placeholder_images")
+        or not options.get("camera_moves", True)
+        or options.get("hold_scale", 1.0) < 1.0
+    )
+
+
+def scene_features(scene, frame_rate, render_options=None):
+    """
+    Numeric features of a scene JSON and its render options that drive its
+    render time; without options a full render is assumed
+    """
+    options = render_options or {}
+    scene_type = get_scene_type(scene.get("type"))
+    assets = scene_type.assets(scene) if scene_type else []
+    images = sum(asset.get("count", 1) for asset in assets if asset["kind"] == "image")
+    return {
+        "frames": estimate_scene_cost(scene, frame_rate)["frames"],
+        "voiceovers": sum(1 for asset in assets if asset["kind"] == "voiceover"),
+        # Placeholders are drawn instead of downloading and placing images
+        "images": 0 if options.get("placeholder_images") else images,
+        "text_chars": sum(len(text) for text in _strings(scene)),
+        "items": sum(len(value) for value in scene.values() if isinstance(value, list)),
+        "code_lines": len(str(scene.get("code", "")).splitlines()),
+        "static_camera": 0 if options.get("camera_moves", True) else 1,
+        "hold_cut": round(1.0 - options.get("hold_scale", 1.0), 3),
+    }
+
+
+class CostModel:
+    """Predicts worker seconds per scene and per video from recorded renders"""
+
+    def __init__(self, records=()):
+        self.coefficients = {}
+        self.samples = {}
+        scene_records = [r for r in records if r.get("kind") == "scene" and not r.get("error")]
+        # Segment renders of a checkpointed video would skew per-video phase times
+        job_records = [r for r in records if r.get("kind") == "job" and not r.get("segment")]
+
+        # How far the static estimates are off on this worker, for types without
+        # a fit; the estimates assume a full render, so previews and degraded
+        # renders are left out
+        ratios = [r["seconds"] / r["estimate"] for r in scene_records if r.get("estimate") and not r.get("degraded")]
+        self.correction = statistics.median(ratios) if ratios else 1.0
+
+        by_type = {}
+        for record in scene_records:
+            by_type.setdefault(record["type"], []).append(record)
+        for scene_type, samples in by_type.items():
+            self.samples[scene_type] = len(samples)
+            if len(samples) >= MIN_SAMPLES:
+                self.coefficients[scene_type] = self._fit(samples)
+
+        encode_rates = {}
+        for r in job_records:
+            if r.get("frames") and "encode" in r.get("phase_seconds", {}):
+                rate = r["phase_seconds"]["encode"] / r["frames"]
+                encode_rates.setdefault(r.get("encoding_profile"), []).append(rate)
+        all_rates = [rate for rates in encode_rates.values() for rate in rates]
+        # Used for profiles that have not been timed yet
+        self.encode_seconds_per_frame = statistics.median(all_rates) if all_rates else None
+        self.profile_encode_seconds_per_frame = {
+            profile: statistics.median(rates) for profile, rates in encode_rates.items() if profile
+        }
+        self.phase_medians = {}
+        for phase in ("llm", "fetch"):
+            values = [r["phase_seconds"][phase] for r in job_records if phase in r.get("phase_seconds", {})]
+            self.phase_medians[phase] = statistics.median(values) if values else 0.0
+
+    @staticmethod
+    def _fit(samples):
+        """Ridge least squares on standardized features; returns (mean, scale, weights)"""
+        x = np.array([[r["features"].get(name, 0) for name in FEATURES] for r in samples], dtype=float)
+        y = np.array([r["seconds"] for r in samples], dtype=float)
+        mean = x.mean(axis=0)
+        scale = x.std(axis=0)
+        scale[scale == 0] = 1.0
+        x = np.hstack([np.ones((len(x), 1)), (x - mean) / scale])
+        penalty = np.sqrt(RIDGE * len(samples)) * np.eye(x.shape[1])
+        penalty[0, 0] = 0  # never shrink the intercept
+        weights = np.linalg.lstsq(np.vstack([x, penalty]), np.concatenate([y, np.zeros(x.shape[1])]), rcond=None)[0]
+        return mean, scale, weights
+
+    def predict_scene(self, scene, frame_rate=30, render_options=None):
+        """
+        Predicted wall seconds to build and render one scene; render_options
+        only count for learned types, the static estimate assumes a full render
+        """
+        fit = self.coefficients.get(scene.get("type"))
+        if fit is None:
+            return estimate_scene_cost(scene, frame_rate)["total_seconds"] * self.correction
+        mean, scale, weights = fit
+        features = scene_features(scene, frame_rate, render_options)
+        x = (np.array([features[name] for name in FEATURES], dtype=float) - mean) / scale
+        return max(float(weights[0] + x @ weights[1:]), 0.0)
+
+    def encode_rate(self, encoding_profile=None):
+        """Learned encode seconds per frame for a profile, or None before any encode was timed"""
+        return self.profile_encode_seconds_per_frame.get(encoding_profile, self.encode_seconds_per_frame)
+
+    def predict_video(self, json_content, frame_rate=30, include_llm=False, encoding_profile=None,
+                      render_options=None):
+        """Predicted seconds for a whole render, per scene and in total; see predict_scene for render_options"""
+        scenes = json_content.get("scenes", [])
+        # The video's own profile wins over the render option, as when encoding
+        encode_rate = self.encode_rate(json_content.get("encoding_profile", encoding_profile))
+        estimate = estimate_video_cost(scenes, frame_rate)
+        per_scene = [round(self.predict_scene(scene, frame_rate, render_options), 2) for scene in scenes]
+        # Transitions and the goodbye are not recorded per type; scale their static estimate
+        extras = estimate["total"]["total_seconds"] - sum(cost["total_seconds"] for cost in estimate["scenes"])
+        frames = estimate["total"]["frames"]
+        if encode_rate is not None:
+            encode = frames * encode_rate
+        else:
+            encode = estimate["total"]["encode_seconds"]
+        total = sum(per_scene) + extras * self.correction + encode + self.phase_medians["fetch"]
+        if include_llm:
+            total += self.phase_medians["llm"]
+        return {
+            "scenes": per_scene,
+            "encode_seconds": round(encode, 2),
+            "total_seconds": round(total, 2),
+            "learned_types": sorted(scene_type for scene_type in self.coefficients if scene_type in
+                                    {scene.get("type") for scene in scenes}),
+        }
+
+
+class RenderHistory:
+    """Append-only JSONL log of render timings with a lazily refitted CostModel"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_stamp = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _append(self, records):
+        try:
+            with self._lock, open(self.path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Could not record render history: {e}")
+
+    def record_render(self, json_content, plan, encoding_profile=None, segment=False, render_options=None):
+        """
+        Record the scenes and job phases of a finished render from its
+        RenderPlan dict and the render options it ran with; segment marks the
+        render of part of a checkpointed video
+        """
+        now = time.time()
+        frame_rate = plan["frame_rate"]
+        degraded = is_degraded(render_options)
+        scenes = json_content.get("scenes", [])
+        records = []
+        for scene_plan in plan["scenes"]:
+            if scene_plan["index"] >= len(scenes):
+                continue  # the goodbye
+            scene = scenes[scene_plan["index"]]
+            records.append({
+                "kind": "scene",
+                "time": now,
+                "output_name": plan["output_name"],
+                "type": scene_plan["type"],
+                "frame_rate": frame_rate,
+                "features": scene_features(scene, frame_rate, render_options),
+                "degraded": degraded,
+                "estimate": estimate_scene_cost(scene, frame_rate)["total_seconds"],
+                "seconds": scene_plan["wall_seconds"],
+                "phase_seconds": scene_plan["phase_seconds"],
+                "error": scene_plan["error"],
+            })
+        records.append({
+            "kind": "job",
+            "time": now,
+            "output_name": plan["output_name"],
+            "frame_rate": frame_rate,
+            "scenes": len(scenes),
+            "frames": plan["frames"],
+            "encoding_profile": encoding_profile,
+            "segment": segment,
+            "phase_seconds": plan["phase_seconds"],
+        })
+        self._append(records)
+
+    def record_phase(self, output_name, phase, seconds, frames=None, encoding_profile=None):
+        """
+        Record a job phase timed outside the renderer, such as the LLM call or
+        the encode of a joined video (with its frames and encoding profile)
+        """
+        record = {
+            "kind": "job",
+            "time": time.time(),
+            "output_name": output_name,
+            "phase_seconds": {phase: round(seconds, 3)},
+        }
+        if frames is not None:
+            record["frames"] = frames
+        if encoding_profile is not None:
+            record["encoding_profile"] = encoding_profile
+        self._append([record])
+
+    def records(self, limit=MAX_RECORDS):
+        try:
+            with open(self.path, "r") as f:
+                lines = f.readlines()[-limit:]
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # a line cut short by a crash
+        return records
+
+    def model(self):
+        """Return the CostModel, refitted whenever the history file has changed"""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if self._model is None or stamp != self._model_stamp:
+                self._model = CostModel(self.records())
+                self._model_stamp = stamp
+            return self._model
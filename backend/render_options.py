@@ -0,0 +1,53 @@
+FULL_RENDER_OPTIONS = {
+    "quality": "low_quality",
+    # None keeps the frame rate that comes with the quality setting.
+    "frame_rate": None,
+    "camera_moves": True,
+    "placeholder_images": False,
+    "encoding_profile": "mobile",
+    # Build every scene and return a render plan instead of a video.
+    "dry_run": False,
+    # Render each scene of a checkpointed render in its own process under a
+    # time budget, replacing scenes that overrun with a fallback card. Off by
+    # default: every scene then pays for a fresh Python, manim and GL context.
+    "isolate_scenes": False,
+    # Multiplier for static holds; below 1 shortens them.
+    "hold_scale": 1.0,
+    # Latency target in seconds for a checkpointed render; options are
+    # degraded until the predicted cost fits (see render_deadline).
+    "deadline_seconds": None,
+}
+
+# Fast first pass shown while the full render runs: fewer frames, a static
+# camera, no image downloads and the fastest encoder preset. Voiceovers go
+# through the same TTS cache as the full render, so the full pass reuses them.
+PREVIEW_RENDER_OPTIONS = dict(
+    FULL_RENDER_OPTIONS,
+    frame_rate=8,
+    camera_moves=False,
+    placeholder_images=True,
+    encoding_profile="preview",
+)
+
+
+# manim's frame rate for each quality, used when the options don't set one.
+QUALITY_FRAME_RATES = {
+    "low_quality": 15,
+    "medium_quality": 30,
+    "high_quality": 60,
+    "production_quality": 60,
+    "fourk_quality": 60,
+}
+
+
+def options_frame_rate(options):
+    """Frame rate a render with these options will run at"""
+    return options.get("frame_rate") or QUALITY_FRAME_RATES.get(options.get("quality"), 15)
+
+
+def make_render_options(base=None, **overrides):
+    """Return a full set of render options from a base set plus overrides"""
+    options = dict(FULL_RENDER_OPTIONS)
+    options.update(base or {})
+    options.update(overrides)
+    return options
@@ -0,0 +1,216 @@
+"""
+Per-scene timing and asset bookkeeping for a render.
+
+DirectVideoGenerator reports every scene, animation, voiceover and asset to
+a RenderPlan while construct() runs. In a normal render this only records
+where the time went; in a dry run (render option "dry_run") nothing is
+rasterized or encoded and no TTS is requested, so the plan is a cheap
+prediction of the video: per-scene duration, frame count, the assets the
+render will need and an estimated cost.
+
+Real renders also time each scene on the wall clock, split into TTS, fetch
+and render phases; render_history keeps these to learn the cost model.
+"""
+import contextlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Speaking rate used when a voiceover is not in the TTS cache yet. Azure
+# neural voices read about 150 words, or roughly 15 characters, per second.
+SPEECH_CHARS_PER_SECOND = 15.0
+MIN_SPEECH_SECONDS = 1.0
+
+# Rough worker-seconds per unit of work, used for the cost estimate.
+COST_RATES = {
+    "render_seconds_per_frame": 0.04,
+    "encode_seconds_per_frame": 0.004,
+    "tts_seconds_per_request": 1.5,
+    "image_fetch_seconds": 2.0,
+    "molecule_fetch_seconds": 3.0,
+}
+
+
+def estimate_speech_duration(text):
+    """Estimate how long a voiceover takes to speak from its length"""
+    return max(MIN_SPEECH_SECONDS, len(" ".join(str(text).split())) / SPEECH_CHARS_PER_SECOND)
+
+
+def load_cached_voiceovers(cache_dir):
+    """Return {text: audio path} for every voiceover already in the manim-voiceover cache"""
+    try:
+        with open(os.path.join(cache_dir, "cache.json"), "r") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Voiceover cache unreadable, estimating all durations: {e}")
+        return {}
+    cached = {}
+    for entry in entries:
+        text = entry.get("input_data", {}).get("input_text")
+        audio = entry.get("final_audio")
+        if text and audio and os.path.exists(os.path.join(cache_dir, audio)):
+            cached[text] = os.path.join(cache_dir, audio)
+    return cached
+
+
+class EstimatedVoiceover:
+    """Stand-in for VoiceoverTracker during a dry run"""
+
+    def __init__(self, scene, text, duration):
+        self.scene = scene
+        self.data = {"input_text": text}
+        self.duration = duration
+        self.start_t = scene.renderer.time
+        self.end_t = self.start_t + duration
+
+    def get_remaining_duration(self, buff=0.0):
+        return max(self.end_t - self.scene.renderer.time + buff, 0)
+
+    def time_until_bookmark(self, mark, buff=0, limit=None):
+        # Bookmarks need word timings from the TTS service; assume no wait.
+        return 0
+
+
+class RenderPlan:
+    """Collects per-scene durations, voiceovers and assets while a video is built"""
+
+    def __init__(self, output_name, frame_rate, quality, voiceover_cache_dir=None):
+        self.output_name = output_name
+        self.frame_rate = frame_rate
+        self.quality = quality
+        self.voiceover_cache_dir = voiceover_cache_dir
+        self._cached_voiceovers = None
+        self.scenes = []
+        self.assets = {}
+        self.current = None
+        self.total_duration = 0.0
+        # Wall-clock phases outside any scene (molecule prefetch, encoding)
+        self.phase_seconds = {}
+
+    def start_scene(self, index, scene_type, start_time):
+        self.current = {
+            "index": index,
+            "type": scene_type,
+            "start": start_time,
+            "duration": 0.0,
+            "frames": 0,
+            "animations": 0,
+            "voiceovers": 0,
+            "voiceover_characters": 0,
+            "uncached_voiceovers": 0,
+            "uncached_voiceover_characters": 0,
+            "assets": [],
+            "error": None,
+            "wall_start": time.perf_counter(),
+            "phase_seconds": {"tts": 0.0, "fetch": 0.0, "render": 0.0},
+        }
+        self.scenes.append(self.current)
+
+    def end_scene(self, end_time, error=None):
+        if self.current is None:
+            return
+        self.current["duration"] = round(end_time - self.current["start"], 3)
+        self.current["error"] = str(error) if error else None
+        phases = self.current["phase_seconds"]
+        wall_seconds = time.perf_counter() - self.current.pop("wall_start")
+        # Whatever was not spent waiting on TTS or downloads went into drawing frames
+        phases["render"] = max(wall_seconds - phases["tts"] - phases["fetch"], 0.0)
+        self.current["wall_seconds"] = round(wall_seconds, 3)
+        self.current["phase_seconds"] = {phase: round(seconds, 3) for phase, seconds in phases.items()}
+        self.current = None
+
+    @contextlib.contextmanager
+    def timed(self, phase):
+        """Add the wall time of the block to a phase of the current scene, or of the whole job"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            phases = self.current["phase_seconds"] if self.current is not None else self.phase_seconds
+            phases[phase] = phases.get(phase, 0.0) + elapsed
+
+    def add_play(self, run_time):
+        # The renderer writes int(frame_rate * run_time) frames per animation.
+        if self.current is not None:
+            self.current["animations"] += 1
+            self.current["frames"] += int(self.frame_rate * run_time)
+
+    def voiceover_duration(self, text):
+        """Return (duration, cached) for a voiceover, from the TTS cache when possible"""
+        if self._cached_voiceovers is None:
+            self._cached_voiceovers = (
+                load_cached_voiceovers(self.voiceover_cache_dir) if self.voiceover_cache_dir else {}
+            )
+        audio_path = self._cached_voiceovers.get(text)
+        if audio_path:
+            try:
+                from manim_voiceover.modify_audio import get_duration
+                return get_duration(audio_path), True
+            except Exception as e:
+                logger.warning(f"Could not read cached voiceover {audio_path}: {e}")
+        return estimate_speech_duration(text), False
+
+    def add_voiceover(self, text, cached=None):
+        """Record a voiceover; cached is None when a real render synthesized it"""
+        if self.current is None:
+            return
+        self.current["voiceovers"] += 1
+        self.current["voiceover_characters"] += len(text)
+        if cached is False:
+            self.current["uncached_voiceovers"] += 1
+            self.current["uncached_voiceover_characters"] += len(text)
+
+    def add_asset(self, kind, name, cached, **details):
+        """Record an asset the render needs; repeats across scenes are listed once"""
+        key = (kind, str(name))
+        if key not in self.assets:
+            self.assets[key] = dict(kind=kind, name=name, cached=cached, **details)
+        if self.current is not None and key not in self.current["assets"]:
+            self.current["assets"].append(key)
+
+    def estimated_cost(self):
+        frames = sum(scene["frames"] for scene in self.scenes)
+        uncached = [asset for asset in self.assets.values() if not asset["cached"]]
+        tts_requests = sum(scene["uncached_voiceovers"] for scene in self.scenes)
+        cost = {
+            "render_seconds": frames * COST_RATES["render_seconds_per_frame"],
+            "encode_seconds": frames * COST_RATES["encode_seconds_per_frame"],
+            "tts_requests": tts_requests,
+            "tts_characters": sum(scene["uncached_voiceover_characters"] for scene in self.scenes),
+            "tts_seconds": tts_requests * COST_RATES["tts_seconds_per_request"],
+            "image_fetches": sum(asset.get("count", 1) for asset in uncached if asset["kind"] == "image"),
+            "molecule_fetches": sum(1 for asset in uncached if asset["kind"] == "molecule"),
+        }
+        cost["fetch_seconds"] = (
+            cost["image_fetches"] * COST_RATES["image_fetch_seconds"]
+            + cost["molecule_fetches"] * COST_RATES["molecule_fetch_seconds"]
+        )
+        cost["total_seconds"] = round(
+            cost["render_seconds"] + cost["encode_seconds"] + cost["tts_seconds"] + cost["fetch_seconds"], 2
+        )
+        return cost
+
+    def to_dict(self):
+        scenes = []
+        for scene in self.scenes:
+            scene = dict(scene)
+            scene.pop("wall_start", None)
+            scene["assets"] = [{"kind": kind, "name": name} for kind, name in scene["assets"]]
+            scenes.append(scene)
+        return {
+            "output_name": self.output_name,
+            "frame_rate": self.frame_rate,
+            "quality": self.quality,
+            "duration": round(self.total_duration, 3),
+            "frames": sum(scene["frames"] for scene in self.scenes),
+            "scenes": scenes,
+            "phase_seconds": {phase: round(seconds, 3) for phase, seconds in self.phase_seconds.items()},
+            "assets": list(self.assets.values()),
+            "estimated_cost": self.estimated_cost(),
+        }
@@ -0,0 +1,368 @@
+"""
+Admission control for renders.
+
+Every render reserves an estimate of the CPU, memory and GL contexts it will
+use, worked out from its scene JSON (scene count, images, molecules and
+expected frames). Jobs start while the host has room for them, wait in a
+FIFO queue otherwise, and are turned away with a retry hint once the queue
+is full, so a burst of requests queues up instead of thrashing the worker.
+
+Queued jobs are ordered shortest first by the render time predicted from
+render_history, aged by how long they have waited so long jobs still get
+their turn.
+
+In-process renders (the preview in delivery.start_render) also take the
+single "in_process" slot, because manim's config is global to the process.
+Full renders run as subprocesses started by the scheduler itself.
+
+All admission state (reservations, queue, running jobs) lives in the memory
+of the process that owns the scheduler, and nothing coordinates it with
+other processes. Only one process per host may submit renders: run the web
+server with a single worker process (threads are fine). A second process
+would admit its own jobs against the same CPU, memory and GL capacity.
+"""
+import contextlib
+import logging
+import math
+import os
+import subprocess
+import threading
+import time
+
+from render_history import get_render_history
+from render_options import options_frame_rate
+from scene_types import collect_assets
+
+DEFAULT_MAX_QUEUE = 8
+DEFAULT_GL_SLOTS = 2
+POLL_INTERVAL = 1.0
+FINISHED_TTL = 3600  # finished jobs stay visible to status() for an hour
+MIN_RETRY_AFTER = 5
+# Seconds of predicted render time a queued job makes up for every second it
+# waits; a job overtaken by shorter ones moves up as it ages.
+AGING_RATE = 1.0
+
+# Rough per-render footprints, measured on the 480p worker.
+MEMORY_RESERVE_MB = 1024  # kept free for the OS and the web server
+RENDER_BASE_MEMORY_MB = 700  # manim, the GL context and the ffmpeg pipe
+IMAGE_MEMORY_MB = 40
+MOLECULE_MEMORY_MB = 150
+CPU_PER_RENDER = 1.5  # the render loop on one core plus the ffmpeg encoder
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+class RenderRejected(RuntimeError):
+    """Raised when the render queue is full; retry_after is a hint in seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def get_render_scheduler():
+    """Return the process-wide RenderScheduler"""
+    with _schedulers_lock:
+        if "default" not in _schedulers:
+            _schedulers["default"] = RenderScheduler()
+        return _schedulers["default"]
+
+
+def estimate_job_demand(json_content, render_options=None, in_process=False):
+    """Resources a render of this video is expected to hold while it runs"""
+    options = render_options or {}
+    frame_rate = options_frame_rate(options)
+    scenes = json_content.get("scenes", [])
+    assets = collect_assets(scenes)
+    images = sum(asset.get("count", 1) for asset in assets if asset["kind"] == "image")
+    if options.get("placeholder_images"):
+        images = min(images, 1)
+    molecules = sum(1 for asset in assets if asset["kind"] == "molecule")
+    prediction = get_render_history().model().predict_video(
+        json_content, frame_rate, encoding_profile=options.get("encoding_profile"), render_options=options
+    )
+    return {
+        "cpu": CPU_PER_RENDER,
+        "memory_mb": RENDER_BASE_MEMORY_MB + images * IMAGE_MEMORY_MB + molecules * MOLECULE_MEMORY_MB,
+        "gl": 1,
+        "in_process": 1 if in_process else 0,
+        "seconds": prediction["total_seconds"],
+    }
+
+
+def read_available_memory_mb():
+    """Memory the kernel could hand out right now, or None where /proc is missing"""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def detect_capacity():
+    """CPU, memory and GL capacity of this host for concurrent renders"""
+    try:
+        total_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        total_mb = 4096
+    return {
+        "cpu": float(os.cpu_count() or 1),
+        "memory_mb": max(total_mb - MEMORY_RESERVE_MB, RENDER_BASE_MEMORY_MB),
+        "gl": int(os.environ.get("RENDER_GL_SLOTS", DEFAULT_GL_SLOTS)),
+        "in_process": 1,
+    }
+
+
+class RenderScheduler:
+    """
+    Admits render jobs against the host's capacity.
+
+    The queue is ordered by predicted seconds plus AGING_RATE times the
+    submission time ("fifo" policy: submission time alone), and admission
+    stops at the first job that does not fit, so a large job at the head is
+    not starved by small ones behind it; a job bigger than the whole host
+    still runs once nothing else is running. Jobs submitted
+    with argv are started as subprocesses when admitted and released when
+    they exit; other jobs are admitted for the caller, who waits for its
+    turn with wait() (or uses slot()) and must call release().
+    """
+
+    def __init__(self, capacity=None, max_queue=DEFAULT_MAX_QUEUE, policy="shortest"):
+        if policy not in ("shortest", "fifo"):
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        self.capacity = capacity or detect_capacity()
+        self.max_queue = max_queue
+        self.policy = policy
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Condition()
+        self._queue = []
+        self._running = {}
+        self._jobs = {}
+        self._reserved = dict.fromkeys(self.capacity, 0)
+        self._monitor = None
+
+    def submit(self, job_id, demand, argv=None, log_path=None):
+        """Queue a job and return its ticket; status is "running", "queued" or "rejected" """
+        with self._lock:
+            self._prune_finished()
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] in ("queued", "running"):
+                return self._ticket(job)
+            if len(self._queue) >= self.max_queue:
+                retry_after = self._retry_after()
+                self.logger.warning(f"Render queue full, rejecting {job_id} (retry in {retry_after}s)")
+                return {"job_id": job_id, "status": "rejected", "position": None, "retry_after": retry_after}
+
+            submitted_at = time.time()
+            job = {
+                "id": job_id,
+                "demand": demand,
+                "argv": argv,
+                "log_path": log_path,
+                "status": "queued",
+                "priority": self._priority(demand, submitted_at),
+                "submitted_at": submitted_at,
+                "started_at": None,
+                "finished_at": None,
+                "process": None,
+                "admitted": threading.Event(),
+            }
+            self._jobs[job_id] = job
+            position = next(
+                (i for i, queued in enumerate(self._queue) if queued["priority"] > job["priority"]),
+                len(self._queue),
+            )
+            self._queue.insert(position, job)
+            self._dispatch()
+            ticket = self._ticket(job)
+        if ticket["status"] == "queued":
+            self.logger.info(f"Queued render {job_id} at position {ticket['position']}")
+        return ticket
+
+    def ensure_room(self, jobs=1):
+        """Raise RenderRejected unless the queue has room for this many more jobs"""
+        with self._lock:
+            if len(self._queue) + jobs > self.max_queue:
+                raise RenderRejected(f"Render queue is full ({self.max_queue} waiting)", self._retry_after())
+
+    def wait(self, job_id, timeout=None):
+        """Block until a submitted job is admitted; returns False on timeout"""
+        job = self._jobs.get(job_id)
+        return job is not None and job["admitted"].wait(timeout)
+
+    def release(self, job_id, exit_code=None):
+        """Return a running job's resources to the pool and admit whatever now fits"""
+        with self._lock:
+            job = self._running.pop(job_id, None)
+            if job is None:
+                return
+            for key in self._reserved:
+                self._reserved[key] -= job["demand"].get(key, 0)
+            job["status"] = "finished" if not exit_code else "failed"
+            job["finished_at"] = time.time()
+            self.logger.info(
+                f"Render {job_id} {job['status']} after {job['finished_at'] - job['started_at']:.1f}s"
+            )
+            self._dispatch()
+
+    def cancel(self, job_id):
+        """Drop a job that is still waiting in the queue"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] == "queued":
+                self._queue.remove(job)
+                job["status"] = "cancelled"
+                job["finished_at"] = time.time()
+                self._dispatch()
+
+    @contextlib.contextmanager
+    def slot(self, job_id, demand, timeout=None, on_queued=None):
+        """
+        Hold capacity for an in-process render.
+
+        Raises RenderRejected if the queue is full or the job is not admitted
+        within timeout. on_queued(ticket) is called when the job has to wait.
+        """
+        ticket = self.submit(job_id, demand)
+        if ticket["status"] == "rejected":
+            raise RenderRejected(f"Render queue is full ({self.max_queue} waiting)", ticket["retry_after"])
+        if ticket["status"] == "queued" and on_queued is not None:
+            on_queued(ticket)
+        if not self.wait(job_id, timeout):
+            self.cancel(job_id)
+            raise RenderRejected(f"Render {job_id} was not admitted within {timeout}s", self._retry_after())
+        try:
+            yield
+        finally:
+            self.release(job_id)
+
+    def status(self, job_id):
+        """Ticket of a known job, or None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._ticket(job) if job is not None else None
+
+    def load(self):
+        """Current reservations, capacity and queue length"""
+        with self._lock:
+            return {
+                "capacity": dict(self.capacity),
+                "reserved": dict(self._reserved),
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "available_memory_mb": read_available_memory_mb(),
+            }
+
+    def _priority(self, demand, submitted_at):
+        # Ordering by seconds - AGING_RATE * waited is the same at any moment
+        # as ordering by this fixed key, so the queue never needs resorting.
+        if self.policy == "fifo":
+            return submitted_at
+        return demand.get("seconds", 0) + AGING_RATE * submitted_at
+
+    def _fits(self, demand):
+        if not self._running:
+            return True
+        for key, limit in self.capacity.items():
+            if self._reserved[key] + demand.get(key, 0) > limit:
+                return False
+        available = read_available_memory_mb()
+        if available is not None and available - MEMORY_RESERVE_MB < demand.get("memory_mb", 0):
+            return False
+        return True
+
+    def _dispatch(self):
+        """Start queued jobs from the head of the queue while they fit; the lock must be held"""
+        while self._queue and self._fits(self._queue[0]["demand"]):
+            self._start(self._queue.pop(0))
+        if self._queue or any(job["process"] for job in self._running.values()):
+            self._ensure_monitor()
+        self._lock.notify_all()
+
+    def _start(self, job):
+        """Spawn an admitted job's process, then reserve its resources; the lock must be held"""
+        job["started_at"] = time.time()
+        if job["argv"]:
+            # Spawn before reserving, so a job that cannot start holds nothing.
+            try:
+                log_file = open(job["log_path"], "a") if job["log_path"] else subprocess.DEVNULL
+                try:
+                    job["process"] = subprocess.Popen(
+                        job["argv"],
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT,
+                        start_new_session=True,
+                    )
+                finally:
+                    if log_file is not subprocess.DEVNULL:
+                        log_file.close()
+            except OSError as e:
+                self.logger.error(f"Could not start render {job['id']}: {e}")
+                job["status"] = "failed"
+                job["finished_at"] = time.time()
+                job["admitted"].set()
+                return
+        for key in self._reserved:
+            self._reserved[key] += job["demand"].get(key, 0)
+        job["status"] = "running"
+        self._running[job["id"]] = job
+        job["admitted"].set()
+        self.logger.info(f"Started render {job['id']} after {job['started_at'] - job['submitted_at']:.1f}s in queue")
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._monitor_loop, name="render-scheduler", daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        """Reap finished subprocesses and re-check memory for queued jobs until there is nothing to watch"""
+        while True:
+            time.sleep(POLL_INTERVAL)
+            with self._lock:
+                exited = [
+                    (job_id, job["process"].returncode)
+                    for job_id, job in self._running.items()
+                    if job["process"] is not None and job["process"].poll() is not None
+                ]
+            for job_id, exit_code in exited:
+                self.release(job_id, exit_code)
+            with self._lock:
+                self._dispatch_waiting()
+                if not self._queue and not any(job["process"] for job in self._running.values()):
+                    self._monitor = None
+                    return
+
+    def _dispatch_waiting(self):
+        while self._queue and self._fits(self._queue[0]["demand"]):
+            self._start(self._queue.pop(0))
+
+    def _ticket(self, job):
+        ticket = {"job_id": job["id"], "status": job["status"], "position": None, "estimated_wait": 0}
+        if job["status"] == "queued":
+            position = self._queue.index(job)
+            ticket["position"] = position + 1
+            ticket["estimated_wait"] = self._estimated_wait(position)
+        return ticket
+
+    def _estimated_wait(self, position):
+        """Seconds until the job at a queue position starts, assuming the current parallelism"""
+        now = time.time()
+        remaining = sum(
+            max(job["demand"].get("seconds", 0) - (now - job["started_at"]), 0)
+            for job in self._running.values()
+        )
+        ahead = sum(job["demand"].get("seconds", 0) for job in self._queue[:position])
+        return math.ceil((remaining + ahead) / max(len(self._running), 1))
+
+    def _retry_after(self):
+        return max(MIN_RETRY_AFTER, self._estimated_wait(len(self._queue)))
+
+    def _prune_finished(self):
+        cutoff = time.time() - FINISHED_TTL
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] is not None and job["finished_at"] < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,579 @@
+"""
+Schemas for the scene types rendered by DirectVideoGenerator.
+
+Each scene type declares the fields its builder reads. The schemas are
+compiled once at import time into plain closures, so checking a whole video
+costs a few dict lookups per field. validate_video_json runs them before any
+TTS, image download or rendering: it fills in the defaults the builders
+would use, repairs values that are only in the wrong shape (a number sent as
+a string, reversed highlight lines), replaces invalid optional values with
+their defaults or drops them, and raises ValueError listing every problem
+with a required field it cannot repair.
+"""
+import copy
+import json
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+REQUIRED = object()
+
+BLACKBOARD = "./examples/resources/blackboard.jpg"
+BOX_SIDES = ("top", "bottom", "left", "right")
+CONCEPT_MAP_POSITIONS = ("top", "left", "right", "bottom")
+CIRCULAR_FLOW_POSITIONS = ("top_left", "top_right", "bottom_right", "bottom_left", "top", "right", "bottom", "left")
+
+
+def field(kind, default=REQUIRED, optional=False, items=None, schema=None, choices=None, min_items=0, minimum=None):
+    """
+    Declare a field.
+
+    kind is one of "text", "number", "int", "bool", "vector", "list" or
+    "object". A field is required unless it has a default or is optional;
+    optional fields without a default are only checked when present. Lists
+    check each element against items (another field), objects check their
+    keys against schema (a dict of fields).
+    """
+    return {
+        "kind": kind,
+        "default": default,
+        "required": default is REQUIRED and not optional,
+        "items": items,
+        "schema": schema,
+        "choices": tuple(choices) if choices else None,
+        "min_items": min_items,
+        "minimum": minimum,
+    }
+
+
+def text(default=REQUIRED, **kwargs):
+    return field("text", default, **kwargs)
+
+
+def number(default=REQUIRED, **kwargs):
+    return field("number", default, **kwargs)
+
+
+def list_of(items, default=REQUIRED, **kwargs):
+    return field("list", default, items=items, **kwargs)
+
+
+def obj(schema, default=REQUIRED, **kwargs):
+    return field("object", default, schema=schema, **kwargs)
+
+
+SCENE_SCHEMAS = {
+    "title": {
+        "main_text": text(),
+        "subtitle": text(optional=True),
+        "voiceover": text(),
+        "background": text(optional=True),
+        "duration": number(3),
+    },
+    "overview": {
+        "subtitle": text(optional=True),
+        "text": text(),
+        "voiceover": text(),
+        "duration": number(0.5),
+        "subtitle_duration": number(0.5),
+    },
+    "code": {
+        "title": text(),
+        "code": text(),
+        "intro_voiceover": text(optional=True),
+        "intro": obj({"text": text()}),
+        "sections": list_of(obj({
+            "title": text(),
+            "highlight_start": field("int", minimum=1),
+            "highlight_end": field("int", minimum=1),
+            "voiceover": text(),
+            "duration": number(2),
+        })),
+        "conclusion": obj({"text": text()}),
+    },
+    "sequence": {
+        "title": text(),
+        "background": text(optional=True),
+        "actors": list_of(text(), min_items=1),
+        "interactions": list_of(obj({
+            "type": text(),
+            "from": text(),
+            # Required unless the interaction is a note; see _check_sequence.
+            "to": text(optional=True),
+            "message": text(),
+            "voiceover": text(),
+        })),
+    },
+    "image_text": {
+        "title": text(),
+        "text": text(),
+        "voiceover": text(),
+        "wikipedia_topic": text("placeholder"),
+        "num_images": field("int", 1, minimum=1),
+        "duration": number(5),
+    },
+    "multi_image_text": {
+        "title": text(optional=True),
+        "text": text(),
+        "voiceover": text(),
+        "wikipedia_topics": list_of(text(), optional=True),
+        "image_paths": list_of(text(), optional=True),
+        "image_width": number(optional=True, minimum=0),
+        "num_images": field("int", 2, minimum=1),
+        "duration": number(5),
+    },
+    "triangle": {
+        "title": text(optional=True),
+        "voiceover": text(),
+        "top_text": text(),
+        "left_text": text(),
+        "right_text": text(),
+        "top_to_left": text(optional=True),
+        "top_to_right": text(optional=True),
+        "left_to_top": text(optional=True),
+        "left_to_right": text(optional=True),
+        "right_to_top": text(optional=True),
+        "right_to_left": text(optional=True),
+        "duration": number(5),
+    },
+    "timeline": {
+        "title": text(optional=True),
+        "background_image": text(BLACKBOARD),
+        "events": list_of(obj({
+            "year": text(),
+            "text": text(),
+            "narration": text(),
+            "image_description": text(""),
+        }), min_items=1),
+    },
+    "data_processing_flow": {
+        # The layout places exactly two inputs, a processor and an output.
+        "blocks": list_of(obj({
+            "type": text(choices=("input1", "input2", "processor", "output")),
+            "color": text(choices=("green", "red", "blue", "purple")),
+            "text": text(),
+            "voiceover": text(),
+        }), min_items=4),
+        "narration": obj({"conclusion": text()}),
+    },
+    "bullet_points": {
+        "title": text(),
+        "subtitle": text(),
+        "voiceover": text(),
+        "points": list_of(text()),
+        "duration": number(2),
+    },
+    "plan": {
+        "title": text(),
+        "voiceover": text(),
+        "schedule": list_of(obj({"day": text(), "activity": text()})),
+        "duration": number(2),
+    },
+    "multi_section_bullets": {
+        "title": text(),
+        "voiceover": text(),
+        "sections": list_of(obj({"subtitle": text(), "bullets": list_of(text())})),
+        "duration": number(3),
+    },
+    "simple_bullets": {
+        "title": text(),
+        "voiceover": text(),
+        "bullets": list_of(text()),
+        "duration": number(3),
+    },
+    "quick_lecture_slide": {
+        "title": text(),
+        "subtitle": text(""),
+        "voiceover": text(),
+        "points": list_of(text()),
+        "wikipedia_topic": text(optional=True),
+        "image_path": text(optional=True),
+        "duration": number(3),
+    },
+    "dual_image_comparison": {
+        "title": text(),
+        "subtitle": text(""),
+        "voiceover": text(),
+        "left_text": text(),
+        "right_text": text(),
+        "left_wikipedia_topic": text(optional=True),
+        "right_wikipedia_topic": text(optional=True),
+        "left_image_path": text(optional=True),
+        "right_image_path": text(optional=True),
+        "duration": number(3),
+    },
+    "cycle_diagram": {
+        "title": text(optional=True),
+        "voiceover": text(),
+        "boxes": list_of(obj({"text": text(), "position": field("vector")}), min_items=1),
+        # Indexes are checked against boxes in _check_cycle_diagram.
+        "connections": list_of(obj({
+            "start_index": field("int", minimum=0),
+            "start_side": text(choices=BOX_SIDES),
+            "end_index": field("int", minimum=0),
+            "end_side": text(choices=BOX_SIDES),
+        })),
+        "duration": number(3),
+    },
+    "pain_triangle": {
+        "title": text("FRAUD\nTRIANGLE"),
+        "description": text(optional=True),
+        "voiceover": text(),
+        "pressure": text("PRESSURE"),
+        "opportunity": text("OPPORTUNITY"),
+        "rationalization": text("RATIONALIZATION"),
+        "show_connecting_lines": field("bool", False),
+        "duration": number(3),
+    },
+    "central_diagram": {
+        "title": text(optional=True),
+        "voiceover": text(),
+        "center": text("CENTER"),
+        "elements": list_of(obj({"text": text()}), []),
+        "duration": number(3),
+    },
+    "flow_diagram": {
+        # The remaining texts keep the GDP example defaults of the builder.
+        "title": text("How is GDP Measured?"),
+        "voiceover": text(),
+        "definition": text(optional=True),
+        "middle_concepts": list_of(text(), optional=True),
+        "gdp_concepts": list_of(text(), optional=True),
+        "average_text": text(optional=True),
+        "duration": number(3),
+    },
+    "visual_concept_map": {
+        "voiceover": text("This is a visual concept map."),
+        "central_concept": obj({"text": text("Central Concept")}, {"text": "Central Concept"}),
+        "factors": list_of(obj({
+            "text": text(),
+            "position": text(optional=True, choices=CONCEPT_MAP_POSITIONS),
+        }), []),
+        "duration": number(1.5),
+    },
+    "circular_flow_diagram": {
+        "voiceover": text("This is a circular flow diagram."),
+        "central_concept": obj({"text": text("Central Concept")}, {"text": "Central Concept"}),
+        "elements": list_of(obj({
+            "text": text(),
+            "position": text(optional=True, choices=CIRCULAR_FLOW_POSITIONS),
+        }), []),
+        "duration": number(3),
+    },
+    "chemistry": {
+        # Title and voiceover default to text built from the compound name.
+        "compound": text("morphine"),
+        "title": text(optional=True),
+        "voiceover": text(optional=True),
+        "duration": number(3),
+    },
+    "country_map": {
+        "country": text("Uganda"),
+        "title": text(optional=True),
+        "voiceover": text(optional=True),
+        "map_renderer": text(optional=True, choices=("vector", "raster")),
+        "duration": number(3),
+    },
+}
+
+# Schemas of the internal scene types (scene_types.INTERNAL_SCENE_TYPE_MODULES),
+# checked only for JSON the pipeline built itself.
+INTERNAL_SCENE_SCHEMAS = {
+    "fallback_card": {
+        "title": text(),
+        "message": text(""),
+        "duration": number(3),
+    },
+}
+
+VIDEO_SCHEMA = {
+    "output_name": text(optional=True),
+    "background_music": text(optional=True),
+    "map_renderer": text(optional=True, choices=("vector", "raster")),
+    "encoding_profile": text(optional=True),
+    # Absolute time (epoch seconds) the full render should be done by
+    "deadline_at": number(optional=True),
+}
+
+# Fields every scene may carry regardless of its type.
+COMMON_SCENE_FIELDS = {
+    "transition_text": text(optional=True),
+}
+
+
+def _check_sequence(scene, path, errors, repairs):
+    actors = set(scene.get("actors", []))
+    for i, interaction in enumerate(scene.get("interactions", [])):
+        if not isinstance(interaction, dict):
+            continue
+        if "to" not in interaction and interaction.get("type") != "note":
+            errors.append(f"{path}.interactions[{i}].to: missing required field")
+        for key in ("from", "to"):
+            if key in interaction and interaction[key] not in actors:
+                errors.append(f"{path}.interactions[{i}].{key}: unknown actor {interaction[key]!r}")
+
+
+def _check_cycle_diagram(scene, path, errors, repairs):
+    box_count = len(scene.get("boxes", []))
+    for i, conn in enumerate(scene.get("connections", [])):
+        if not isinstance(conn, dict):
+            continue
+        for key in ("start_index", "end_index"):
+            index = conn.get(key)
+            if isinstance(index, int) and index >= box_count:
+                errors.append(f"{path}.connections[{i}].{key}: {index} is out of range for {box_count} boxes")
+
+
+def _check_code(scene, path, errors, repairs):
+    for i, section in enumerate(scene.get("sections", [])):
+        if not isinstance(section, dict):
+            continue
+        start, end = section.get("highlight_start"), section.get("highlight_end")
+        if isinstance(start, int) and isinstance(end, int) and start > end:
+            section["highlight_start"], section["highlight_end"] = end, start
+            repairs.append(f"{path}.sections[{i}]: swapped reversed highlight_start/highlight_end")
+
+
+SCENE_CHECKS = {
+    "sequence": _check_sequence,
+    "cycle_diagram": _check_cycle_diagram,
+    "code": _check_code,
+}
+
+
+def _describe(value):
+    return f"{type(value).__name__} {value!r}"[:80]
+
+
+def _compile_field(spec):
+    """Compile a field into check(value, path, errors, repairs) -> normalized value"""
+    kind = spec["kind"]
+    choices = spec["choices"]
+    minimum = spec["minimum"]
+
+    if kind == "text":
+        def check_type(value, path, errors, repairs):
+            if isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                repairs.append(f"{path}: converted {_describe(value)} to text")
+                return str(value)
+            errors.append(f"{path}: expected text, got {_describe(value)}")
+            return value
+
+    elif kind in ("number", "int"):
+        def check_type(value, path, errors, repairs):
+            original = value
+            if isinstance(value, str):
+                try:
+                    value = float(value.strip())
+                except ValueError:
+                    errors.append(f"{path}: expected a number, got {_describe(original)}")
+                    return original
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{path}: expected a number, got {_describe(original)}")
+                return original
+            if not math.isfinite(value):
+                errors.append(f"{path}: expected a finite number, got {_describe(original)}")
+                return original
+            if kind == "int":
+                if value != int(value):
+                    errors.append(f"{path}: expected a whole number, got {_describe(original)}")
+                    return original
+                value = int(value)
+            if minimum is not None and value < minimum:
+                errors.append(f"{path}: {value} is below the minimum of {minimum}")
+            if original is not value and type(original) is not type(value):
+                repairs.append(f"{path}: converted {_describe(original)} to {value!r}")
+            return value
+
+    elif kind == "bool":
+        def check_type(value, path, errors, repairs):
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+                repairs.append(f"{path}: converted {_describe(value)} to a boolean")
+                return value.strip().lower() == "true"
+            errors.append(f"{path}: expected true or false, got {_describe(value)}")
+            return value
+
+    elif kind == "vector":
+        def check_type(value, path, errors, repairs):
+            if (isinstance(value, list) and len(value) in (2, 3)
+                    and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+                if len(value) == 2:
+                    repairs.append(f"{path}: added z = 0 to a 2D position")
+                    return [value[0], value[1], 0]
+                return value
+            errors.append(f"{path}: expected [x, y, z], got {_describe(value)}")
+            return value
+
+    elif kind == "list":
+        check_item = _compile_field(spec["items"])
+        min_items = spec["min_items"]
+
+        def check_type(value, path, errors, repairs):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected a list, got {_describe(value)}")
+                return value
+            if len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items, got {len(value)}")
+            return [check_item(item, f"{path}[{i}]", errors, repairs) for i, item in enumerate(value)]
+
+    elif kind == "object":
+        check_type = _compile_object(spec["schema"])
+
+    else:
+        raise ValueError(f"Unknown field kind: {kind}")
+
+    if not choices:
+        return check_type
+
+    def check_choice(value, path, errors, repairs):
+        value = check_type(value, path, errors, repairs)
+        if value not in choices:
+            errors.append(f"{path}: {value!r} is not one of {', '.join(choices)}")
+        return value
+
+    return check_choice
+
+
+def _compile_object(schema):
+    """Compile a dict of fields into a check for one JSON object"""
+    fields = []
+    for key, spec in schema.items():
+        check = _compile_field(spec)
+        if not spec["required"]:
+            # A bad optional value falls back to the builder default instead of failing the video.
+            check = _lenient(check, spec)
+        fields.append((key, spec["required"], spec["default"], check))
+
+    def check_object(value, path, errors, repairs):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected an object, got {_describe(value)}")
+            return value
+        normalized = dict(value)
+        for key, required, default, check in fields:
+            if key in value:
+                normalized[key] = check(value[key], f"{path}.{key}", errors, repairs)
+            elif required:
+                errors.append(f"{path}.{key}: missing required field")
+            elif default is not REQUIRED:
+                normalized[key] = copy.deepcopy(default) if isinstance(default, (dict, list)) else default
+        return normalized
+
+    return check_object
+
+
+def _lenient(check, spec):
+    """Wrap the check of an optional field so an invalid value is replaced by its default or dropped"""
+    default = spec["default"]
+
+    def check_lenient(value, path, errors, repairs):
+        field_errors, field_repairs = [], []
+        checked = check(value, path, field_errors, field_repairs)
+        if not field_errors:
+            repairs.extend(field_repairs)
+            return checked
+        if default is REQUIRED:
+            repairs.append(f"{path}: dropped invalid value {_describe(value)} ({field_errors[0]})")
+            return _DROP
+        repairs.append(f"{path}: replaced invalid value {_describe(value)} with {default!r} ({field_errors[0]})")
+        return copy.deepcopy(default) if isinstance(default, (dict, list)) else default
+
+    return check_lenient
+
+
+_DROP = object()
+
+
+def _strip_dropped(value):
+    if isinstance(value, dict):
+        return {k: _strip_dropped(v) for k, v in value.items() if v is not _DROP}
+    if isinstance(value, list):
+        return [_strip_dropped(v) for v in value]
+    return value
+
+
+def _compile_scene_validator(scene_type, schema):
+    check_object = _compile_object(dict(COMMON_SCENE_FIELDS, **schema))
+    scene_check = SCENE_CHECKS.get(scene_type)
+
+    def validate(scene, path, errors, repairs):
+        scene = _strip_dropped(check_object(scene, path, errors, repairs))
+        if scene_check and isinstance(scene, dict):
+            scene_check(scene, path, errors, repairs)
+        return scene
+
+    return validate
+
+
+_SCENE_VALIDATORS = {
+    scene_type: _compile_scene_validator(scene_type, schema) for scene_type, schema in SCENE_SCHEMAS.items()
+}
+_INTERNAL_SCENE_VALIDATORS = {
+    scene_type: _compile_scene_validator(scene_type, schema) for scene_type, schema in INTERNAL_SCENE_SCHEMAS.items()
+}
+
+
+def add_scene_schema(scene_type, schema, check=None):
+    """Register and compile the schema of a scene type added by a plugin"""
+    SCENE_SCHEMAS[scene_type] = schema
+    if check is not None:
+        SCENE_CHECKS[scene_type] = check
+    _SCENE_VALIDATORS[scene_type] = _compile_scene_validator(scene_type, schema)
+
+
+_check_video = _compile_object(VIDEO_SCHEMA)
+
+
+def validate_scene(scene, path="scene", internal=False):
+    """
+    Validate one scene; returns (normalized_scene, errors, repairs).
+    internal also accepts the scene types only the pipeline inserts.
+    """
+    errors, repairs = [], []
+    if not isinstance(scene, dict):
+        return scene, [f"{path}: expected an object, got {_describe(scene)}"], repairs
+    scene_type = scene.get("type")
+    validator = _SCENE_VALIDATORS.get(scene_type)
+    if validator is None and internal:
+        validator = _INTERNAL_SCENE_VALIDATORS.get(scene_type)
+    if validator is None:
+        known = ", ".join(sorted(_SCENE_VALIDATORS))
+        return scene, [f"{path}.type: unknown scene type {scene_type!r} (expected one of {known})"], repairs
+    return validator(scene, path, errors, repairs), errors, repairs
+
+
+def validate_video_json(json_content, internal=False):
+    """
+    Validate and normalize a whole video JSON before rendering.
+
+    Returns (normalized_json, repairs). Defaults used by the scene builders
+    are filled in and repairable values are fixed; raises ValueError listing
+    every remaining problem. internal=True is for JSON the pipeline rewrote
+    itself, such as a segment with a fallback card.
+    """
+    if isinstance(json_content, str):
+        json_content = json.loads(json_content)
+    errors, repairs = [], []
+    video = _strip_dropped(_check_video(json_content, "video", errors, repairs))
+    if isinstance(video, dict):
+        scenes = video.get("scenes")
+        if not isinstance(scenes, list) or not scenes:
+            errors.append("video.scenes: expected a non-empty list of scenes")
+        else:
+            normalized_scenes = []
+            for i, scene in enumerate(scenes):
+                scene, scene_errors, scene_repairs = validate_scene(scene, f"scenes[{i}]", internal)
+                errors.extend(scene_errors)
+                repairs.extend(scene_repairs)
+                normalized_scenes.append(scene)
+            video["scenes"] = normalized_scenes
+
+    if errors:
+        raise ValueError(f"Invalid video JSON ({len(errors)} problems):\n" + "\n".join(errors))
+    if repairs:
+        logger.info(f"Repaired video JSON: {'; '.join(repairs)}")
+    return video, repairs
@@ -0,0 +1,198 @@
+"""
+Scene type registry.
+
+Every scene type is a plugin: a module in this package whose SCENE_TYPES
+dict maps type names to SceneType objects declaring the builder, the assets
+the scene needs and a cost estimator. The registry only records which
+module provides each type and imports a module the first time one of its
+types is used, so a video never loads the dependencies (manim_chemistry,
+matplotlib, code_video widgets, ...) of scene types it does not contain.
+
+Stages that need per-type knowledge (asset prefetching, scheduling, cost
+estimates) go through get_scene_type instead of switching on type names.
+"""
+import importlib
+import logging
+import threading
+
+from render_plan import COST_RATES, estimate_speech_duration
+
+logger = logging.getLogger(__name__)
+
+SCENE_TYPE_MODULES = {
+    "title": "scene_types.slides",
+    "overview": "scene_types.slides",
+    "bullet_points": "scene_types.slides",
+    "plan": "scene_types.slides",
+    "multi_section_bullets": "scene_types.slides",
+    "simple_bullets": "scene_types.slides",
+    "quick_lecture_slide": "scene_types.slides",
+    "image_text": "scene_types.images",
+    "multi_image_text": "scene_types.images",
+    "dual_image_comparison": "scene_types.images",
+    "triangle": "scene_types.diagrams",
+    "data_processing_flow": "scene_types.diagrams",
+    "cycle_diagram": "scene_types.diagrams",
+    "pain_triangle": "scene_types.diagrams",
+    "central_diagram": "scene_types.diagrams",
+    "flow_diagram": "scene_types.diagrams",
+    "visual_concept_map": "scene_types.diagrams",
+    "circular_flow_diagram": "scene_types.diagrams",
+    "code": "scene_types.code_scenes",
+    "sequence": "scene_types.code_scenes",
+    "timeline": "scene_types.timeline",
+    "chemistry": "scene_types.chemistry",
+    "country_map": "scene_types.geography",
+}
+
+# Types the pipeline inserts itself; they are never accepted in scene JSON
+# and scene_type_names() leaves them out.
+INTERNAL_SCENE_TYPE_MODULES = {
+    "fallback_card": "scene_types.slides",
+}
+
+# Time spent on scene changes outside the scene builders: the transition
+# voiceover with its clear and hold, and the closing goodbye.
+TRANSITION_TEXT = "Moving on."
+TRANSITION_HOLD_SECONDS = 1.0
+GOODBYE_SECONDS = 8.0
+
+# Seconds a scene may take beyond its predicted cost before the watchdog
+# replaces it; types that download or lay out heavy content get more.
+DEFAULT_TIME_BUDGET = 60.0
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+class SceneType:
+    """
+    A scene type plugin.
+
+    build(scene, data) draws the scene on a DirectVideoGenerator.
+    assets(data) lists what the scene needs before it can render, as dicts
+    with "kind" ("voiceover", "image", "molecule", "map") and "name".
+    estimate_cost(data, frame_rate) predicts the scene's video duration and
+    worker time from its JSON alone, without building anything.
+    time_budget is the slack in seconds scene_watchdog allows on top of the
+    predicted render time.
+    """
+
+    def __init__(self, name, build, assets, estimate_cost, time_budget=DEFAULT_TIME_BUDGET):
+        self.name = name
+        self.build = build
+        self.assets = assets
+        self.estimate_cost = estimate_cost
+        self.time_budget = time_budget
+
+    def __repr__(self):
+        return f"SceneType({self.name!r})"
+
+
+def register_scene_type(name, module_name, schema=None):
+    """Register a scene type provided by a plugin module, optionally with a validation schema"""
+    with _lock:
+        SCENE_TYPE_MODULES[name] = module_name
+        _loaded.pop(name, None)
+    if schema is not None:
+        from scene_schemas import add_scene_schema
+        add_scene_schema(name, schema)
+
+
+def get_scene_type(name):
+    """Return the SceneType for a type name, importing its plugin module on first use, or None"""
+    with _lock:
+        if name in _loaded:
+            return _loaded[name]
+        module_name = SCENE_TYPE_MODULES.get(name) or INTERNAL_SCENE_TYPE_MODULES.get(name)
+    if module_name is None:
+        return None
+    module = importlib.import_module(module_name)
+    scene_type = module.SCENE_TYPES.get(name)
+    if scene_type is None:
+        logger.error(f"Module {module_name} does not provide scene type '{name}'")
+    with _lock:
+        _loaded[name] = scene_type
+    return scene_type
+
+
+def scene_type_names():
+    return sorted(SCENE_TYPE_MODULES)
+
+
+def voiceover_asset(text):
+    return {"kind": "voiceover", "name": text, "duration": estimate_speech_duration(text)}
+
+
+def estimate_cost(assets, frame_rate=30, animation_seconds=0.0, render_weight=1.0):
+    """
+    Cost of a scene from its assets and the time its animations take.
+
+    Narration and animations run side by side, so the scene lasts as long as
+    the longer of the two. render_weight scales the per-frame render cost for
+    heavier scenes (3D molecules, camera moves over large groups).
+    """
+    speech_seconds = sum(asset["duration"] for asset in assets if asset["kind"] == "voiceover")
+    duration = max(speech_seconds, animation_seconds)
+    frames = int(duration * frame_rate)
+    render_seconds = frames * COST_RATES["render_seconds_per_frame"] * render_weight
+    encode_seconds = frames * COST_RATES["encode_seconds_per_frame"]
+    tts_seconds = sum(1 for asset in assets if asset["kind"] == "voiceover") * COST_RATES["tts_seconds_per_request"]
+    fetch_seconds = sum(
+        asset.get("count", 1) * COST_RATES["image_fetch_seconds"] if asset["kind"] == "image"
+        else COST_RATES["molecule_fetch_seconds"] if asset["kind"] == "molecule"
+        else 0
+        for asset in assets
+    )
+    return {
+        "duration": round(duration, 2),
+        "frames": frames,
+        "render_seconds": round(render_seconds, 2),
+        "encode_seconds": round(encode_seconds, 2),
+        "tts_seconds": round(tts_seconds, 2),
+        "fetch_seconds": round(fetch_seconds, 2),
+        "total_seconds": round(render_seconds + encode_seconds + tts_seconds + fetch_seconds, 2),
+    }
+
+
+def scene_assets(scene):
+    """Assets of one scene JSON, or [] for an unknown type"""
+    scene_type = get_scene_type(scene.get("type"))
+    return scene_type.assets(scene) if scene_type else []
+
+
+def collect_assets(scenes):
+    """Assets needed by a list of scenes, each listed once"""
+    assets = {}
+    for scene in scenes:
+        for asset in scene_assets(scene):
+            assets.setdefault((asset["kind"], str(asset["name"])), asset)
+    return list(assets.values())
+
+
+def estimate_scene_cost(scene, frame_rate=30):
+    scene_type = get_scene_type(scene.get("type"))
+    if scene_type is None:
+        return estimate_cost([], frame_rate)
+    return scene_type.estimate_cost(scene, frame_rate)
+
+
+def estimate_video_cost(scenes, frame_rate=30):
+    """Per-scene and total cost estimates for a video, including transitions and the goodbye"""
+    per_scene = [estimate_scene_cost(scene, frame_rate) for scene in scenes]
+    extras = [
+        estimate_cost(
+            [voiceover_asset(scene.get("transition_text", TRANSITION_TEXT))],
+            frame_rate,
+            TRANSITION_HOLD_SECONDS,
+        )
+        for scene in scenes[:-1]
+    ]
+    extras.append(estimate_cost([], frame_rate, GOODBYE_SECONDS))
+    totals = {key: 0 for key in ("duration", "frames", "render_seconds", "encode_seconds",
+                                 "tts_seconds", "fetch_seconds", "total_seconds")}
+    for cost in per_scene + extras:
+        for key in totals:
+            totals[key] += cost[key]
+    totals = {key: round(value, 2) for key, value in totals.items()}
+    return {"scenes": per_scene, "total": totals}
@@ -0,0 +1,108 @@
+"""3D molecule scenes from PubChem structures"""
+from manim import *
+from manim.opengl import *
+import os
+
+from molecule_cache import get_molecule_cache
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_chemistry_scene(scene, scene_data):
+    """Create a chemistry scene showing 3D molecular structures with OpenGL"""
+
+    # Set background
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    # Get compound data from scene_data
+    compound_name = scene_data.get('compound', 'morphine')
+    title_text = scene_data.get('title', f'{compound_name.capitalize()} Molecular Structure')
+
+    with scene.voiceover(scene_data.get('voiceover', f'This is the molecular structure of {compound_name}.')):
+        # Load MOL file from the local compound store
+        mol_file = scene.get_mol_file(compound_name)
+
+        # Create the scene
+        if mol_file and os.path.exists(mol_file):
+            try:
+                # Create 3D molecule object - this is OpenGL compatible!
+                # Geometry is cached per file, so repeat compounds skip parsing and meshing.
+                molecule = get_molecule_cache().load_molecule(mol_file)
+                molecule.scale_to_fit_width(4)
+
+                # Create title
+                title = Text(title_text, font_size=36, color=WHITE)
+                title.to_edge(UP, buff=0.5)
+
+                # Add compound information if available
+                #compound_info = scene.get_compound_info(compound_name)
+
+                # Display molecule and title
+                scene.play(Write(title), run_time=1.5)
+                scene.play(Create(molecule), run_time=2)
+                scene.wait(1)
+
+                # Show additional information if available
+                ##if compound_info:
+                ##   info_text = Text(compound_info, font_size=20, color=WHITE)
+                ##    info_text.next_to(molecule, DOWN, buff=0.5)
+                ##    scene.play(Write(info_text), run_time=1.5)
+                ##    scene.wait(1)
+
+                # Highlight different parts of the molecule
+                scene.play(
+                    molecule.animate.set_color_by_gradient(BLUE, GREEN, YELLOW),
+                    run_time=2
+                )
+
+                # Rotate molecule for better 3D view
+                scene.play(
+                    molecule.animate.rotate(PI/2, axis=UP),
+                    run_time=3
+                )
+
+                # Additional 3D rotation for dramatic effect
+                scene.play(
+                    molecule.animate.rotate(PI/4, axis=RIGHT),
+                    run_time=2
+                )
+
+                scene.wait(scene_data.get('duration', 3))
+
+            except Exception as e:
+                print(f"Error creating 3D molecule: {e}")
+                show_chemistry_error(scene, compound_name)
+        else:
+            show_chemistry_error(scene, compound_name)
+
+    scene.clear()
+
+
+def show_chemistry_error(scene, compound_name):
+    """Show error message when compound cannot be loaded"""
+    error_title = Text("Chemistry Structure Error", font_size=32, color=RED)
+    error_msg = Text(f"Could not load: {compound_name}", font_size=24, color=WHITE)
+
+    error_group = VGroup(error_title, error_msg).arrange(DOWN, buff=0.5)
+    scene.play(Write(error_group), run_time=2)
+    scene.wait(2)
+
+
+def chemistry_assets(data):
+    compound_name = data.get('compound', 'morphine')
+    return [
+        voiceover_asset(data.get('voiceover', f'This is the molecular structure of {compound_name}.')),
+        {"kind": "molecule", "name": compound_name},
+    ]
+
+
+def chemistry_cost(data, frame_rate=30):
+    # Shaded 3D meshes rotating on screen are the most expensive frames we draw.
+    return estimate_cost(chemistry_assets(data), frame_rate, 11.5 + data.get('duration', 3), render_weight=3)
+
+
+CHEMISTRY_TIME_BUDGET = 180.0  # PubChem downloads and 3D structure layout
+
+
+SCENE_TYPES = {
+    "chemistry": SceneType("chemistry", create_chemistry_scene, chemistry_assets, chemistry_cost, CHEMISTRY_TIME_BUDGET),
+}
@@ -0,0 +1,161 @@
+"""Code walkthroughs and sequence diagrams"""
+from manim import *
+from manim.opengl import *
+import os
+import tempfile
+
+from code_video import AutoScaled, SequenceDiagram
+from code_video.widgets import DEFAULT_FONT
+
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_diagram_with_voiceover(scene, diagram):
+    """
+    Creates the diagram with voiceover narration for each interaction
+
+    Args:
+        diagram: The sequence diagram to animate
+    """
+    from manim.animation.creation import Create
+
+    for interaction in diagram.get_interactions():
+        voiceover_text = interaction.voiceover_text  # Use voiceover_text for narration
+        if voiceover_text:
+            with scene.voiceover(text=voiceover_text) as tracker:
+                scene.play(Create(interaction), run_time=tracker.duration)
+        else:
+            scene.play(Create(interaction))
+
+
+def create_code_scene(scene, code_data):
+
+
+    try:
+        formatted_code = scene.format_code(code_data['code'])
+        print("Formatted code:")
+        print(formatted_code)
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
+            temp_file.write(formatted_code)
+            temp_path = temp_file.name
+
+        try:
+            tex = scene.create_code(temp_path)
+
+            with scene.voiceover(code_data.get('intro_voiceover', f"Let's look at {code_data['title']}")):
+                scene.play(Create(tex))
+            scene.wait(1)
+
+            with scene.voiceover(code_data['intro']['text']):
+                scene.highlight_none(tex)
+                scene.wait(1)
+
+            total_lines = len(formatted_code.splitlines())
+            print(f"Total lines after formatting: {total_lines}")
+
+            for section in code_data['sections']:
+                print(f"Processing section: {section['title']}")
+                start_line = min(section['highlight_start'], total_lines)
+                end_line = min(section['highlight_end'], total_lines)
+
+                with scene.voiceover(section['voiceover']):
+                    scene.highlight_lines(
+                        tex, 
+                        start_line,
+                        end_line,
+                        section['title']
+                    )
+                    scene.wait(section.get('duration', 2))
+
+            with scene.voiceover(code_data['conclusion']['text']):
+                scene.highlight_none(tex)
+                scene.wait(2)
+
+        finally:
+            os.unlink(temp_path)
+
+        scene.clear()
+
+    except Exception as e:
+        print(f"Error in create_code_scene: {type(e).__name__}: {e}")
+        print(f"Current code structure:")
+        print(formatted_code)
+        raise
+
+
+def create_sequence_diagram(scene, sequence_data):
+    print("here is the sequence data", sequence_data)   
+    background_path = sequence_data.get('background')
+    if background_path:
+        scene.add_background(background_path)
+    else:
+        scene.add_background("./examples/resources/blackboard.jpg")
+
+    if 'title' in sequence_data:
+        title = Text(sequence_data['title'], font=DEFAULT_FONT)
+        title.scale(0.8)
+        title.to_edge(UP)
+        scene.add(title)
+
+    diagram = AutoScaled(SequenceDiagram())
+    actors = {}
+    actor_names = sequence_data["actors"]
+    actor_objects = diagram.add_objects(*actor_names)
+
+    for name, obj in zip(actor_names, actor_objects):
+        actors[name] = obj
+
+    for interaction in sequence_data["interactions"]:
+        source = actors[interaction["from"]]
+
+        if interaction["type"] == "note":
+            source.note(
+                message=interaction["message"],
+                voiceover=interaction["voiceover"]
+            )
+        else:
+            target = actors[interaction["to"]]
+            source.to(
+                target,
+                message=interaction["message"],
+                voiceover=interaction["voiceover"]
+            )
+
+    title = Text(sequence_data["title"], font=DEFAULT_FONT)
+    title.scale(0.8)
+    title.to_edge(UP)
+
+    scene.add(title)
+    diagram.next_to(title, DOWN)
+    scene.play(Create(diagram))
+
+    create_diagram_with_voiceover(scene, diagram)
+    scene.wait(0.4)
+    scene.clear()
+
+
+def code_assets(data):
+    texts = [data.get('intro_voiceover', f"Let's look at {data['title']}"), data['intro']['text']]
+    texts += [section['voiceover'] for section in data['sections']]
+    texts.append(data['conclusion']['text'])
+    return [voiceover_asset(text) for text in texts]
+
+
+def sequence_assets(data):
+    return [voiceover_asset(interaction['voiceover']) for interaction in data['interactions']]
+
+
+def code_cost(data, frame_rate=30):
+    section_seconds = sum(1 + section.get('duration', 2) for section in data['sections'])
+    return estimate_cost(code_assets(data), frame_rate, 5 + section_seconds)
+
+
+def sequence_cost(data, frame_rate=30):
+    return estimate_cost(sequence_assets(data), frame_rate, 1.4 + len(data['interactions']))
+
+
+SCENE_TYPES = {
+    "code": SceneType("code", create_code_scene, code_assets, code_cost),
+    "sequence": SceneType("sequence", create_sequence_diagram, sequence_assets, sequence_cost),
+}
@@ -0,0 +1,999 @@
+"""Box-and-arrow diagrams: triangles, cycles, flows and concept maps"""
+from manim import *
+from manim.opengl import *
+from code_video import TextBox, Connection
+
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_triangle_scene(scene, triangle_data):
+    """Scene with three connected components in a triangle layout"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(triangle_data['voiceover']):
+        if 'title' in triangle_data:
+            title = Title(triangle_data['title'])
+            title.to_edge(UP)
+            scene.play(FadeIn(title, run_time=1))
+
+        top = TextBox(triangle_data['top_text'], shadow=False)
+        left = TextBox(triangle_data['left_text'], shadow=False)
+        right = TextBox(triangle_data['right_text'], shadow=False)
+
+        if 'title' in triangle_data:
+            top.next_to(title, DOWN, buff=1)
+        else:
+            top.move_to(UP* 0.5)
+
+        left.next_to(top, DOWN + LEFT, buff=2)
+        right.next_to(top, DOWN + RIGHT, buff=2)
+
+        connections = []
+        if 'top_to_left' in triangle_data:
+            conn1 = Connection(top, left, triangle_data['top_to_left'])
+            connections.append(conn1)
+        if 'top_to_right' in triangle_data:
+            conn2 = Connection(top, right, triangle_data['top_to_right'], padding=-0.7)
+            connections.append(conn2)
+        if 'left_to_right' in triangle_data:
+            conn3 = Connection(left, right, triangle_data['left_to_right'])
+            connections.append(conn3)
+        if 'right_to_left' in triangle_data:
+            conn4 = Connection(right, left, triangle_data['right_to_left'])
+            connections.append(conn4)
+        if 'left_to_top' in triangle_data:
+            conn5 = Connection(left, top, triangle_data['left_to_top'])
+            connections.append(conn5)
+        if 'right_to_top' in triangle_data:
+            conn6 = Connection(right, top, triangle_data['right_to_top'], padding=-0.6)
+            connections.append(conn6)
+
+        elements = VGroup(top, left, right, *connections)
+        #AutoScaled(elements)
+        elements.shift(RIGHT * 0.3)
+
+        # Get the scaled components
+        scaled_top = elements[0]
+        scaled_left = elements[1]
+        scaled_right = elements[2]
+        scaled_connections = elements[3:] if connections else []
+
+        scene.play(FadeIn(scaled_top))
+
+        if connections:
+            for i, conn in enumerate(scaled_connections):  # Use scaled_connections here
+                scene.play(Create(conn))
+                if i == 0 and 'top_to_left' in triangle_data:
+                    scene.play(FadeIn(scaled_left))  # Use scaled_left here
+                elif i == 1 and 'top_to_right' in triangle_data:
+                    scene.play(FadeIn(scaled_right))  # Use scaled_right here
+
+            if i == len(scaled_connections) - 1:  # Use scaled_connections length
+                remaining = []
+                if 'top_to_left' not in triangle_data and scaled_left not in scene.mobjects:  # Use scaled_left
+                    remaining.append(scaled_left)
+                if 'top_to_right' not in triangle_data and scaled_right not in scene.mobjects:  # Use scaled_right
+                    remaining.append(scaled_right)
+                if remaining:
+                    scene.play(*[FadeIn(mob) for mob in remaining])
+        else:
+            scene.play(FadeIn(scaled_left), FadeIn(scaled_right))  # Use scaled elements
+
+        scene.wait(triangle_data.get('duration', 5))
+        scene.clear()
+
+
+def create_data_processing_flow(scene, flow_data):
+    """Data processing flow animation"""
+    color_map = {
+        "green": GREEN,
+        "red": RED,
+        "blue": BLUE,
+        "purple": PURPLE
+    }
+
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    blocks = []
+    for block_config in flow_data['blocks']:
+        block = Rectangle(width=2, height=1, color=color_map[block_config['color']], fill_opacity=0.3)
+
+        block_text = Text(block_config['text'], font_size=20, color=WHITE)
+        margin = 0.2
+        while block_text.width > block.width - margin or block_text.height > block.height - margin:
+            block_text.scale(0.9)
+
+        text_background = Rectangle(
+            width=block_text.width + 0.2,
+            height=block_text.height + 0.2,
+            color=BLACK,
+            fill_opacity=0.5,
+            stroke_opacity=0
+        )
+        text_background.move_to(block_text.get_center())
+
+        text_group = VGroup(text_background, block_text)
+        text_group.move_to(block.get_center())
+
+        block_group = VGroup(block, text_group)
+        blocks.append((block_group, block_config))
+
+    blocks[0][0].shift(LEFT*3 + UP*1.5)
+    blocks[1][0].shift(LEFT*3 + DOWN*1.5)
+    blocks[2][0].shift(ORIGIN)
+    blocks[3][0].shift(RIGHT*3)
+
+    arrows = [
+        Line(blocks[0][0].get_right(), blocks[2][0].get_left(), color=GREEN, tip_length=0.1).add_tip(),
+        Line(blocks[1][0].get_right(), blocks[2][0].get_left(), color=RED, tip_length=0.1).add_tip(),
+        Line(blocks[2][0].get_right(), blocks[3][0].get_left(), color=PURPLE, tip_length=0.1).add_tip()
+    ]
+
+    for block, block_config in blocks:
+        with scene.voiceover(text=block_config['voiceover']):
+            if block_config['type'] in ['input1', 'input2']:
+                scene.play(FadeIn(block))
+            elif block_config['type'] == 'processor':
+                scene.play(
+                    Create(arrows[0]),
+                    Create(arrows[1]),
+                    FadeIn(block)
+                )
+            elif block_config['type'] == 'output':
+                scene.play(
+                    Create(arrows[2]),
+                    FadeIn(block)
+                )
+
+    with scene.voiceover(text=flow_data['narration']['conclusion']):
+        scene.wait(1)
+
+    scene.play(
+        *[FadeOut(block) for block, _ in blocks],
+        *[FadeOut(arrow) for arrow in arrows]
+    )
+
+
+def create_economic_cycle(scene, cycle_data):
+    """Scene with rounded rectangles in a circular flow diagram"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(cycle_data['voiceover']):
+        # Title if provided
+        if "title" in cycle_data:
+            title = Text(cycle_data["title"], font_size=48, weight=BOLD, color=WHITE)
+            title.to_edge(UP)
+            scene.play(Write(title))
+
+        # Extract cycle data
+        boxes = cycle_data["boxes"]
+        connections = cycle_data["connections"]
+
+        # Dynamically create the box groups
+        groups = []
+        for box_info in boxes:
+            # Create rounded rectangle
+            box = RoundedRectangle(corner_radius=0.2, width=4.5, height=1.2).set_color(BLUE)
+
+            # Create text with proper formatting
+            text_lines = box_info["text"].split('\n')
+            text_objects = []
+            for i, line in enumerate(text_lines):
+                text_obj = Text(line, font_size=24, color=WHITE)
+                text_objects.append(text_obj)
+
+            # Arrange text vertically within the box
+            text_group = VGroup(*text_objects).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
+
+            # Scale text if needed to fit in box
+            max_text_width = box.width * 0.9
+            max_text_height = box.height * 0.9
+            if text_group.width > max_text_width or text_group.height > max_text_height:
+                scale_factor = min(max_text_width / text_group.width, max_text_height / text_group.height)
+                text_group.scale(scale_factor)
+
+            # Center text in box
+            text_group.move_to(box.get_center())
+
+            # Create group and position it
+            group = VGroup(box, text_group).shift(box_info["position"])
+            groups.append(group)
+
+        # Dynamically create the curved arrows
+        arrows = []
+        for conn in connections:
+            start_group = groups[conn["start_index"]]
+            end_group = groups[conn["end_index"]]
+
+            # Use getattr to dynamically get the correct side of the box
+            start_point = getattr(start_group, f"get_{conn['start_side']}")()
+            end_point = getattr(end_group, f"get_{conn['end_side']}")()
+
+            # Calculate angle for the arc based on positions
+            start_pos = start_group.get_center()
+            end_pos = end_group.get_center()
+
+            # Determine arc direction based on positions
+            angle_direction = -PI/2  # Default clockwise
+
+            # Adjust angle based on relative positions for better visual flow
+            if start_pos[0] > end_pos[0] and start_pos[1] > end_pos[1]:
+                angle_direction = PI/2  # Counter-clockwise for certain positions
+
+            arrow = ArcBetweenPoints(start_point, end_point, angle=angle_direction).add_tip()
+            arrow.set_color(WHITE)
+            arrows.append(arrow)
+
+        # Animation sequence
+        for i, group in enumerate(groups):
+            scene.play(Create(group))
+            if i < len(arrows):
+                scene.play(Create(arrows[i]))
+            scene.wait(0.3)
+
+        # Highlight the cyclical nature
+        if len(groups) > 0:
+            scene.play(*[Flash(group, color=YELLOW, flash_radius=0.3) for group in groups], run_time=2)
+
+        scene.wait(cycle_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_fraud_triangle(scene, triangle_data):
+    """Scene with triangle diagram and text elements at vertices"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(triangle_data['voiceover']):
+        # Extract text data from the input
+        title_text = triangle_data.get("title", "FRAUD\nTRIANGLE")
+        pressure_text = triangle_data.get("pressure", "PRESSURE")
+        opportunity_text = triangle_data.get("opportunity", "OPPORTUNITY")
+        rationalization_text = triangle_data.get("rationalization", "RATIONALIZATION")
+
+        # Create the main triangle
+        fraud_triangle = Triangle().set_fill(BLACK, opacity=1).set_stroke(WHITE, width=4)
+        fraud_triangle.scale(2.5)
+        scene.play(Create(fraud_triangle))
+
+        # Create the title text
+        title_obj = Text(title_text, font_size=28, weight=BOLD, color=WHITE)
+        title_obj.move_to(fraud_triangle.get_center()).shift(DOWN * 0.6)
+        scene.play(Write(title_obj))
+
+        # Get triangle vertices for positioning
+        triangle_vertices = fraud_triangle.get_vertices()
+        top_vertex = triangle_vertices[0]
+        bottom_left_vertex = triangle_vertices[1]
+        bottom_right_vertex = triangle_vertices[2]
+
+        # Create the text for the three points of the triangle
+        pressure_obj = Text(pressure_text, font_size=20, slant=ITALIC, weight=BOLD, color=WHITE)
+        pressure_obj.move_to(top_vertex + UP * 0.4)
+
+        opportunity_obj = Text(opportunity_text, font_size=20, slant=ITALIC, weight=BOLD, color=WHITE)
+        opportunity_obj.move_to(bottom_right_vertex + DOWN * 0.4 + RIGHT * 0.2)
+
+        rationalization_obj = Text(rationalization_text, font_size=18, weight=BOLD, color=WHITE)
+        rationalization_obj.move_to(bottom_left_vertex + DOWN * 0.4 + LEFT * 0.2)
+
+        # Animate the creation of the surrounding text
+        scene.play(
+            Write(pressure_obj),
+            Write(opportunity_obj),
+            Write(rationalization_obj),
+            run_time=2
+        )
+
+        # Add optional description if provided
+        if "description" in triangle_data:
+            desc_text = Text(triangle_data["description"], font_size=16, color=WHITE)
+            desc_text.to_edge(DOWN, buff=0.5)
+            scene.play(FadeIn(desc_text))
+
+        # Add optional connecting lines if specified
+        if triangle_data.get("show_connecting_lines", False):
+            # Create lines from vertices to text
+            pressure_line = Line(top_vertex, pressure_obj.get_bottom(), color=WHITE, stroke_width=2)
+            opportunity_line = Line(bottom_right_vertex, opportunity_obj.get_top(), color=WHITE, stroke_width=2)
+            rationalization_line = Line(bottom_left_vertex, rationalization_obj.get_top(), color=WHITE, stroke_width=2)
+
+            scene.play(
+                Create(pressure_line),
+                Create(opportunity_line),
+                Create(rationalization_line)
+            )
+
+        scene.wait(triangle_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_central_box_diagram(scene, diagram_data):
+    """Central box diagram with surrounding boxes and arrows (like GDP diagram)"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(diagram_data['voiceover']):
+        # Extract data
+        center_text = diagram_data.get("center", "CENTER")
+        elements = diagram_data.get("elements", [])
+
+        # Predetermined colors and positions
+        colors = [BLUE, GREEN, YELLOW, ORANGE, RED, PURPLE, PINK, GOLD]
+
+        # Create central box with predetermined color and position
+        center_box = Rectangle(width=2.5, height=1, color=BLUE)
+        center_text_obj = Text(center_text, font_size=32, color=WHITE).move_to(center_box.get_center())
+        center_group = VGroup(center_box, center_text_obj)
+
+        # Center position is predetermined (left side)
+        center_group.shift(LEFT*3)
+
+        scene.play(Create(center_group))
+
+        # Create surrounding elements with predetermined positions and colors
+        element_groups = []
+        arrows = []
+
+        for i, element in enumerate(elements):
+            # Use predetermined color cycling through the color list
+            element_color = colors[i % len(colors)]
+
+            # Create element box
+            element_box = Rectangle(width=4, height=1, color=element_color)
+            element_text = Text(element["text"], font_size=28, color=WHITE).move_to(element_box.get_center())
+            element_group = VGroup(element_box, element_text)
+
+            # Predetermined positions (right side, vertically arranged)
+            # Start from top and go down
+            vertical_spacing = 1.5
+            start_y = (len(elements) - 1) * vertical_spacing / 2
+            position_y = start_y - i * vertical_spacing
+
+            element_group.shift(RIGHT*3 + UP*position_y)
+
+            # Create arrow from element to center
+            arrow_start = element_group.get_left()
+            arrow_end = center_group.get_right()
+
+            # Adjust arrow end point based on element position
+            if position_y > 0:  # If element is above center
+                arrow_end = center_group.get_top()
+            elif position_y < 0:  # If element is below center
+                arrow_end = center_group.get_bottom()
+
+            arrow = Arrow(arrow_start, arrow_end, buff=0.3, color=WHITE)
+
+            element_groups.append(element_group)
+            arrows.append(arrow)
+
+            # Animate element and arrow
+            scene.play(Create(element_group), Create(arrow))
+            scene.wait(0.3)
+
+        # Add optional title if provided
+        if "title" in diagram_data:
+            title_text = Text(diagram_data["title"], font_size=36, weight=BOLD, color=WHITE)
+            title_text.to_edge(UP)
+            scene.play(Write(title_text))
+
+        scene.wait(diagram_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_gdp_measurement(scene, gdp_data):
+    """GDP measurement diagram with camera movements - simplified with standard colors"""
+
+
+    with scene.voiceover(gdp_data['voiceover']):
+        # Title
+        title = Text(gdp_data.get("title", "How is GDP Measured?"), font_size=32, color=WHITE).to_edge(UP)
+        scene.play(Write(title))
+        scene.wait(1)
+
+        # SECTION ONE: Left definition box
+        left_box = Rectangle(width=4, height=2, color=GREEN, fill_opacity=0.1)
+        left_text = Text(
+            gdp_data.get("definition", "The total production\nof goods and services\nin the economy"),
+            font_size=18,
+            color=WHITE
+        )
+        left_group = VGroup(left_box, left_text).move_to(np.array([-6, 0, 0]))
+
+        # Focus camera on section one
+        scene.play(
+            scene.camera.animate.scale(0.8).move_to([-6, 0, 0]),
+            run_time=2
+        )
+        scene.play(Create(left_group))
+        scene.wait(2)
+
+        # Helper to make uniform boxes (using standard BLUE color)
+        def make_box(text, width=2.8, height=1, font_size=18):
+            box = Rectangle(width=width, height=height, color=BLUE, fill_opacity=0.08)
+            txt = Text(text, font_size=font_size, color=WHITE).move_to(box.get_center())
+            return VGroup(box, txt)
+
+        # SECTION TWO: Middle column (Production, Income, Expenditure)
+        mid_x = -1.5
+        middle_concepts = gdp_data.get("middle_concepts", ["Production", "Income", "Expenditure"])
+
+        prod_group = make_box(middle_concepts[0]).move_to(np.array([mid_x, 1.5, 0]))
+        inc_group = make_box(middle_concepts[1]).move_to(np.array([mid_x, 0.0, 0]))
+        exp_group = make_box(middle_concepts[2]).move_to(np.array([mid_x, -1.5, 0]))
+
+        # Move camera to show both sections
+        scene.play(
+            scene.camera.animate.scale(1.2).move_to([-6, 0, 0]),
+            run_time=2
+        )
+
+        # Show middle column with arrows from left definition
+        arrow1 = Arrow(left_group.get_right(), prod_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+        arrow2 = Arrow(left_group.get_right(), inc_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+        arrow3 = Arrow(left_group.get_right(), exp_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+
+        scene.play(
+            Create(prod_group), Create(arrow1),
+            Create(inc_group), Create(arrow2),
+            Create(exp_group), Create(arrow3),
+            run_time=3
+        )
+        scene.wait(2)
+
+        # SECTION THREE: GDP (P,I,E) column
+        gdp_x = 3
+        gdp_concepts = gdp_data.get("gdp_concepts", ["GDP (P)", "GDP (I)", "GDP (E)"])
+
+        gdp_p_group = make_box(gdp_concepts[0]).move_to(np.array([gdp_x, 1.5, 0]))
+        gdp_i_group = make_box(gdp_concepts[1]).move_to(np.array([gdp_x, 0.0, 0]))
+        gdp_e_group = make_box(gdp_concepts[2]).move_to(np.array([gdp_x, -1.5, 0]))
+
+        # Move camera to show all three sections
+        scene.play(
+            scene.camera.animate.scale(1.4).move_to([-1, 0, 0]),
+            run_time=2
+        )
+
+        # Arrows from middle to GDP boxes
+        arrow4 = Arrow(prod_group.get_right(), gdp_p_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+        arrow5 = Arrow(inc_group.get_right(), gdp_i_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+        arrow6 = Arrow(exp_group.get_right(), gdp_e_group.get_left(), buff=0.2, stroke_width=3, color=WHITE)
+
+        scene.play(
+            Create(gdp_p_group), Create(arrow4),
+            Create(gdp_i_group), Create(arrow5),
+            Create(gdp_e_group), Create(arrow6),
+            run_time=3
+        )
+        scene.wait(2)
+
+        # SECTION FOUR: Average box (final section)
+        avg_x = 7.5
+        avg_box = Rectangle(width=3.2, height=1.8, color=TEAL, fill_opacity=0.08)
+        avg_text = Text(
+            gdp_data.get("average_text", "Average of\nthese three –\nGDP (A)"),
+            font_size=18,
+            color=WHITE
+        )
+        avg_group = VGroup(avg_box, avg_text).move_to(np.array([avg_x, 0.0, 0]))
+
+        # Move camera to show all sections
+        scene.play(
+            scene.camera.animate.scale(0.7).move_to([6, 0, 0]),
+            run_time=2
+        )
+
+        # Connect each GDP box to the average box
+        line1 = Line(gdp_p_group.get_right(), avg_group.get_left(), stroke_width=3, color=WHITE)
+        line2 = Line(gdp_i_group.get_right(), avg_group.get_left(), stroke_width=3, color=WHITE)
+        line3 = Line(gdp_e_group.get_right(), avg_group.get_left(), stroke_width=3, color=WHITE)
+
+        scene.play(Create(avg_group), run_time=2)
+        scene.wait(1)
+        scene.play(Create(line1), Create(line2), Create(line3), run_time=2)
+        scene.wait(2)
+
+        # Final zoom out to show the complete diagram
+        scene.play(
+            scene.camera.animate.scale(1.3).move_to([0.5, 0, 0]),
+            run_time=3
+        )
+
+        # Hold the final view
+        scene.wait(gdp_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_visual_concept_map(scene, scene_data):
+    """Create a visual concept map with a central concept and connected factors"""
+
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    # Helper function to create rounded rectangles with text
+    def make_factor_box(text, width=3.5, height=1.5, color=GREEN, font_size=20):
+        box = RoundedRectangle(
+            width=width, 
+            height=height, 
+            corner_radius=0.3,
+            color=color, 
+            fill_opacity=1,
+            fill_color=color
+        )
+        txt = Text(text, font_size=font_size,         
+                stroke_width=2,  
+                warn_missing_font=True,
+
+                fill_opacity=1,  
+                 weight=BOLD, 
+                 disable_ligatures=True,
+                 color=WHITE, 
+                 line_spacing=1.1)
+        return VGroup(box, txt)
+
+    # Get data from scene_data or use defaults
+    central_concept = scene_data.get('central_concept', {'text': 'Central Concept'})
+    factors = scene_data.get('factors', [])
+
+    # If no factors provided, use default ones
+    if not factors:
+        factors = [
+            {'text': 'Factor 1', 'position': 'top'},
+            {'text': 'Factor 2', 'position': 'left'},
+            {'text': 'Factor 3', 'position': 'right'},
+            {'text': 'Factor 4', 'position': 'bottom'}
+        ]
+
+    # Define default colors for positions
+    position_colors = {
+        'top': GREEN,
+        'left': BLUE,
+        'right': RED,
+        'bottom': GRAY
+    }
+
+    # Define default sizes for positions
+    position_sizes = {
+        'top': {'width': 5, 'height': 1.2, 'font_size': 18},
+        'left': {'width': 3.2, 'height': 2.2, 'font_size': 16},
+        'right': {'width': 3.2, 'height': 1.8, 'font_size': 18},
+        'bottom': {'width': 4, 'height': 1.4, 'font_size': 18}
+    }
+
+    with scene.voiceover(scene_data.get('voiceover', 'This is a visual concept map.')):
+        # SECTION ONE: Center - Central concept box
+        central_box = RoundedRectangle(
+            width=4.5, 
+            height=2, 
+            corner_radius=0.3,
+            color=DARK_BLUE, 
+            fill_opacity=0.9,
+            fill_color=DARK_BLUE
+        )
+        central_text = Text(central_concept.get('text', 'Central Concept'), 
+                                stroke_width=2,  
+                warn_missing_font=True,
+                font_size= 24, 
+                fill_opacity=1,  
+                 weight=BOLD, 
+                 disable_ligatures=True,
+                 color=WHITE, 
+                 line_spacing=1.1)
+        central_group = VGroup(central_box, central_text).move_to(ORIGIN)
+
+        # Start camera focused on center
+        scene.play(
+            scene.camera.animate.scale(0.6).move_to(ORIGIN),
+            run_time=2
+        )
+        scene.play(Create(central_group), run_time=2)
+        scene.wait(1)
+
+        # Process each factor
+        factor_groups = []
+        lines = []
+
+        for i, factor in enumerate(factors):
+            position = factor.get('position', ['top', 'left', 'right', 'bottom'][i % 4])
+
+            # Get defaults based on position
+            color = position_colors.get(position, GREEN)
+            size_info = position_sizes.get(position, {'width': 3.5, 'height': 1.5, 'font_size': 20})
+
+            # Determine position coordinates
+            if position == 'top':
+                coords = np.array([0, 3.5, 0])
+                line_start = central_group.get_top()
+                line_end_func = lambda group: group.get_bottom()
+                camera_move = [0, 1, 0]
+                camera_scale = 1.4
+            elif position == 'left':
+                coords = np.array([-4.5, 0, 0])
+                line_start = central_group.get_left()
+                line_end_func = lambda group: group.get_right()
+                camera_move = [-1, 0.5, 0]
+                camera_scale = 1.5
+            elif position == 'right':
+                coords = np.array([4.5, 0, 0])
+                line_start = central_group.get_right()
+                line_end_func = lambda group: group.get_left()
+                camera_move = [0.5, 0.5, 0]
+                camera_scale = 0.8
+            else:  # bottom
+                coords = np.array([0, -3.5, 0])
+                line_start = central_group.get_bottom()
+                line_end_func = lambda group: group.get_top()
+                camera_move = [0, -1, 0]
+                camera_scale = 1.4
+
+            # Create factor box with default values
+            factor_group = make_factor_box(
+                factor['text'], 
+                width=size_info['width'],
+                height=size_info['height'],
+                color=color,
+                font_size=size_info['font_size']
+            ).move_to(coords)
+
+            # Create connection line
+            line = Arrow(line_start, line_end_func(factor_group), 
+                        stroke_width=4, color=GRAY, buff=0.1)
+
+            factor_groups.append(factor_group)
+            lines.append(line)
+
+            # Expand camera to show the factor
+            scene.play(
+                scene.camera.animate.scale(camera_scale).move_to(camera_move),
+                run_time=2
+            )
+
+            # Create connection line and factor
+            scene.play(Create(factor_group), Create(line), run_time=2)
+            scene.wait(1)
+
+        # Final view: show all factors
+        scene.play(
+            scene.camera.animate.scale(1).move_to([0, 0, 0]),
+            run_time=2
+        )
+
+        # Add a subtle pulsing effect to the center concept
+        scene.play(
+            central_group.animate.scale(1.1),
+            run_time=0.8
+        )
+        scene.play(
+            central_group.animate.scale(1/1.1),
+            run_time=0.8
+        )
+
+        # Hold the final view
+        scene.wait(scene_data.get('duration', 1.5))
+
+    scene.clear()
+
+
+def create_circular_flow_diagram(scene, scene_data):
+    """Create a circular flow diagram with a central concept and connected elements"""
+
+    # Set background
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    # Get data from scene_data or use defaults
+    central_concept = scene_data.get('central_concept', {'text': 'Central Concept'})
+    elements = scene_data.get('elements', [])
+
+    # If no elements provided, use default ones
+    if not elements:
+        elements = [
+            {'text': 'Element 1', 'position': 'top_left'},
+            {'text': 'Element 2', 'position': 'top_right'},
+            {'text': 'Element 3', 'position': 'bottom_right'},
+            {'text': 'Element 4', 'position': 'bottom_left'}
+        ]
+
+    # Define colors
+    text_color = WHITE  # Changed to white for better visibility on blackboard
+    arrow_color = "#FF7B7B"  # Coral/pink color
+    box_color = "#FFE5E5"   # Light pink for the central box
+
+    with scene.voiceover(scene_data.get('voiceover', 'This is a circular flow diagram.')):
+        # Create the central box
+        central_box = RoundedRectangle(
+            width=3.5, 
+            height=1.2, 
+            corner_radius=0.1,
+            fill_color=box_color,
+            fill_opacity=0.8,
+            stroke_color=text_color,
+            stroke_width=2
+        )
+
+        # Central text - split if it contains a newline
+        central_text_parts = central_concept.get('text', 'Central Concept').split('\n')
+        central_text = VGroup(*[
+            Text(part, font_size=28, color=text_color, weight=BOLD,
+                stroke_width=2,  
+                warn_missing_font=True,
+                fill_opacity=1,  
+                 disable_ligatures=True,
+                 line_spacing=1.1) 
+            for part in central_text_parts
+        ]).arrange(DOWN, buff=0.1)
+
+        central_group = VGroup(central_box, central_text)
+
+        # Start camera focused on center
+        scene.play(
+            scene.camera.animate.scale(0.8).move_to(ORIGIN),
+            run_time=2
+        )
+        scene.play(
+            Write(central_box),
+            Write(central_text),
+            run_time=1.5
+        )
+        scene.wait(0.5)
+
+        # Position elements around the central concept
+        element_groups = []
+        radius = 3.5
+
+        position_mapping = {
+            'top_left': LEFT * radius + UP * 1.5,
+            'top_right': RIGHT * radius + UP * 1.5,
+            'bottom_right': RIGHT * radius + DOWN * 1.5,
+            'bottom_left': LEFT * radius + DOWN * 1.5,
+            'top': UP * radius,
+            'right': RIGHT * radius,
+            'bottom': DOWN * radius,
+            'left': LEFT * radius
+        }
+
+        for i, element in enumerate(elements):
+            position = element.get('position', list(position_mapping.keys())[i % len(position_mapping)])
+            coords = position_mapping.get(position, UP * radius)
+
+            # Create element text
+            element_text = Text(element['text'], font_size=24, color=text_color, weight=BOLD)
+            element_text.move_to(coords)
+            element_groups.append(element_text)
+
+        # Create arrows between elements with proper positioning
+        arrows = []
+
+        # For 4 elements in a cycle (most common case)
+        if len(element_groups) == 4:
+            # Arrow from top_left to top_right
+            arrow1_start = element_groups[0].get_right() + RIGHT * 0.3
+            arrow1_end = element_groups[1].get_left() + LEFT * 0.3
+            arrow1 = CurvedArrow(
+                arrow1_start, arrow1_end,
+                color=arrow_color, stroke_width=8,
+                angle=-TAU/6
+            )
+            arrows.append(arrow1)
+
+            # Arrow from top_right to bottom_right
+            arrow2_start = element_groups[1].get_bottom() + DOWN * 0.2
+            arrow2_end = element_groups[2].get_top() + UP * 0.2
+            arrow2 = CurvedArrow(
+                arrow2_start, arrow2_end,
+                color=arrow_color, stroke_width=8,
+                angle=TAU/6
+            )
+            arrows.append(arrow2)
+
+            # Arrow from bottom_right to bottom_left
+            arrow3_start = element_groups[2].get_left() + LEFT * 0.3
+            arrow3_end = element_groups[3].get_right() + RIGHT * 0.3
+            arrow3 = CurvedArrow(
+                arrow3_start, arrow3_end,
+                color=arrow_color, stroke_width=8,
+                angle=-TAU/6
+            )
+            arrows.append(arrow3)
+
+            # Arrow from bottom_left to top_left
+            arrow4_start = element_groups[3].get_top() + UP * 0.2
+            arrow4_end = element_groups[0].get_bottom() + DOWN * 0.2
+            arrow4 = CurvedArrow(
+                arrow4_start, arrow4_end,
+                color=arrow_color, stroke_width=8,
+                angle=TAU/6
+            )
+            arrows.append(arrow4)
+
+            # Animation sequence for 4 elements
+            scene.play(Write(element_groups[0]), run_time=1)
+            scene.play(Create(arrow1), run_time=1)
+            scene.play(Write(element_groups[1]), run_time=1)
+            scene.play(Create(arrow2), run_time=1)
+            scene.play(Write(element_groups[2]), run_time=1)
+            scene.play(Create(arrow3), run_time=1)
+            scene.play(Write(element_groups[3]), run_time=1)
+            scene.play(Create(arrow4), run_time=1)
+
+        else:
+            # Generic approach for other numbers of elements
+            for i, element_text in enumerate(element_groups):
+                scene.play(Write(element_text), run_time=1)
+
+                if i < len(element_groups) - 1:
+                    # Create arrow to next element
+                    start_pos = element_text.get_center()
+                    end_pos = element_groups[i+1].get_center()
+
+                    # Determine arrow connection points based on relative positions
+                    if element_text.get_center()[0] < element_groups[i+1].get_center()[0]:
+                        # Rightward arrow
+                        start_pos = element_text.get_right() + RIGHT * 0.3
+                        end_pos = element_groups[i+1].get_left() + LEFT * 0.3
+                    else:
+                        # Leftward arrow
+                        start_pos = element_text.get_left() + LEFT * 0.3
+                        end_pos = element_groups[i+1].get_right() + RIGHT * 0.3
+
+                    if element_text.get_center()[1] < element_groups[i+1].get_center()[1]:
+                        # Upward arrow
+                        start_pos = element_text.get_top() + UP * 0.2
+                        end_pos = element_groups[i+1].get_bottom() + DOWN * 0.2
+                    else:
+                        # Downward arrow
+                        start_pos = element_text.get_bottom() + DOWN * 0.2
+                        end_pos = element_groups[i+1].get_top() + UP * 0.2
+
+                    arrow = CurvedArrow(
+                        start_pos, end_pos,
+                        color=arrow_color, stroke_width=8,
+                        angle=-TAU/8
+                    )
+                    arrows.append(arrow)
+                    scene.play(Create(arrow), run_time=1)
+
+            # Connect last element to first if needed
+            if len(element_groups) > 1:
+                start_pos = element_groups[-1].get_center()
+                end_pos = element_groups[0].get_center()
+
+                # Determine connection points
+                if element_groups[-1].get_center()[0] < element_groups[0].get_center()[0]:
+                    # Rightward arrow
+                    start_pos = element_groups[-1].get_right() + RIGHT * 0.3
+                    end_pos = element_groups[0].get_left() + LEFT * 0.3
+                else:
+                    # Leftward arrow
+                    start_pos = element_groups[-1].get_left() + LEFT * 0.3
+                    end_pos = element_groups[0].get_right() + RIGHT * 0.3
+
+                if element_groups[-1].get_center()[1] < element_groups[0].get_center()[1]:
+                    # Upward arrow
+                    start_pos = element_groups[-1].get_top() + UP * 0.2
+                    end_pos = element_groups[0].get_bottom() + DOWN * 0.2
+                else:
+                    # Downward arrow
+                    start_pos = element_groups[-1].get_bottom() + DOWN * 0.2
+                    end_pos = element_groups[0].get_top() + UP * 0.2
+
+                closing_arrow = CurvedArrow(
+                    start_pos, end_pos,
+                    color=arrow_color, stroke_width=8,
+                    angle=TAU/8
+                )
+                arrows.append(closing_arrow)
+                scene.play(Create(closing_arrow), run_time=1)
+
+        scene.wait(1)
+
+        # Highlight the cycle by pulsing the arrows
+        arrow_group = VGroup(*arrows)
+
+        for _ in range(2):
+            scene.play(
+                arrow_group.animate.set_stroke(width=12),
+                run_time=0.5
+            )
+            scene.play(
+                arrow_group.animate.set_stroke(width=8),
+                run_time=0.5
+            )
+
+        scene.wait(1)
+
+        # Final emphasis on the central concept
+        scene.play(
+            central_box.animate.set_fill(opacity=1.0),
+            central_text.animate.scale(1.1),
+            run_time=1
+        )
+
+        # Hold the final view
+        scene.wait(scene_data.get('duration', 3))
+
+    scene.clear()
+
+
+def narrated_assets(data):
+    return [voiceover_asset(data['voiceover'])]
+
+
+def default_narrated_assets(default_voiceover):
+    def assets(data):
+        return [voiceover_asset(data.get('voiceover', default_voiceover))]
+    return assets
+
+
+def data_processing_flow_assets(data):
+    return [voiceover_asset(block['voiceover']) for block in data['blocks']] + [
+        voiceover_asset(data['narration']['conclusion'])
+    ]
+
+
+visual_concept_map_assets = default_narrated_assets('This is a visual concept map.')
+circular_flow_diagram_assets = default_narrated_assets('This is a circular flow diagram.')
+
+
+def triangle_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 6 + data.get('duration', 5))
+
+
+def data_processing_flow_cost(data, frame_rate=30):
+    return estimate_cost(data_processing_flow_assets(data), frame_rate, len(data['blocks']) + 2)
+
+
+def cycle_diagram_cost(data, frame_rate=30):
+    return estimate_cost(
+        narrated_assets(data), frame_rate,
+        1 + len(data['boxes']) + len(data['connections']) + data.get('duration', 3),
+    )
+
+
+def pain_triangle_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 6 + data.get('duration', 3))
+
+
+def central_diagram_cost(data, frame_rate=30):
+    return estimate_cost(
+        narrated_assets(data), frame_rate, 2 + 1.5 * len(data.get('elements', [])) + data.get('duration', 3)
+    )
+
+
+def flow_diagram_cost(data, frame_rate=30):
+    # Camera pans across three sections, so every frame redraws the whole diagram.
+    return estimate_cost(narrated_assets(data), frame_rate, 14 + data.get('duration', 3), render_weight=1.5)
+
+
+def visual_concept_map_cost(data, frame_rate=30):
+    return estimate_cost(
+        visual_concept_map_assets(data), frame_rate,
+        3 + 2 * len(data.get('factors', [])) + data.get('duration', 1.5),
+        render_weight=1.5,
+    )
+
+
+def circular_flow_diagram_cost(data, frame_rate=30):
+    return estimate_cost(
+        circular_flow_diagram_assets(data), frame_rate,
+        3 + 2 * len(data.get('elements', [])) + data.get('duration', 3),
+    )
+
+
+SCENE_TYPES = {
+    "triangle": SceneType("triangle", create_triangle_scene, narrated_assets, triangle_cost),
+    "data_processing_flow": SceneType(
+        "data_processing_flow", create_data_processing_flow, data_processing_flow_assets, data_processing_flow_cost
+    ),
+    "cycle_diagram": SceneType("cycle_diagram", create_economic_cycle, narrated_assets, cycle_diagram_cost),
+    "pain_triangle": SceneType("pain_triangle", create_fraud_triangle, narrated_assets, pain_triangle_cost),
+    "central_diagram": SceneType("central_diagram", create_central_box_diagram, narrated_assets, central_diagram_cost),
+    "flow_diagram": SceneType("flow_diagram", create_gdp_measurement, narrated_assets, flow_diagram_cost),
+    "visual_concept_map": SceneType(
+        "visual_concept_map", create_visual_concept_map, visual_concept_map_assets, visual_concept_map_cost
+    ),
+    "circular_flow_diagram": SceneType(
+        "circular_flow_diagram", create_circular_flow_diagram, circular_flow_diagram_assets, circular_flow_diagram_cost
+    ),
+}
@@ -0,0 +1,116 @@
+"""Country map scenes from the local country geometry store"""
+from manim import *
+from manim.opengl import *
+import os
+
+from country_map import create_country_mobject, render_country_png
+from country_store import get_country_store
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_country_map_scene(scene, scene_data):
+    """Create a country map scene showing a geographic map"""
+
+    # Set background
+    #background = OpenGLImageMobject("./examples/resources/blackboard.jpg")
+    #background.scale_to_fit_width(config.frame_width * 3)
+    #background.scale_to_fit_height(config.frame_height * 3)
+    #background.move_to(ORIGIN)
+    #scene.add(background)
+
+    # Get country data from scene_data
+    country_name = scene_data.get('country', 'Uganda')
+    title_text = scene_data.get('title', f'{country_name} Map')
+
+    map_renderer = scene_data.get('map_renderer', scene.map_renderer)
+    scene.plan.add_asset("map", country_name, True, renderer=map_renderer)
+
+    with scene.voiceover(scene_data.get('voiceover', f'This is a map of {country_name}.')):
+        # Generate the country map
+        country = None
+        map_path = None
+        if map_renderer == 'vector':
+            country = get_country_store().lookup(country_name)
+        else:
+            map_path = create_country_map(country_name)
+
+        # Create and display title
+        title = Text(title_text, font_size=48, color=WHITE)
+        title.to_edge(UP, buff=1)
+        scene.play(Write(title), run_time=1.5)
+
+        # Load and display the map
+        if country is not None:
+            country_map = create_country_mobject(country, width=4.5)
+            country_map.move_to(ORIGIN + DOWN * 0.3)
+            scene.play(FadeIn(country_map), run_time=2)
+        elif map_path and os.path.exists(map_path):
+            try:
+                country_map = scene.load_image(map_path)
+                country_map.scale_to_fit_width(4.5)  # Slightly smaller for better fit
+                country_map.move_to(ORIGIN + DOWN * 0.3)
+                scene.play(FadeIn(country_map), run_time=2)
+
+                # Add some highlighting effect
+
+
+            except Exception as e:
+                print(f"Error loading map: {e}")
+                # Show error message
+                error_text = Text("Map not available", font_size=32, color=RED)
+                error_text.move_to(ORIGIN)
+                scene.play(Write(error_text), run_time=1)
+        else:
+            # Show placeholder if no map
+            placeholder = Rectangle(width=8, height=5, color=BLUE, fill_opacity=0.3)
+            placeholder_text = Text("Map not found", color=WHITE, font_size=24)
+            placeholder_group = VGroup(placeholder, placeholder_text)
+            placeholder_group.move_to(ORIGIN)
+            scene.play(Create(placeholder_group), run_time=1.5)
+
+        # Hold the scene
+        scene.wait(scene_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_country_map(country_name):
+    """Return the path of a rendered map for the country, or None if it is unknown"""
+    try:
+        print(f"Generating map for {country_name}...")
+
+        # Look the country up in the local geometry store (no download)
+        country = get_country_store().lookup(country_name)
+
+        if country is not None:
+            # Plotted once per country and style, then served from the image store
+            map_path = render_country_png(country)
+            print(f"Map for {country_name} ready at {map_path}")
+            return map_path
+        else:
+            print(f"Country '{country_name}' not found in the database")
+            return None
+
+    except Exception as e:
+        print(f"Error generating map: {e}")
+        return None
+
+
+def country_map_assets(data):
+    country_name = data.get('country', 'Uganda')
+    return [
+        voiceover_asset(data.get('voiceover', f'This is a map of {country_name}.')),
+        {"kind": "map", "name": country_name},
+    ]
+
+
+def country_map_cost(data, frame_rate=30):
+    return estimate_cost(country_map_assets(data), frame_rate, 3.5 + data.get('duration', 3))
+
+
+MAP_TIME_BUDGET = 120.0  # building or rasterizing the country polygons
+
+
+SCENE_TYPES = {
+    "country_map": SceneType("country_map", create_country_map_scene, country_map_assets, country_map_cost, MAP_TIME_BUDGET),
+}
@@ -0,0 +1,559 @@
+"""Scenes built around topic images fetched from Wikipedia"""
+from manim import *
+from manim.opengl import *
+import os
+
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_image_text_scene(scene, scene_data):
+    """Simplified scene with title, text, and images - OpenGL compatible"""
+    print("=== STARTING IMAGE TEXT SCENE ===")
+
+    # Add background if it exists
+    try:
+        scene.add_background("./examples/resources/blackboard.jpg")
+        print("Background added successfully")
+    except:
+        print("Background failed to load, continuing without it")
+
+    with scene.voiceover(scene_data['voiceover']):
+
+        # 1. CREATE AND SHOW TITLE
+        print("Creating title...")
+        title = Title(scene_data['title'], font_size=48, color=WHITE)
+        title.to_edge(UP, buff=0.5)
+        scene.play(Write(title), run_time=1)
+        print(f"Title created and displayed: '{scene_data['title']}'")
+
+        # 2. CREATE AND SHOW TEXT
+        print("Creating text...")
+        text_content = scene_data['text']
+        text = Text(text_content, color=WHITE, line_spacing=1.2, font_size=48, disable_ligatures=True,
+should_center=True )
+
+        # Scale text if too wide
+        max_width = 13.5
+        if text.get_width() > max_width:
+            text.scale(max_width / text.get_width())
+            print(f"Text scaled to fit width: {text.get_width()}")
+
+        # Position text below title
+        text.next_to(title, DOWN, buff=0.5)
+        scene.play(FadeIn(text), run_time=1)
+        print("Text displayed successfully")
+
+        # 3. GET IMAGE PATHS
+        print("Getting image paths...")
+        num_images = scene_data.get('num_images', 1)
+        wikipedia_topic = scene_data.get('wikipedia_topic', 'placeholder')
+
+        try:
+            image_paths = scene.get_wikipedia_images(wikipedia_topic, num_images)
+            print(f"Retrieved {len(image_paths) if image_paths else 0} image paths")
+            if image_paths:
+                for i, path in enumerate(image_paths):
+                    print(f"  Image {i+1}: {path}")
+        except Exception as e:
+            print(f"Error getting images: {e}")
+            image_paths = []
+
+        # 4. CREATE IMAGE OBJECTS
+        print("Creating image objects...")
+        images = []
+
+        if not image_paths:
+            print("No images found, creating placeholder")
+            # Create a simple placeholder
+            placeholder = Rectangle(
+                width=4, 
+                height=3, 
+                color=BLUE, 
+                fill_opacity=0.3,
+                stroke_color=WHITE,
+                stroke_width=2
+            )
+            placeholder_text = Text(
+                "No Image Available", 
+                font_size=20, 
+                color=WHITE
+            ).move_to(placeholder.get_center())
+
+            placeholder_group = VGroup(placeholder, placeholder_text)
+            images.append(placeholder_group)
+            print("Placeholder created")
+
+        else:
+            # Try to load actual images
+            for i, path in enumerate(image_paths):
+                print(f"Loading image {i+1}: {path}")
+
+                try:
+                    # Check if file exists
+                    import os
+                    if not os.path.exists(path):
+                        raise FileNotFoundError(f"File not found: {path}")
+
+                    # Check file size
+                    file_size = os.path.getsize(path)
+                    if file_size < 500:  # Less than 500 bytes is suspicious
+                        raise ValueError(f"File too small ({file_size} bytes): {path}")
+
+                    print(f"  File exists, size: {file_size} bytes")
+
+                    # Create image
+                    img = scene.load_image(path)
+
+                    print(f"  OpenGLImageMobject created successfully")
+
+                    # Scale to reasonable size
+                    target_width = 4
+                    if img.get_width() > 0:
+                        scale_factor = target_width / img.get_width()
+                        img.scale(scale_factor)
+                        print(f"  Image scaled by {scale_factor:.2f}")
+
+                    images.append(img)
+                    print(f"  Image {i+1} loaded successfully")
+
+                except Exception as e:
+                    print(f"  Failed to load image {i+1}: {str(e)}")
+
+                    # Create error placeholder
+                    error_rect = Rectangle(
+                        width=4, 
+                        height=3, 
+                        color=RED, 
+                        fill_opacity=0.2,
+                        stroke_color=WHITE,
+                        stroke_width=2
+                    )
+                    error_text = Text(
+                        f"Image {i+1}\nLoad Error", 
+                        font_size=16, 
+                        color=WHITE
+                    ).move_to(error_rect.get_center())
+
+                    error_group = VGroup(error_rect, error_text)
+                    images.append(error_group)
+                    print(f"  Error placeholder created for image {i+1}")
+
+        # 5. POSITION AND DISPLAY IMAGES
+        print(f"Displaying {len(images)} images...")
+
+        if images:
+            # Calculate position below text
+            text_bottom = text.get_bottom()[1]
+            image_y = text_bottom - 1.0  # 1 unit below text
+
+            if len(images) == 1:
+                # Single image - center it
+                img = images[0]
+                img.move_to([0, image_y - img.get_height()/2, 1])
+                print(f"Single image positioned at center, y={image_y}")
+
+            else:
+                # Multiple images - arrange horizontally
+                total_width = sum(img.get_width() for img in images)
+                spacing = 0.5
+                total_space_needed = total_width + spacing * (len(images) - 1)
+
+                # Scale down if needed
+                max_total_width = 12
+                if total_space_needed > max_total_width:
+                    scale_factor = max_total_width / total_space_needed
+                    for img in images:
+                        img.scale(scale_factor)
+                    total_width *= scale_factor
+                    print(f"Images scaled down by {scale_factor:.2f} to fit")
+
+                # Position images
+                start_x = -total_width/2 - spacing*(len(images)-1)/2
+                current_x = start_x
+
+                for i, img in enumerate(images):
+                    x_pos = current_x + img.get_width()/2
+                    y_pos = image_y - img.get_height()/2
+                    img.move_to([x_pos, y_pos, 0])
+                    current_x += img.get_width() + spacing
+                    print(f"Image {i+1} positioned at ({x_pos:.1f}, {y_pos:.1f})")
+
+            # Display all images
+            print("Adding images to scene...")
+            for i, img in enumerate(images):
+                try:
+                    # Simple approach - just add the image
+                    scene.add(img)
+                    print(f"Image {i+1} added to scene")
+
+                    # Small delay between images
+                    if len(images) > 1:
+                        scene.wait(0.2)
+
+                except Exception as e:
+                    print(f"Failed to add image {i+1} to scene: {e}")
+
+                    # Last resort - try a simple rectangle
+                    try:
+                        fallback = Rectangle(
+                            width=2, 
+                            height=1.5, 
+                            color=GRAY, 
+                            fill_opacity=0.5
+                        ).move_to(img.get_center() if hasattr(img, 'get_center') else [0, -2, 0])
+
+                        scene.add(fallback)
+                        print(f"Added fallback rectangle for image {i+1}")
+                    except Exception as e2:
+                        print(f"Even fallback failed for image {i+1}: {e2}")
+
+            print("All images processed")
+
+        else:
+            print("No images to display")
+            no_img_text = Text("No images available", font_size=20, color=GRAY)
+            no_img_text.move_to([0, -2, 0])
+            scene.add(no_img_text)
+
+        # 6. WAIT AND CLEANUP
+        duration = scene_data.get('duration', 5)
+        print(f"Waiting {duration} seconds...")
+        scene.wait(duration)
+
+        print("Clearing scene...")
+        scene.clear()
+        print("=== IMAGE TEXT SCENE COMPLETE ===")
+
+
+def create_multi_image_text_scene(scene, image_text_data):
+    """Scene with multiple images and text"""
+    print(f"Creating scene: {image_text_data.get('title', 'Untitled')}")
+    print(f"Image paths: {image_text_data.get('image_paths', [])}")
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(image_text_data['voiceover']):
+        if 'title' in image_text_data:
+            title = Title(image_text_data['title'])
+            title.to_edge(UP)
+            scene.play(FadeIn(title, run_time=1))
+
+        images = []
+        if 'wikipedia_topics' in image_text_data:
+            num_images = image_text_data.get('num_images', 2)
+            keywords = image_text_data['wikipedia_topics']
+            print(f"Searching for images using keywords: {keywords}")
+
+            image_paths = []
+            for keyword in keywords:
+                print(f"Trying keyword: {keyword}")
+                image_paths = scene.get_wikipedia_images(keyword, num_images)
+                if image_paths:
+                    print(f"Images found for keyword: {keyword}")
+                    break
+                else:
+                    print(f"No images found for keyword: {keyword}")
+
+            if not image_paths:
+                print(f"No images found for any of the keywords: {keywords}")
+                for i in range(num_images):
+                    print(f"Creating placeholder for image {i+1}")
+                    placeholder = Rectangle(width=4, height=3, color=RED)
+                    placeholder_text = Text(f"No image {i+1} found", font_size=20).move_to(placeholder.get_center())
+                    placeholder_group = Group(placeholder, placeholder_text)
+                    # Move placeholder to Z=2 using move_to
+                    current_pos = placeholder_group.get_center()
+                    placeholder_group.move_to([current_pos[0], current_pos[1], 2])
+                    images.append(placeholder_group)
+            else:
+                for path in image_paths:
+                    print(f"\n--- Attempting to load image: {path} ---")
+                    print(f"Image path exists: {os.path.exists(path)}")
+                    if os.path.exists(path):
+                        print(f"Image path permissions: {oct(os.stat(path).st_mode)[-3:]}")
+                        print(f"Image file size: {os.path.getsize(path)} bytes")
+
+                    try:
+                        print("Loading image with OpenGLImageMobject...")
+                        img = scene.load_image(path)
+                        print(f"Image loaded successfully - dimensions: {img.width} x {img.height}")
+
+                        if 'image_width' in image_text_data:
+                            print(f"Setting custom width: {image_text_data['image_width']}")
+                            img.width = image_text_data['image_width']
+                        else:
+                            print("Setting default width: 3")
+                            img.width = 3
+
+                        # MOVE IMAGE TO Z=2 USING move_to (OpenGL compatible)
+                        current_pos = img.get_center()
+                        img.move_to([current_pos[0], current_pos[1], 2])
+                        print("Image moved to Z=2 using move_to (above all other elements)")
+
+                        print("Adding image to collection")
+                        images.append(img)
+
+                    except Exception as e:
+                        print(f"Error loading image: {str(e)}")
+                        print(f"Error type: {type(e).__name__}")
+                        print("Creating placeholder for failed image")
+                        placeholder = Rectangle(width=3, height=2.25, color=RED)
+                        placeholder_text = Text("Image load failed", font_size=18)
+                        placeholder_text.move_to(placeholder.get_center())
+                        error_group = Group(placeholder, placeholder_text)
+                        # Move error placeholder to Z=2 using move_to
+                        current_pos = error_group.get_center()
+                        error_group.move_to([current_pos[0], current_pos[1], 2])
+                        images.append(error_group)
+
+        elif 'image_paths' in image_text_data:
+            for path in image_text_data['image_paths']:
+                try:
+                    img = scene.load_image(path)
+                    if 'image_width' in image_text_data:
+                        img.width = image_text_data['image_width']
+                    else:
+                        img.width = 3
+                    # Move image to Z=2 using move_to
+                    current_pos = img.get_center()
+                    img.move_to([current_pos[0], current_pos[1], 2])
+                    images.append(img)
+                except Exception as e:
+                    print(f"Error loading image: {e}")
+                    placeholder = Rectangle(width=3, height=2.25, color=RED)
+                    placeholder_text = Text("Image load failed", font_size=18).move_to(placeholder.get_center())
+                    error_group = Group(placeholder, placeholder_text)
+                    # Move error placeholder to Z=2 using move_to
+                    current_pos = error_group.get_center()
+                    error_group.move_to([current_pos[0], current_pos[1], 2])
+                    images.append(error_group)
+
+        text = MarkupText(image_text_data['text'], font_size=35, line_spacing=1.2, disable_ligatures=True,  color= WHITE)
+
+                    # Scale text if too wide
+        max_width = 12
+        if text.get_width() > max_width:
+            text.scale(max_width / text.get_width())
+            print(f"Text scaled to fit width: {text.get_width()}")
+
+
+
+
+        # POSITION TEXT FIRST
+        if 'title' in image_text_data:
+            text.next_to(title, DOWN, buff=0.5)
+        else:
+            text.to_edge(UP, buff=1)
+
+        # MOVE TEXT TO Z=1 
+        current_text_pos = text.get_center()
+        text.move_to([current_text_pos[0], current_text_pos[1], 1])
+
+        # CALCULATE POSITION FOR IMAGES (LIKE IN THE WORKING FUNCTION)
+        text_bottom = text.get_bottom()[1]
+        image_y = text_bottom - 1.0  # 1 unit below text
+
+        # POSITION IMAGES INDIVIDUALLY (NO Group.arrange!)
+        if images:
+            total_width = sum(img.get_width() for img in images)
+            spacing = 0.5
+            total_space_needed = total_width + spacing * (len(images) - 1)
+
+            # Scale down if needed
+            max_total_width = 12
+            if total_space_needed > max_total_width:
+                scale_factor = max_total_width / total_space_needed
+                for img in images:
+                    img.scale(scale_factor)
+                total_width *= scale_factor
+                print(f"Images scaled down by {scale_factor:.2f} to fit")
+
+            # Position images horizontally (like the working function)
+            start_x = -total_width/2 - spacing*(len(images)-1)/2
+            current_x = start_x
+
+            for i, img in enumerate(images):
+                x_pos = current_x + img.get_width()/2
+                y_pos = image_y - img.get_height()/2
+                # KEEP THE Z=2 POSITIONING!
+                img.move_to([x_pos, y_pos, 2])  # This maintains Z=2
+                current_x += img.get_width() + spacing
+                print(f"Image {i+1} positioned at ({x_pos:.1f}, {y_pos:.1f}, 2)")
+
+        # ADD TO SCENE
+        scene.play(FadeIn(text), run_time=1)
+        for img in images:
+            scene.play(FadeIn(img), run_time=0.5)
+
+        scene.wait(image_text_data.get('duration', 5))
+
+        scene.clear()
+
+
+def create_dual_image_comparison(scene, comparison_data):
+    """Scene with two images side by side for comparison"""
+    #scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(comparison_data['voiceover']):
+        # Extract data
+        title = comparison_data["title"]
+        subtitle = comparison_data.get("subtitle", "")
+        left_text = comparison_data["left_text"]
+        right_text = comparison_data["right_text"]
+
+        # Try to get images using our image fetching system
+        left_image_path = None
+        right_image_path = None
+
+        if "left_wikipedia_topic" in comparison_data:
+            try:
+                left_image_paths = scene.get_wikipedia_images(comparison_data["left_wikipedia_topic"], num_images=1)
+                if left_image_paths and len(left_image_paths) > 0:
+                    left_image_path = left_image_paths[0]
+                    print(f"Found left image: {left_image_path}")
+            except Exception as e:
+                print(f"Error getting left Wikipedia image: {e}")
+
+        if "right_wikipedia_topic" in comparison_data:
+            try:
+                right_image_paths = scene.get_wikipedia_images(comparison_data["right_wikipedia_topic"], num_images=1)
+                if right_image_paths and len(right_image_paths) > 0:
+                    right_image_path = right_image_paths[0]
+                    print(f"Found right image: {right_image_path}")
+            except Exception as e:
+                print(f"Error getting right Wikipedia image: {e}")
+
+        # Use direct paths if Wikipedia topics not available
+        if not left_image_path and "left_image_path" in comparison_data:
+            left_image_path = comparison_data["left_image_path"]
+
+        if not right_image_path and "right_image_path" in comparison_data:
+            right_image_path = comparison_data["right_image_path"]
+
+        # Title
+        title_text = Text(title, font_size=38, color=WHITE).to_edge(UP, buff=0.7)
+
+        # Subtitle
+        subtitle_text = Text(subtitle, font_size=22, color=GRAY).next_to(title_text, DOWN, buff=0.25)
+
+        # Separator line
+        line = Line(LEFT*6, RIGHT*6, color=WHITE, stroke_width=2).next_to(subtitle_text, DOWN, buff=0.3)
+
+        # LEFT image
+        try:
+            if left_image_path and os.path.exists(left_image_path):
+                left_image = scene.load_image(left_image_path)
+                left_image.scale_to_fit_height(2.8)
+                if left_image.width > 4:
+                    left_image.scale_to_fit_width(4)
+            else:
+                raise FileNotFoundError("Left image not found")
+        except Exception as e:
+            print(f"Error loading left image: {e}")
+            left_image = Rectangle(width=3, height=2, color=BLUE, fill_opacity=0.2)
+            error_text = Text("Left Image\nNot Found", font_size=14, color=WHITE)
+            error_text.move_to(left_image.get_center())
+            left_image = VGroup(left_image, error_text)
+
+        left_image.next_to(line, DOWN, buff=0.6).to_edge(LEFT, buff=1.0)
+
+        # LEFT text
+        left_bullet = Text(f"• {left_text}", font_size=16, color=WHITE)
+        left_bullet.next_to(left_image, DOWN, buff=0.6).to_edge(LEFT, buff=1.0)
+        if left_bullet.width > 4.5:
+            left_bullet.scale_to_fit_width(4.5)
+
+        # RIGHT image
+        try:
+            if right_image_path and os.path.exists(right_image_path):
+                right_image = scene.load_image(right_image_path)
+                right_image.scale_to_fit_height(2.8)
+                if right_image.width > 4:
+                    right_image.scale_to_fit_width(4)
+            else:
+                raise FileNotFoundError("Right image not found")
+        except Exception as e:
+            print(f"Error loading right image: {e}")
+            right_image = Rectangle(width=3, height=2, color=RED, fill_opacity=0.2)
+            error_text = Text("Right Image\nNot Found", font_size=14, color=WHITE)
+            error_text.move_to(right_image.get_center())
+            right_image = VGroup(right_image, error_text)
+
+        right_image.next_to(line, DOWN, buff=0.6).to_edge(RIGHT, buff=1.0)
+
+        # RIGHT text
+        right_bullet = Text(f"• {right_text}", font_size=16, color=WHITE)
+        right_bullet.next_to(right_image, DOWN, buff=0.6).to_edge(RIGHT, buff=1.0)
+        if right_bullet.width > 4.5:
+            right_bullet.scale_to_fit_width(4.5)
+
+        # Animate
+        scene.play(Write(title_text), FadeIn(subtitle_text))
+        scene.play(Create(line))
+
+        # Show LEFT side first
+        scene.play(FadeIn(left_image), FadeIn(left_bullet))
+        scene.wait(0.5)
+
+        # Show RIGHT side
+        scene.play(FadeIn(right_image), FadeIn(right_bullet))
+
+        scene.wait(comparison_data.get('duration', 3))
+
+    scene.clear()
+
+
+def image_text_assets(data):
+    return [
+        voiceover_asset(data['voiceover']),
+        {"kind": "image", "name": data.get('wikipedia_topic', 'placeholder'), "count": data.get('num_images', 1)},
+    ]
+
+
+def multi_image_text_assets(data):
+    assets = [voiceover_asset(data['voiceover'])]
+    # Later topics are only tried when the first one has no images.
+    if data.get('wikipedia_topics'):
+        assets.append({"kind": "image", "name": data['wikipedia_topics'][0], "count": data.get('num_images', 2)})
+    return assets
+
+
+def dual_image_comparison_assets(data):
+    assets = [voiceover_asset(data['voiceover'])]
+    for key in ('left_wikipedia_topic', 'right_wikipedia_topic'):
+        if data.get(key):
+            assets.append({"kind": "image", "name": data[key], "count": 1})
+    return assets
+
+
+def image_text_cost(data, frame_rate=30):
+    return estimate_cost(
+        image_text_assets(data), frame_rate, 2 + data.get('num_images', 1) + data.get('duration', 5)
+    )
+
+
+def multi_image_text_cost(data, frame_rate=30):
+    return estimate_cost(
+        multi_image_text_assets(data), frame_rate, 2 + 0.5 * data.get('num_images', 2) + data.get('duration', 5)
+    )
+
+
+def dual_image_comparison_cost(data, frame_rate=30):
+    return estimate_cost(dual_image_comparison_assets(data), frame_rate, 4 + data.get('duration', 3))
+
+
+IMAGE_TIME_BUDGET = 120.0  # room for a slow image lookup on every image
+
+
+SCENE_TYPES = {
+    "image_text": SceneType(
+        "image_text", create_image_text_scene, image_text_assets, image_text_cost, IMAGE_TIME_BUDGET
+    ),
+    "multi_image_text": SceneType(
+        "multi_image_text", create_multi_image_text_scene, multi_image_text_assets, multi_image_text_cost,
+        IMAGE_TIME_BUDGET,
+    ),
+    "dual_image_comparison": SceneType(
+        "dual_image_comparison", create_dual_image_comparison, dual_image_comparison_assets,
+        dual_image_comparison_cost, IMAGE_TIME_BUDGET,
+    ),
+}
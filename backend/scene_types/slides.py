@@ -0,0 +1,418 @@
+"""Text slides: titles, overviews, bullet lists, schedules and lecture slides"""
+from manim import *
+from manim.opengl import *
+import os
+
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_title_scene(scene, title_data):
+    if 'background' in title_data:
+        scene.add_background(title_data['background'])
+    else:
+        scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(title_data['voiceover']):
+        # Automatically scale the main text to fit within the video width
+        title = MarkupText(title_data['main_text'], font_size=48, fill_opacity=1, weight=BOLD)
+        title.width = min(title.width, config.frame_width * 0.8)  # Ensure it fits within 80% of the frame width
+        title.move_to(ORIGIN)  # Center the title
+        scene.play(Create(title))
+
+        if 'subtitle' in title_data:
+            # Automatically scale the subtitle to fit within the video width
+            subtitle = MarkupText(title_data['subtitle'], font_size=36)
+            subtitle.width = min(subtitle.width, config.frame_width * 0.8)  # Ensure it fits within 80% of the frame width
+            subtitle.next_to(title, direction=DOWN, buff=0.5)  # Add a margin below the title
+            scene.play(FadeIn(subtitle))
+
+        scene.wait(title_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_overview_scene(scene, overview_data):
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(overview_data['voiceover']):
+        if 'subtitle' in overview_data:
+            subtitle = Title(overview_data['subtitle'])
+            subtitle.scale(0.8)
+            subtitle.to_edge(UP)
+            scene.play(FadeIn(subtitle, run_time=1.5))
+            scene.wait(overview_data.get('subtitle_duration', 0.5))
+
+        # Remove AutoScaled and properly center the text
+        text = MarkupText(overview_data['text'], font_size=36)
+
+        # Scale text to fit within frame if too wide
+        if text.width > config.frame_width * 0.8:
+            text.width = config.frame_width * 0.8
+
+        # Center the text
+        text.move_to(ORIGIN)
+
+        scene.play(FadeIn(text, run_time=2))
+        scene.wait(overview_data.get('duration', 0.5))
+
+    scene.clear()
+
+
+def create_bullet_points_scene(scene, bullet_data):
+    """Scene with title, subtitle, and bullet points"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(bullet_data['voiceover']):
+        # Title
+        title = Text(bullet_data['title'], font_size=60, weight=BOLD).to_edge(UP)
+        underline = Line(
+            start=title.get_left(),
+            end=title.get_right(),
+            stroke_width=3
+        ).next_to(title, DOWN, buff=0.2)
+
+        # Subtitle
+        subtitle = Text(bullet_data['subtitle'], font_size=36, weight=BOLD).next_to(underline, DOWN, buff=0.6)
+
+        # Bullet points
+        bullets = VGroup(
+            *[Text(f"- {point}", font_size=28).scale(0.9) for point in bullet_data['points']]
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.3).next_to(subtitle, DOWN, buff=0.5).to_edge(LEFT)
+
+        # Add animations
+        scene.play(Write(title))
+        scene.play(Create(underline))
+        scene.play(FadeIn(subtitle, shift=DOWN))
+        for bullet in bullets:
+            scene.play(FadeIn(bullet, shift=RIGHT))
+            scene.wait(0.5)
+
+        scene.wait(bullet_data.get('duration', 2))
+
+    scene.clear()
+
+
+def create_plan_scene(scene, plan_data):
+    """Scene with title and schedule table"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(plan_data['voiceover']):
+        # Title
+        title = Text(plan_data["title"], font_size=60, weight=BOLD).to_edge(UP)
+        underline = Line(
+            start=title.get_left(),
+            end=title.get_right(),
+            stroke_width=3
+        ).next_to(title, DOWN, buff=0.2)
+
+        scene.play(Write(title))
+        scene.play(Create(underline))
+
+        # Create schedule rows
+        rows = VGroup()
+        for entry in plan_data["schedule"]:
+            day_text = Text(entry["day"], font_size=34, weight=BOLD)
+            activity_text = Text(entry["activity"], font_size=28).next_to(day_text, RIGHT, buff=1.5).align_to(day_text, UP)
+
+            row = VGroup(day_text, activity_text)
+            rows.add(row)
+
+        # Arrange rows vertically
+        rows.arrange(DOWN, buff=1.2).next_to(underline, DOWN, buff=1.0).to_edge(LEFT)
+
+        # Add lines between rows
+        separators = VGroup()
+        for i in range(len(rows)):
+            row = rows[i]
+            line = Line(
+                start=LEFT*6,
+                end=RIGHT*6,
+                stroke_width=2
+            ).next_to(row, UP, buff=0.6)
+            separators.add(line)
+
+        # Animate rows
+        for i, row in enumerate(rows):
+            scene.play(FadeIn(separators[i]))
+            scene.play(FadeIn(row, shift=RIGHT))
+            scene.wait(0.8)
+
+        scene.wait(plan_data.get('duration', 2))
+
+    scene.clear()
+
+
+def create_multi_section_bullets_scene(scene, section_data):
+    """Scene with title and multiple sections with subtitles and bullet points"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(section_data['voiceover']):
+        # Title (large and bold)
+        title = Text(section_data["title"], font_size=48, weight=BOLD, color=WHITE)
+        title.to_edge(UP, buff=1.0)
+        scene.play(Write(title))
+
+        # Separator line under title
+        line = Line(
+            start=LEFT * 6, end=RIGHT * 6, color=WHITE, stroke_width=3
+        ).next_to(title, DOWN, buff=0.4)
+        scene.play(Create(line))
+
+        # Create sections with proper alignment
+        all_content = VGroup()
+
+        for section in section_data["sections"]:
+            # Subtitle (medium size, bold, left-aligned)
+            subtitle = Text(
+                section["subtitle"],
+                font_size=28,
+                weight=BOLD,
+                color=WHITE
+            )
+
+            # Create bullets with consistent left alignment
+            bullet_texts = []
+            for item in section["bullets"]:
+                bullet = Text(f"- {item}", font_size=22, color=WHITE)
+                bullet_texts.append(bullet)
+
+            # Arrange bullets vertically with left alignment
+            bullets = VGroup(*bullet_texts)
+            bullets.arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+
+            # Position bullets relative to subtitle
+            bullets.next_to(subtitle, DOWN, buff=0.4, aligned_edge=LEFT)
+
+            # Group subtitle and bullets together
+            section_group = VGroup(subtitle, bullets)
+            all_content.add(section_group)
+
+        # Arrange all sections vertically with tighter spacing
+        all_content.arrange(DOWN, aligned_edge=LEFT, buff=0.6)
+
+        # Position all content below the line, left-aligned
+        all_content.next_to(line, DOWN, buff=0.6)
+        all_content.to_edge(LEFT, buff=1.5)
+
+        # Check if content fits and scale down if needed
+        bottom_y = all_content.get_bottom()[1]  # Get y-coordinate only
+        if bottom_y < -3.5:  # Bottom of visible area
+            scale_factor = 3.5 / abs(bottom_y)
+            all_content.scale(scale_factor)
+            all_content.next_to(line, DOWN, buff=0.6)
+            all_content.to_edge(LEFT, buff=1.5)
+
+        # Animate sections appearing
+        for section_group in all_content:
+            scene.play(
+                FadeIn(section_group[0]),  # subtitle
+                LaggedStartMap(FadeIn, section_group[1], lag_ratio=0.1)  # bullets
+            )
+            scene.wait(0.5)
+
+        scene.wait(section_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_simple_bullets_scene(scene, bullet_data):
+    """Scene with title and simple bullet points"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    with scene.voiceover(bullet_data['voiceover']):
+        # Title
+        title = Text(bullet_data["title"], font_size=48, weight=BOLD, color=WHITE)
+        title.to_edge(UP)
+        scene.play(Write(title))
+
+        # Bullet points
+        bullet_group = VGroup(
+            *[Text(f"- {item}", font_size=32, color=WHITE).align_to(LEFT, LEFT) for item in bullet_data["bullets"]]
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.4).next_to(title, DOWN, buff=1).to_edge(LEFT)
+
+        # Animate bullets appearing one by one
+        scene.play(LaggedStartMap(FadeIn, bullet_group, shift=RIGHT, lag_ratio=0.2))
+
+        scene.wait(bullet_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_quick_lecture_slide(scene, slide_data):
+    """Quick lecture slide with title, subtitle, bullet points, and image - OpenGL compatible"""
+    scene.background_color = "#f7f5f3"  
+
+    with scene.voiceover(slide_data['voiceover']):
+        # Extract data from the slide_data
+        title = slide_data["title"]
+        subtitle = slide_data.get("subtitle", "")
+        points = slide_data["points"]
+
+        # Try to get an image using our image fetching system
+        image_path = None
+        if "wikipedia_topic" in slide_data:
+            try:
+                image_paths = scene.get_wikipedia_images(slide_data["wikipedia_topic"], num_images=1)
+                if image_paths and len(image_paths) > 0:
+                    image_path = image_paths[0]
+                    print(f"Found image for lecture slide: {image_path}")
+            except Exception as e:
+                print(f"Error getting Wikipedia image: {e}")
+
+        # If no image from Wikipedia, try direct path
+        if not image_path and "image_path" in slide_data:
+            image_path = slide_data["image_path"]
+
+        # Create title and subtitle
+        title_text = Text(title, font_size=38, weight=BOLD, color=WHITE).to_edge(UP, buff=0.7)
+        subtitle_text = Text(subtitle, font_size=20, color=GRAY_B).next_to(title_text, DOWN, buff=0.2)
+
+        # Create separator line
+        line = Line(LEFT*6, RIGHT*6, color=WHITE, stroke_width=2).next_to(subtitle_text, DOWN, buff=0.3)
+
+        # Create bullet points
+        bullets = VGroup(*[Text(f"• {p}", font_size=19, color=WHITE) for p in points])
+        bullets.arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+        bullets.next_to(line, DOWN, buff=0.6).to_edge(LEFT, buff=1.0)
+
+        # Create image or placeholder - FIXED FOR OPENGL
+        img = None
+        try:
+            if image_path and os.path.exists(image_path):
+                print(f"Attempting to load image: {image_path}")
+
+                # Method 1: Try with absolute path
+                abs_path = os.path.abspath(image_path)
+                print(f"Absolute path: {abs_path}")
+
+                # For OpenGL, sometimes we need to use ImageMobject instead of OpenGLImageMobject
+                try:
+                    # Try OpenGLImageMobject first
+                    img = scene.load_image(abs_path)
+                    print("Successfully loaded with OpenGLImageMobject")
+                except Exception as e1:
+                    print(f"OpenGLImageMobject failed: {e1}")
+                    try:
+                        # Fallback to regular ImageMobject
+                        from manim import ImageMobject
+                        img = ImageMobject(abs_path)
+                        print("Successfully loaded with ImageMobject")
+                    except Exception as e2:
+                        print(f"ImageMobject also failed: {e2}")
+                        img = None
+
+                if img is not None:
+                    # Scale the image appropriately
+                    img.scale_to_fit_height(3.5)
+                    if img.width > 4.5:
+                        img.scale_to_fit_width(4.5)
+                    img.next_to(line, DOWN, buff=0.6).to_edge(RIGHT, buff=1.0)
+                    print("Image scaled and positioned successfully")
+                else:
+                    raise Exception("Both image loading methods failed")
+
+        except Exception as e:
+            print(f"Error loading image: {e}")
+            # Create a more visible placeholder
+            img = Rectangle(width=4, height=3, color=BLUE, fill_opacity=0.3, stroke_width=2)
+            img.next_to(line, DOWN, buff=0.6).to_edge(RIGHT, buff=1.0)
+            placeholder_text = Text("Image\nNot Loaded", font_size=16, color=WHITE)
+            placeholder_text.move_to(img.get_center())
+            img = VGroup(img, placeholder_text)
+
+        # Quick animations
+        scene.play(Write(title_text), FadeIn(subtitle_text))
+        scene.play(Create(line))
+        scene.play(LaggedStartMap(FadeIn, bullets, lag_ratio=0.2))
+
+        if img is not None:
+            scene.play(FadeIn(img))
+
+        scene.wait(slide_data.get('duration', 3))
+
+    scene.clear()
+
+
+def create_fallback_card(scene, card_data):
+    """Silent title card standing in for a scene that could not be rendered in time"""
+    scene.add_background("./examples/resources/blackboard.jpg")
+
+    title = Text(card_data['title'], font_size=44, weight=BOLD)
+    title.width = min(title.width, config.frame_width * 0.8)
+    message = Text(card_data['message'], font_size=28, color=GRAY)
+    message.width = min(message.width, config.frame_width * 0.8)
+    message.next_to(title, direction=DOWN, buff=0.5)
+    VGroup(title, message).move_to(ORIGIN)
+
+    scene.play(FadeIn(title), FadeIn(message), run_time=0.5)
+    scene.wait(card_data.get('duration', 3))
+    scene.clear()
+
+
+def narrated_assets(data):
+    return [voiceover_asset(data['voiceover'])]
+
+
+def quick_lecture_slide_assets(data):
+    assets = narrated_assets(data)
+    if data.get('wikipedia_topic'):
+        assets.append({"kind": "image", "name": data['wikipedia_topic'], "count": 1})
+    return assets
+
+
+def title_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 2 + data.get('duration', 3))
+
+
+def overview_cost(data, frame_rate=30):
+    return estimate_cost(
+        narrated_assets(data), frame_rate,
+        3.5 + data.get('subtitle_duration', 0.5) + data.get('duration', 0.5),
+    )
+
+
+def bullet_points_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 1 + 1.5 * len(data['points']) + data.get('duration', 2))
+
+
+def plan_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 2 + 1.8 * len(data['schedule']) + data.get('duration', 2))
+
+
+def multi_section_bullets_cost(data, frame_rate=30):
+    section_seconds = sum(1.5 + len(section['bullets']) for section in data['sections'])
+    return estimate_cost(narrated_assets(data), frame_rate, 2 + section_seconds + data.get('duration', 3))
+
+
+def simple_bullets_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, 1 + len(data['bullets']) + data.get('duration', 3))
+
+
+def fallback_card_assets(data):
+    return []
+
+
+def fallback_card_cost(data, frame_rate=30):
+    return estimate_cost([], frame_rate, 0.5 + data.get('duration', 3))
+
+
+def quick_lecture_slide_cost(data, frame_rate=30):
+    return estimate_cost(
+        quick_lecture_slide_assets(data), frame_rate, 3 + len(data['points']) + data.get('duration', 3)
+    )
+
+
+SCENE_TYPES = {
+    "title": SceneType("title", create_title_scene, narrated_assets, title_cost),
+    "overview": SceneType("overview", create_overview_scene, narrated_assets, overview_cost),
+    "bullet_points": SceneType("bullet_points", create_bullet_points_scene, narrated_assets, bullet_points_cost),
+    "plan": SceneType("plan", create_plan_scene, narrated_assets, plan_cost),
+    "multi_section_bullets": SceneType(
+        "multi_section_bullets", create_multi_section_bullets_scene, narrated_assets, multi_section_bullets_cost
+    ),
+    "simple_bullets": SceneType("simple_bullets", create_simple_bullets_scene, narrated_assets, simple_bullets_cost),
+    "quick_lecture_slide": SceneType(
+        "quick_lecture_slide", create_quick_lecture_slide, quick_lecture_slide_assets, quick_lecture_slide_cost
+    ),
+    "fallback_card": SceneType("fallback_card", create_fallback_card, fallback_card_assets, fallback_card_cost),
+}
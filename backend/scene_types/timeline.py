@@ -0,0 +1,229 @@
+"""Timelines of dated events with optional images and camera moves"""
+from manim import *
+from manim.opengl import *
+import os
+
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def create_timeline_scene(scene, timeline_data):
+    """
+    Creates a timeline animation scene with proper layout, image handling, AND camera movement.
+    Enhanced version combining the working layout fixes with camera scaling/movement from original.
+    """
+    # --- FIXED Background Setup ---
+    bg_path = timeline_data.get("background_image", "./examples/resources/blackboard.jpg")
+    if scene.add_background(bg_path) is None:
+        # Add a solid color background as fallback
+        bg_rect = Rectangle(
+            width=config.frame_width,
+            height=config.frame_height,
+            color=BLACK,
+            fill_opacity=1
+        ).move_to(ORIGIN)
+        scene.add(bg_rect)
+
+    # --- Timeline setup with better spacing ---
+    events = [
+        (event['year'], event['text'], event['narration'], event.get('image_description', ''))
+        for event in timeline_data['events']
+    ]
+    num_events = len(events)
+
+    # Create timeline line - keep it reasonable size
+    timeline_width = min(12, config.frame_width * 0.8)  # Max 12 units or 80% of frame
+    timeline = Line(LEFT * 15, RIGHT * 15, color=WHITE, stroke_width=20)
+
+    # Calculate positions along timeline
+    positions = [timeline.point_from_proportion(i / (num_events - 1)) for i in range(num_events)]
+
+    # --- Title with proper positioning ---
+    title_y = config.frame_height/2 - 1  # 1 unit from top
+    if "title" in timeline_data:
+        title = Title(timeline_data["title"], font_size=48)
+        title.move_to([0, title_y, 1])  # Z=1 to be above background
+        scene.play(FadeIn(title))
+        timeline_y = title_y - 4.5  # Position timeline 2 units below title
+    else:
+        timeline_y = 1  # Default position if no title
+
+    # Position timeline
+    timeline.move_to([0, timeline_y, 1])
+
+    # --- Create timeline elements with FIXED positioning ---
+    dots, year_labels, event_texts, images = [], [], [], []
+
+    for i, (year, text, _, image_desc) in enumerate(events):
+        # Timeline dot
+        dot = Dot(color=BLUE, radius=0.1).move_to([positions[i][0], timeline_y, 1])
+        dots.append(dot)
+
+        # Year label - position above dot
+        year_label = Text(str(year), font_size=24, color=WHITE)
+        year_label.next_to(dot, UP, buff=0.3)
+        year_label.move_to([year_label.get_center()[0], year_label.get_center()[1], 1])
+        year_labels.append(year_label)
+
+        # Event text - position below dot with proper wrapping
+        words = text.split()
+        # Wrap text to 4 words per line for better readability
+        lines = [" ".join(words[j:j + 4]) for j in range(0, len(words), 4)]
+        event_text = Text("\n".join(lines), font_size=18, line_spacing=0.8, color=WHITE)
+        event_text.next_to(dot, DOWN, buff=0.5)
+        event_text.move_to([event_text.get_center()[0], event_text.get_center()[1], 1])
+        event_texts.append(event_text)
+
+        # --- FIXED Image Loading and Positioning ---
+        image_group = None
+
+        if image_desc:
+            print(f"Loading image for event {i+1} ({year}): '{image_desc}'")
+            try:
+                # Use the working image loading method
+                image_paths = scene.get_wikipedia_images(image_desc, num_images=1)
+
+                if image_paths and len(image_paths) > 0:
+                    image_path = image_paths[0]
+                    print(f"Got image path: {image_path}")
+
+                    if os.path.exists(image_path):
+                        print(f"Loading image file: {image_path}")
+
+                        # Create and properly size the image
+                        img = scene.load_image(image_path)
+
+                        # Scale to consistent height
+                        target_height = 2.0
+                        if img.get_height() > 0:
+                            scale_factor = target_height / img.get_height()
+                            img.scale(scale_factor)
+                            print(f"Image scaled to height {target_height} (factor: {scale_factor:.2f})")
+
+                        # Position image above year label
+                        image_y = year_label.get_top()[1] + 0.5
+                        img.move_to([positions[i][0], image_y + img.get_height()/2, 2])
+
+                        # Background border for image
+                        bg_rect = Rectangle(
+                            width=img.get_width(),
+                            height=img.get_height(),
+                            color=WHITE,
+                            fill_opacity=0,   # transparent, just border
+                            stroke_color=WHITE,
+                            stroke_width=2
+                        )
+                        bg_rect.move_to([img.get_center()[0], img.get_center()[1], 1.5])
+
+                        # Group image and border
+                        image_group = Group(bg_rect, img)
+                        print(f"Image positioned at ({positions[i][0]:.1f}, {image_y + img.get_height()/2:.1f})")
+                    else:
+                        print(f"Image file does not exist: {image_path}")
+
+                if image_group is None:
+                    # Fallback: Placeholder card
+                    placeholder = Rectangle(
+                        width=2, height=1.5, 
+                        color=WHITE, fill_opacity=0.1,
+                        stroke_color=RED, stroke_width=2
+                    )
+                    placeholder_text = Text("Image\nNot Found", font_size=14, color=WHITE)
+                    placeholder_text.move_to(placeholder.get_center())
+
+                    image_y = year_label.get_top()[1] + 0.5
+                    image_group = Group(placeholder, placeholder_text)
+                    image_group.move_to([positions[i][0], image_y + 0.75, 2])
+                    print(f"Created placeholder for event {i+1}")
+
+            except Exception as e:
+                print(f"Error loading image for event {i+1}: {e}")
+                # Emergency fallback
+                placeholder = Rectangle(
+                    width=2, height=1.5, 
+                    color=WHITE, fill_opacity=0.1,
+                    stroke_color=RED, stroke_width=2
+                )
+                placeholder_text = Text("Image\nError", font_size=14, color=WHITE)
+                placeholder_text.move_to(placeholder.get_center())
+
+                image_y = year_label.get_top()[1] + 0.5
+                image_group = Group(placeholder, placeholder_text)
+                image_group.move_to([positions[i][0], image_y + 0.75, 2])
+                print(f"Created error placeholder for event {i+1}")
+
+        images.append(image_group)
+
+    # --- Animate timeline creation ---
+    print("Starting timeline animation...")
+    scene.play(Create(timeline), run_time=1)
+    scene.wait(0.5)
+
+    # --- RESTORED: Initial camera setup from original code ---
+    scene.camera.set_euler_angles(phi=0 * DEGREES, theta=0 * DEGREES)
+    scene.camera.scale(1.2)  # simulate zoom
+    print("Camera initialized with proper settings")
+
+    # --- Animate through events one by one WITH CAMERA MOVEMENT ---
+    for i in range(num_events):
+        print(f"Animating event {i+1}: {events[i][0]} with camera movement")
+
+        with scene.voiceover(text=events[i][2]) as tracker:
+            # Prepare animations - include camera movement to focus on current event
+            animations = [
+                FadeIn(dots[i]),
+                FadeIn(year_labels[i]),
+                FadeIn(event_texts[i]),
+                # RESTORED: Camera movement from original code
+                scene.camera.animate.move_to(dots[i]).scale(0.5)  # zoom in on current event
+            ]
+
+            # Add image animation if image exists
+            if images[i] is not None:
+                animations.append(FadeIn(images[i]))
+                print(f"Adding image animation for event {i+1}")
+            else:
+                # Add empty animation group to maintain consistency with original
+                animations.append(AnimationGroup())
+                print(f"No image to animate for event {i+1}")
+
+            # Play animations with camera zoom in (40% of duration)
+            scene.play(*animations, run_time=tracker.duration * 0.4)
+
+            # Hold focused view (20% of duration)
+            scene.wait(tracker.duration * 0.2)
+
+            # RESTORED: Camera zoom back out to show full timeline
+            scene.play(
+                scene.camera.animate.move_to(ORIGIN).scale(2),  # return to full timeline view
+                run_time=tracker.duration * 0.4
+            )
+
+    # Final pause to show complete timeline
+    scene.wait(2)
+
+    # Clear scene
+    print("Clearing timeline scene...")
+    scene.clear()
+    print("Timeline scene complete")
+
+
+def timeline_assets(data):
+    assets = [voiceover_asset(event['narration']) for event in data['events']]
+    assets += [
+        {"kind": "image", "name": event['image_description'], "count": 1}
+        for event in data['events'] if event.get('image_description')
+    ]
+    return assets
+
+
+def timeline_cost(data, frame_rate=30):
+    # The camera follows each event, so every frame redraws the whole timeline.
+    return estimate_cost(timeline_assets(data), frame_rate, 3.5 + len(data['events']), render_weight=1.5)
+
+
+TIMELINE_TIME_BUDGET = 150.0  # one image lookup per event and camera moves
+
+
+SCENE_TYPES = {
+    "timeline": SceneType("timeline", create_timeline_scene, timeline_assets, timeline_cost, TIMELINE_TIME_BUDGET),
+}
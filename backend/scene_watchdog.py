@@ -0,0 +1,165 @@
+"""
+Per-scene isolation for checkpointed renders.
+
+Each scene clip is rendered in its own process under a time budget: the
+scene type's slack (SceneType.time_budget) plus BUDGET_FACTOR times the
+render time the cost model predicts, capped by what is left of the render's
+deadline when it has one. A scene that overruns its budget, or
+whose process dies (GL or memory faults), is killed together with its
+ffmpeg children and replaced by a silent fallback card, so one stuck
+download or pathological layout cannot hold up the whole video.
+
+Run as a script to render one segment:
+
+    python scene_watchdog.py <request.json>
+"""
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from render_history import get_render_history
+from render_options import options_frame_rate
+from scene_types import DEFAULT_TIME_BUDGET, get_scene_type
+
+BUDGET_FACTOR = 3.0
+FALLBACK_TIME_BUDGET = 90.0
+# Never give a process less than this, even past the deadline: starting
+# Python, importing manim and opening a GL context take about this long
+MIN_TIME_BUDGET = 15.0
+# Extra seconds a scene costs when it renders in its own process
+SCENE_PROCESS_OVERHEAD = 6.0
+FALLBACK_MESSAGE = "This part could not be shown."
+
+logger = logging.getLogger(__name__)
+
+
+class SceneTimeout(RuntimeError):
+    """Raised when a scene process overran its budget or died"""
+
+
+def _cap_budget(budget, remaining_seconds):
+    if remaining_seconds is None:
+        return budget
+    return min(budget, max(remaining_seconds, MIN_TIME_BUDGET))
+
+
+def scene_time_budget(json_content, index, render_options, remaining_seconds=None):
+    """
+    Seconds the segment at index (len(scenes) for the goodbye) may take,
+    at most remaining_seconds (the time left before the render's deadline)
+    """
+    scenes = json_content["scenes"]
+    scene = scenes[index] if index < len(scenes) else {"type": "goodbye"}
+    scene_type = get_scene_type(scene.get("type"))
+    slack = scene_type.time_budget if scene_type else DEFAULT_TIME_BUDGET
+    predicted = get_render_history().model().predict_scene(
+        scene, options_frame_rate(render_options), render_options
+    )
+    return _cap_budget(slack + BUDGET_FACTOR * predicted, remaining_seconds)
+
+
+def fallback_scene(scene):
+    """Fallback card standing in for a scene; it has no voiceover, so it renders without TTS"""
+    title = scene.get("title") or scene.get("main_text") or scene.get("type", "").replace("_", " ").title()
+    return {
+        "type": "fallback_card",
+        "title": str(title),
+        "message": FALLBACK_MESSAGE,
+        "duration": 3,
+    }
+
+
+def render_segment(json_content, index, render_options, timeout):
+    """
+    Render one segment in a child process and return its clip path.
+
+    Raises SceneTimeout if the child overruns timeout or exits without a clip.
+    """
+    request_fd, request_path = tempfile.mkstemp(prefix="segment_", suffix=".json")
+    result_path = f"{request_path}.result"
+    try:
+        with os.fdopen(request_fd, "w") as f:
+            json.dump({
+                "video": json_content,
+                "index": index,
+                "render_options": render_options,
+                "result_path": result_path,
+            }, f)
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), request_path],
+            start_new_session=True,
+        )
+        try:
+            exit_code = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # The session holds the scene and any ffmpeg it started
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.wait()
+            raise SceneTimeout(f"Scene {index} overran its {timeout:.0f}s budget")
+        if exit_code != 0 or not os.path.exists(result_path):
+            raise SceneTimeout(f"Scene {index} process exited with code {exit_code}")
+        with open(result_path, "r") as f:
+            return json.load(f)["clip"]
+    finally:
+        for path in (request_path, result_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def render_segment_with_fallback(json_content, index, render_options, remaining_seconds=None):
+    """
+    Render a segment under its time budget, falling back to a title card.
+    remaining_seconds, when given, is the time left before the deadline and
+    caps both budgets.
+
+    Returns (clip path, fallback reason or None). A goodbye that fails, or a
+    scene whose fallback card fails too, is dropped rather than replaced,
+    and its clip path is None.
+    """
+    started = time.monotonic()
+    budget = scene_time_budget(json_content, index, render_options, remaining_seconds)
+    try:
+        return render_segment(json_content, index, render_options, budget), None
+    except SceneTimeout as e:
+        if index >= len(json_content["scenes"]):
+            logger.error(f"{e}; ending the video without a goodbye")
+            return None, str(e)
+        logger.error(f"{e}; replacing it with a fallback card")
+        scenes = list(json_content["scenes"])
+        scenes[index] = fallback_scene(scenes[index])
+        fallback_json = dict(json_content, scenes=scenes)
+        if remaining_seconds is not None:
+            remaining_seconds -= time.monotonic() - started
+        fallback_budget = _cap_budget(FALLBACK_TIME_BUDGET, remaining_seconds)
+        try:
+            return render_segment(fallback_json, index, render_options, fallback_budget), str(e)
+        except SceneTimeout as fallback_error:
+            logger.error(f"{fallback_error}; leaving the scene out")
+            return None, f"{e}; fallback card failed: {fallback_error}"
+
+
+def _run_request(request_path):
+    from direct_video_generator import generate_video_from_json
+
+    with open(request_path, "r") as f:
+        request = json.load(f)
+    clip = generate_video_from_json(request["video"], request["render_options"], segment=[request["index"]])
+    if not clip:
+        sys.exit(1)
+    tmp_path = f"{request['result_path']}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"clip": clip}, f)
+    os.replace(tmp_path, request["result_path"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    _run_request(sys.argv[1])
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules are flat files next to this directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def test_scene_types():
+    """Register the manim-free scene types of tests/scene_type_fixtures.py"""
+    from scene_types import register_scene_type
+
+    for name in ("test_card", "test_image_card"):
+        register_scene_type(name, "scene_type_fixtures")
@@ -0,0 +1,28 @@
+"""Scene types that need no manim, for tests of the cost, scheduling and deadline code"""
+from scene_types import SceneType, estimate_cost, voiceover_asset
+
+
+def build(scene, data):
+    raise NotImplementedError("test scene types are never rendered")
+
+
+def narrated_assets(data):
+    return [voiceover_asset(data["voiceover"])]
+
+
+def image_card_assets(data):
+    return narrated_assets(data) + [{"kind": "image", "name": data["topic"], "count": 1}]
+
+
+def card_cost(data, frame_rate=30):
+    return estimate_cost(narrated_assets(data), frame_rate, data.get("duration", 3))
+
+
+def image_card_cost(data, frame_rate=30):
+    return estimate_cost(image_card_assets(data), frame_rate, data.get("duration", 3))
+
+
+SCENE_TYPES = {
+    "test_card": SceneType("test_card", build, narrated_assets, card_cost),
+    "test_image_card": SceneType("test_image_card", build, image_card_assets, image_card_cost),
+}
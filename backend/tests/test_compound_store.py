@@ -0,0 +1,38 @@
+import json
+import os
+
+import compound_store
+from compound_store import CompoundStore
+
+
+def store_with(tmp_path, monkeypatch, known):
+    store = CompoundStore(str(tmp_path))
+    lookups = []
+
+    def lookup(name):
+        lookups.append(name)
+        cid = known.get(name)
+        return {"CID": cid, "MolecularFormula": f"F{cid}"} if cid else None
+
+    monkeypatch.setattr(store, "_lookup_name", lookup)
+    return store, lookups
+
+
+def test_processes_merge_resolved_names(tmp_path, monkeypatch):
+    first, _ = store_with(tmp_path, monkeypatch, {"water": 962})
+    second, _ = store_with(tmp_path, monkeypatch, {"caffeine": 2519})
+    assert first.resolve_many(["Water"]) == {"Water": 962}
+    assert second.resolve_many(["Caffeine", "unobtainium"]) == {"Caffeine": 2519}
+
+    with open(os.path.join(str(tmp_path), compound_store.INDEX_FILE)) as f:
+        index = json.load(f)
+    assert index["names"] == {"water": 962, "caffeine": 2519}
+    assert set(index["properties"]) == {"962", "2519"}
+    assert second.get_properties("water")["MolecularFormula"] == "F962"
+
+
+def test_known_names_skip_the_lookup(tmp_path, monkeypatch):
+    store, lookups = store_with(tmp_path, monkeypatch, {"water": 962})
+    store.resolve_many(["water"])
+    store.resolve_many(["  WATER "])
+    assert lookups == ["water"]
@@ -0,0 +1,53 @@
+import io
+import json
+import os
+
+from PIL import Image
+
+import image_service
+from image_service import ImageService
+
+
+class FakeFetcher:
+    """Answers every topic with images already put in the store"""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.calls = 0
+
+    def fetch_images(self, topic, num_images, store_dir):
+        self.calls += 1
+        return self.paths[:num_images], True
+
+
+def stored_image(service, color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+    return service.store.add(buffer.getvalue())
+
+
+def service_with(tmp_path, monkeypatch, color):
+    service = ImageService(str(tmp_path))
+    fetcher = FakeFetcher([stored_image(service, color)])
+    monkeypatch.setattr(service, "_fetcher", lambda width: fetcher)
+    return service, fetcher
+
+
+def test_processes_merge_their_topics(tmp_path, monkeypatch):
+    first, _ = service_with(tmp_path, monkeypatch, "red")
+    second, _ = service_with(tmp_path, monkeypatch, "blue")
+    red = first.get_images("Red things", num_images=1)
+    blue = second.get_images("Blue things", num_images=1)
+
+    with open(os.path.join(str(tmp_path), image_service.TOPIC_INDEX_FILE)) as f:
+        topics = json.load(f)
+    assert topics["red things"]["paths"] == red
+    assert topics["blue things"]["paths"] == blue
+    assert second.get_cached_images("red things", num_images=1) == red
+
+
+def test_cached_topic_skips_the_fetch(tmp_path, monkeypatch):
+    service, fetcher = service_with(tmp_path, monkeypatch, "red")
+    paths = service.get_images("Red things", num_images=1)
+    assert service.get_images("  red   THINGS ", num_images=1) == paths
+    assert fetcher.calls == 1
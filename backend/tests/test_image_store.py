@@ -0,0 +1,121 @@
+import io
+import json
+import os
+
+import pytest
+from PIL import Image
+
+import image_store
+from image_store import ImageStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A wall clock that only moves when a test advances it"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(image_store.time, "time", lambda: now[0])
+    return now
+
+
+def png(color, size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def read_index(store_dir):
+    with open(os.path.join(store_dir, image_store.INDEX_FILE)) as f:
+        return json.load(f)
+
+
+def test_add_verifies_and_deduplicates(tmp_path):
+    store = ImageStore(str(tmp_path))
+    path = store.add(png("red"), source_url="https://example.org/a.png")
+    assert os.path.exists(path)
+    assert os.path.exists(store._normalized_path_for(os.path.basename(path).split(".")[0]))
+    # The same bytes from another URL are stored once
+    assert store.add(png("red"), source_url="https://example.org/b.png") == path
+    assert store.get_entry(path)["source_urls"] == ["https://example.org/a.png", "https://example.org/b.png"]
+    assert store.add(b"not an image") is None
+
+    reopened = ImageStore(str(tmp_path))
+    assert reopened.lookup_url("https://example.org/b.png") == path
+
+
+def test_processes_merge_their_entries(tmp_path):
+    first = ImageStore(str(tmp_path))
+    second = ImageStore(str(tmp_path))
+    red = first.add(png("red"), source_url="https://example.org/red.png")
+    blue = second.add(png("blue"), source_url="https://example.org/blue.png")
+
+    index = read_index(str(tmp_path))
+    assert index["urls"] == {
+        "https://example.org/red.png": os.path.basename(red).split(".")[0],
+        "https://example.org/blue.png": os.path.basename(blue).split(".")[0],
+    }
+    # Saving picked up the other process's entry as well
+    assert second.lookup_url("https://example.org/red.png") == red
+
+
+def test_touches_are_batched_and_never_move_back(tmp_path, clock):
+    first = ImageStore(str(tmp_path))
+    path = first.add(png("red"))
+    digest = os.path.basename(path).split(".")[0]
+    second = ImageStore(str(tmp_path))
+
+    clock[0] += 10
+    assert second.touch(path)
+    # Within TOUCH_SAVE_INTERVAL the access time stays in memory
+    assert read_index(str(tmp_path))["images"][digest]["last_access"] == 1_000_000.0
+    second.flush()
+    assert read_index(str(tmp_path))["images"][digest]["last_access"] == 1_000_010.0
+
+    # An older in-memory access time from another process does not win
+    first.add(png("blue"))
+    assert read_index(str(tmp_path))["images"][digest]["last_access"] == 1_000_010.0
+
+
+def test_evicts_least_recently_used_first(tmp_path, clock):
+    store = ImageStore(str(tmp_path))
+    old = store.add(png("red"))
+    clock[0] += 1
+    stale = store.add(png("green"))
+    clock[0] += 1
+    new = store.add(png("blue"))
+    clock[0] += 1
+    store.touch(old)
+
+    total = sum(entry["size"] for entry in store._index["images"].values())
+    store.max_bytes = total - store.get_entry(stale)["size"]
+    store.flush()
+
+    # green was used longest ago; red was touched after it
+    assert not os.path.exists(stale)
+    assert store.get_entry(stale) is None
+    assert os.path.exists(old) and os.path.exists(new)
+    assert os.path.basename(stale).split(".")[0] not in read_index(str(tmp_path))["images"]
+
+
+def test_newly_added_image_is_kept_even_over_budget(tmp_path):
+    store = ImageStore(str(tmp_path), max_bytes=1)
+    path = store.add(png("red"))
+    assert os.path.exists(path)
+    second = store.add(png("blue"))
+    assert os.path.exists(second)
+    assert not os.path.exists(path)
+
+
+def test_evicted_file_is_not_resurrected_by_a_stale_process(tmp_path):
+    first = ImageStore(str(tmp_path))
+    path = first.add(png("red"))
+    digest = os.path.basename(path).split(".")[0]
+    second = ImageStore(str(tmp_path))
+
+    # Another process evicts the image while second still has it in memory
+    first.max_bytes = 1
+    first.add(png("blue"))
+    assert not os.path.exists(path)
+
+    second._changed_entry(digest)
+    second.flush()
+    assert digest not in read_index(str(tmp_path))["images"]
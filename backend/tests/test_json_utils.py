@@ -0,0 +1,92 @@
+import pytest
+
+from json_utils import SceneStreamParser, clean_generated_text, parse_generated_json
+
+
+def repair_types(repairs):
+    return [repair["type"] for repair in repairs]
+
+
+def test_plain_json():
+    assert parse_generated_json('{"a": 1}') == ({"a": 1}, [])
+
+
+def test_missing_and_trailing_commas():
+    result, repairs = parse_generated_json('{"a": [1 2,], "b": 3,}')
+    assert result == {"a": [1, 2], "b": 3}
+    assert sorted(repair_types(repairs)) == ["inserted_missing_comma", "removed_trailing_comma", "removed_trailing_comma"]
+
+
+def test_code_fence_and_unterminated_output():
+    result, repairs = parse_generated_json('```json\n{"scenes": [{"type": "title"')
+    assert result == {"scenes": [{"type": "title"}]}
+    assert "stripped_code_fence" in repair_types(repairs)
+    assert "closed_unterminated_object" in repair_types(repairs)
+
+
+def test_invalid_escape_keeps_backslash():
+    result, repairs = parse_generated_json('{"code": "\\d+ and \\n"}')
+    assert result == {"code": "\\d+ and \n"}
+    assert repair_types(repairs) == ["kept_invalid_escape"]
+
+
+def test_bracket_in_prose_before_object():
+    assert parse_generated_json('Here [note]: {"a": 1}')[0] == {"a": 1}
+
+
+def test_parseable_array_in_prose_does_not_win():
+    text = 'see [1] for details {"title": "T", "scenes": [{"type": "title"}]}'
+    result, repairs = parse_generated_json(text)
+    assert result == {"title": "T", "scenes": [{"type": "title"}]}
+    assert "ignored_trailing_text" not in repair_types(repairs)
+    assert clean_generated_text(text) == result
+
+
+def test_brace_in_prose_before_object():
+    assert parse_generated_json('Use {name} here: {"a": {"b": 2}}')[0] == {"a": {"b": 2}}
+
+
+def test_object_followed_by_prose_is_kept():
+    result, repairs = parse_generated_json('{"a": {"b": 2}} Hope this helps {!}')
+    assert result == {"a": {"b": 2}}
+    assert repair_types(repairs) == ["ignored_trailing_text"]
+
+
+def test_array_document():
+    assert parse_generated_json('Result: [1, 2]')[0] == [1, 2]
+
+
+def test_no_json():
+    with pytest.raises(ValueError):
+        parse_generated_json("nothing here")
+
+
+def feed_all(parser, text, size):
+    scenes = []
+    for i in range(0, len(text), size):
+        scenes.extend(parser.feed(text[i:i + size]))
+    return scenes
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_stream_emits_scenes_as_they_close(size):
+    text = ('Sure!\n```json\n{"title": "T", "scenes": [{"type": "title", "voiceover": "Say \\"hi\\"\\n"}, '
+            '{"type": "overview", "text": "a } b"}]}\n```')
+    parser = SceneStreamParser()
+    scenes = feed_all(parser, text, size)
+    assert scenes == [
+        {"type": "title", "voiceover": 'Say "hi"\n'},
+        {"type": "overview", "text": "a } b"},
+    ]
+    assert parser.close()["scenes"] == scenes
+
+
+def test_stream_ignores_string_value_named_scenes():
+    text = '{"topic": "scenes", "other": [{"type": "x"}], "scenes": [{"type": "title"}]}'
+    parser = SceneStreamParser()
+    assert feed_all(parser, text, 2) == [{"type": "title"}]
+
+
+def test_stream_decodes_escaped_key():
+    parser = SceneStreamParser()
+    assert feed_all(parser, '{"sc\\u0065nes": [{"type": "title"}]}', 4) == [{"type": "title"}]
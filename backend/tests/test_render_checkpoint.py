@@ -0,0 +1,50 @@
+from render_checkpoint import RenderCheckpoint, segment_key
+
+VIDEO = {
+    "output_name": "demo",
+    "scenes": [
+        {"type": "title", "title": "One", "voiceover": "One."},
+        {"type": "title", "title": "Two", "voiceover": "Two."},
+    ],
+}
+OPTIONS = {"quality": "low_quality", "frame_rate": 15}
+
+
+def make_clip(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"clip")
+    return str(path)
+
+
+def test_resume_reuses_finished_clips(tmp_path):
+    checkpoint = RenderCheckpoint("demo", str(tmp_path / "checkpoints"))
+    checkpoint.start(VIDEO, OPTIONS)
+    key = segment_key(VIDEO, 0, OPTIONS)
+    path = checkpoint.complete(0, key, make_clip(tmp_path, "part0.mp4"))
+
+    resumed = RenderCheckpoint("demo", str(tmp_path / "checkpoints"))
+    assert resumed.completed_clip(0, key) == path
+    assert resumed.completed_clip(1, segment_key(VIDEO, 1, OPTIONS)) is None
+    assert resumed.progress() == (1, 3)
+
+
+def test_fallback_cards_are_not_reused(tmp_path):
+    checkpoint = RenderCheckpoint("demo", str(tmp_path / "checkpoints"))
+    checkpoint.start(VIDEO, OPTIONS)
+    key = segment_key(VIDEO, 1, OPTIONS)
+    checkpoint.complete(1, key, make_clip(tmp_path, "part1.mp4"), fallback="Scene 1 overran its 60s budget")
+
+    resumed = RenderCheckpoint("demo", str(tmp_path / "checkpoints"))
+    assert resumed.completed_clip(1, key) is None
+    assert resumed.progress() == (0, 3)
+
+
+def test_changed_scene_is_rendered_again(tmp_path):
+    checkpoint = RenderCheckpoint("demo", str(tmp_path / "checkpoints"))
+    checkpoint.start(VIDEO, OPTIONS)
+    checkpoint.complete(0, segment_key(VIDEO, 0, OPTIONS), make_clip(tmp_path, "part0.mp4"))
+
+    edited = dict(VIDEO, scenes=[dict(VIDEO["scenes"][0], title="Changed"), VIDEO["scenes"][1]])
+    assert checkpoint.completed_clip(0, segment_key(edited, 0, OPTIONS)) is None
+    # Encoding is applied to the joined video, so it does not invalidate clips
+    assert checkpoint.completed_clip(0, segment_key(dict(VIDEO, encoding_profile="hq"), 0, OPTIONS))
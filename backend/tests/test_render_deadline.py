@@ -0,0 +1,93 @@
+import pytest
+
+from render_deadline import DEGRADATIONS, DeadlinePlanner, predict_seconds
+from render_history import CostModel
+from render_options import make_render_options
+from scene_watchdog import SCENE_PROCESS_OVERHEAD
+
+pytestmark = pytest.mark.usefixtures("test_scene_types")
+
+# A cost model that has not seen any renders: static estimates, no correction
+MODEL = CostModel()
+
+
+def video(scenes=4):
+    return {
+        "output_name": "demo",
+        "scenes": [
+            {"type": "test_image_card", "voiceover": "word " * 30, "topic": f"Topic {i}", "duration": 4}
+            for i in range(scenes)
+        ],
+    }
+
+
+def predicted(json_content, **options):
+    return predict_seconds(json_content, make_render_options(**options), model=MODEL)
+
+
+def test_each_degradation_lowers_the_prediction():
+    json_content = video()
+    full = predicted(json_content)
+    assert predicted(json_content, placeholder_images=True) < full
+    assert predicted(json_content, frame_rate=8) < full
+    assert predicted(json_content, hold_scale=0.5) < full
+    assert predicted(json_content, isolate_scenes=True) == pytest.approx(full + SCENE_PROCESS_OVERHEAD * 5)
+
+
+def test_prediction_covers_only_the_remaining_scenes():
+    json_content = video()
+    assert predict_seconds(json_content, make_render_options(), 2, MODEL) < predicted(json_content)
+
+
+def test_generous_deadline_keeps_full_quality():
+    json_content = video()
+    options = make_render_options()
+    planner = DeadlinePlanner(json_content, options, 10 * predicted(json_content), model=MODEL)
+    assert planner.degradations == []
+    assert planner.options == options
+    assert planner.report()["met"]
+
+
+def test_degrades_cheapest_loss_first_until_the_prediction_fits():
+    json_content = video()
+    budget = predicted(json_content, placeholder_images=True) + 0.01
+    planner = DeadlinePlanner(json_content, make_render_options(), budget, model=MODEL)
+    assert [d["option"] for d in planner.degradations] == ["placeholder_images"]
+    assert planner.options["placeholder_images"] is True
+    assert planner.options["frame_rate"] is None
+    degradation = planner.degradations[0]
+    assert degradation["predicted_seconds_after"] < degradation["predicted_seconds"]
+
+
+def test_impossible_deadline_applies_every_degradation():
+    planner = DeadlinePlanner(video(), make_render_options(), 0.001, model=MODEL)
+    applied = [(d["option"], d["value"]) for d in planner.degradations]
+    assert applied == list(DEGRADATIONS)
+    assert planner.options["frame_rate"] == 8
+    assert planner.options["hold_scale"] == 0.25
+    report = planner.report()
+    assert report["predicted_seconds"] > report["deadline_seconds"]
+    assert report["render_options"] == planner.options
+    assert len(report["degradations"]) == len(DEGRADATIONS)
+
+
+def test_frame_rate_is_kept_when_clips_exist():
+    planner = DeadlinePlanner(video(), make_render_options(), 0.001, allow_frame_rate=False, model=MODEL)
+    assert "frame_rate" not in [d["option"] for d in planner.degradations]
+    assert planner.options["frame_rate"] is None
+
+
+def test_falling_behind_degrades_the_remaining_scenes():
+    json_content = video()
+    budget = predicted(json_content) + 1.0
+    planner = DeadlinePlanner(json_content, make_render_options(), budget, model=MODEL)
+    assert planner.options_for_scene(0)["placeholder_images"] is False
+
+    # The first two scenes took the whole budget
+    planner.started -= budget
+    options = planner.options_for_scene(2)
+    assert options["placeholder_images"] is True
+    assert options["hold_scale"] == 0.25
+    # Clips already rendered fix the frame rate
+    assert options["frame_rate"] is None
+    assert {d["from_scene"] for d in planner.degradations} == {2}
@@ -0,0 +1,124 @@
+import pytest
+
+from render_history import MIN_SAMPLES, CostModel, RenderHistory, scene_features
+from scene_types import estimate_scene_cost
+
+PREVIEW_OPTIONS = {"placeholder_images": True, "camera_moves": False, "hold_scale": 1.0}
+
+pytestmark = pytest.mark.usefixtures("test_scene_types")
+
+
+def card_scene(words, duration=3):
+    return {"type": "test_card", "voiceover": " ".join(["word"] * words), "duration": duration}
+
+
+def scene_record(scene, seconds, frame_rate=15, render_options=None, degraded=False):
+    return {
+        "kind": "scene",
+        "type": scene["type"],
+        "features": scene_features(scene, frame_rate, render_options),
+        "degraded": degraded,
+        "estimate": estimate_scene_cost(scene, frame_rate)["total_seconds"],
+        "seconds": seconds,
+        "error": None,
+    }
+
+
+def frames(scene, frame_rate=15):
+    return scene_features(scene, frame_rate)["frames"]
+
+
+def test_static_estimate_is_scaled_until_a_type_has_enough_samples():
+    scene = card_scene(20)
+    estimate = estimate_scene_cost(scene, 15)["total_seconds"]
+    records = [scene_record(card_scene(10 + i), 2 * estimate_scene_cost(card_scene(10 + i), 15)["total_seconds"])
+               for i in range(MIN_SAMPLES - 1)]
+    model = CostModel(records)
+    assert "test_card" not in model.coefficients
+    assert model.correction == pytest.approx(2.0)
+    assert model.predict_scene(scene, 15) == pytest.approx(2 * estimate)
+
+
+def test_degraded_renders_do_not_move_the_correction():
+    records = [scene_record(card_scene(10), 10.0)]
+    estimate = records[0]["estimate"]
+    records.append(scene_record(card_scene(10), 0.1, render_options=PREVIEW_OPTIONS, degraded=True))
+    assert CostModel(records).correction == pytest.approx(10.0 / estimate)
+
+
+def test_fit_learns_frames_and_render_options():
+    records = []
+    for i in range(3 * MIN_SAMPLES):
+        scene = card_scene(5 + 3 * i)
+        static = i % 2 == 1
+        options = PREVIEW_OPTIONS if static else None
+        # Full renders cost 0.1 s per frame; a static camera saves 2 s
+        seconds = 1.0 + 0.1 * frames(scene) - (2.0 if static else 0.0)
+        records.append(scene_record(scene, seconds, render_options=options, degraded=static))
+    model = CostModel(records)
+    assert "test_card" in model.coefficients
+
+    scene = card_scene(40)
+    assert model.predict_scene(scene, 15) == pytest.approx(1.0 + 0.1 * frames(scene), abs=0.1)
+    assert model.predict_scene(scene, 15, PREVIEW_OPTIONS) == pytest.approx(
+        1.0 + 0.1 * frames(scene) - 2.0, abs=0.1
+    )
+
+
+def test_encode_rate_is_learned_per_profile():
+    records = [
+        {"kind": "job", "frames": 100, "encoding_profile": "mobile", "phase_seconds": {"encode": 2.0}},
+        {"kind": "job", "frames": 100, "encoding_profile": "mobile", "phase_seconds": {"encode": 4.0}},
+        {"kind": "job", "frames": 100, "encoding_profile": "preview", "phase_seconds": {"encode": 0.5}},
+        # Segments are encoded as part of the joined video, not on their own
+        {"kind": "job", "frames": 100, "encoding_profile": "preview", "phase_seconds": {"encode": 50.0},
+         "segment": True},
+    ]
+    model = CostModel(records)
+    assert model.encode_rate("mobile") == pytest.approx(0.03)
+    assert model.encode_rate("preview") == pytest.approx(0.005)
+    # Profiles never timed fall back to the median over all profiles
+    assert model.encode_rate("hq") == pytest.approx(0.02)
+    assert CostModel().encode_rate("mobile") is None
+
+
+def test_predict_video_adds_encode_and_fetch():
+    records = [
+        {"kind": "job", "frames": 100, "encoding_profile": "mobile", "phase_seconds": {"encode": 1.0}},
+        {"kind": "job", "phase_seconds": {"fetch": 4.0, "llm": 20.0}},
+    ]
+    model = CostModel(records)
+    video = {"scenes": [card_scene(10), card_scene(20)], "encoding_profile": "mobile"}
+    prediction = model.predict_video(video, 15)
+    with_llm = model.predict_video(video, 15, include_llm=True)
+    assert len(prediction["scenes"]) == 2
+    assert prediction["encode_seconds"] > 0
+    assert with_llm["total_seconds"] == pytest.approx(prediction["total_seconds"] + 20.0)
+
+
+def test_history_round_trip(tmp_path):
+    history = RenderHistory(str(tmp_path / "history.jsonl"))
+    video = {"scenes": [card_scene(10)]}
+    plan = {
+        "output_name": "demo",
+        "frame_rate": 15,
+        "frames": 120,
+        "phase_seconds": {"encode": 1.2},
+        "scenes": [
+            {"index": 0, "type": "test_card", "wall_seconds": 3.0, "phase_seconds": {}, "error": None},
+            {"index": 1, "type": "goodbye", "wall_seconds": 1.0, "phase_seconds": {}, "error": None},
+        ],
+    }
+    history.record_render(video, plan, encoding_profile="preview", render_options=PREVIEW_OPTIONS)
+    history.record_phase("demo", "llm", 12.5)
+    with open(history.path, "a") as f:
+        f.write('{"kind": "scene", "cut sh')
+
+    records = history.records()
+    assert [record["kind"] for record in records] == ["scene", "job", "job"]
+    assert records[0]["degraded"] is True
+    assert records[0]["features"]["static_camera"] == 1
+    model = history.model()
+    assert model.phase_medians["llm"] == pytest.approx(12.5)
+    assert model.encode_rate("preview") == pytest.approx(0.01)
+    assert history.model() is model
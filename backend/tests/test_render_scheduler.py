@@ -0,0 +1,137 @@
+import sys
+
+import pytest
+
+import render_scheduler
+from render_scheduler import RenderRejected, RenderScheduler
+
+CAPACITY = {"cpu": 4.0, "memory_mb": 4000, "gl": 2, "in_process": 1}
+
+
+@pytest.fixture(autouse=True)
+def no_memory_probe(monkeypatch):
+    monkeypatch.setattr(render_scheduler, "read_available_memory_mb", lambda: None)
+
+
+def demand(seconds=10, cpu=1.5, memory_mb=700, gl=1, in_process=0):
+    return {"cpu": cpu, "memory_mb": memory_mb, "gl": gl, "in_process": in_process, "seconds": seconds}
+
+
+def test_admits_while_jobs_fit_then_queues():
+    scheduler = RenderScheduler(dict(CAPACITY))
+    assert scheduler.submit("a", demand())["status"] == "running"
+    assert scheduler.submit("b", demand())["status"] == "running"
+    # Both GL slots are taken
+    ticket = scheduler.submit("c", demand())
+    assert ticket["status"] == "queued"
+    assert ticket["position"] == 1
+    assert scheduler.load()["reserved"]["gl"] == 2
+
+    scheduler.release("a")
+    assert scheduler.status("c")["status"] == "running"
+    assert scheduler.status("a")["status"] == "finished"
+    assert scheduler.load()["reserved"]["gl"] == 2
+
+
+def test_job_larger_than_host_runs_alone():
+    scheduler = RenderScheduler(dict(CAPACITY))
+    assert scheduler.submit("huge", demand(memory_mb=10000))["status"] == "running"
+    assert scheduler.submit("small", demand())["status"] == "queued"
+    scheduler.release("huge")
+    assert scheduler.status("small")["status"] == "running"
+
+
+def test_head_of_queue_is_not_starved_by_smaller_jobs():
+    scheduler = RenderScheduler(dict(CAPACITY), policy="fifo")
+    scheduler.submit("a", demand(cpu=3))
+    scheduler.submit("big", demand(cpu=3))
+    scheduler.submit("small", demand(cpu=0.5))
+    # small would fit next to a, but big is ahead of it
+    assert scheduler.status("small")["status"] == "queued"
+    assert scheduler.status("big")["position"] == 1
+
+
+def test_shortest_job_first(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(render_scheduler.time, "time", lambda: clock[0])
+    scheduler = RenderScheduler(dict(CAPACITY, in_process=1))
+    scheduler.submit("running", demand(in_process=1))
+    scheduler.submit("long", demand(seconds=300, in_process=1))
+    scheduler.submit("short", demand(seconds=20, in_process=1))
+    assert scheduler.status("short")["position"] == 1
+    assert scheduler.status("long")["position"] == 2
+
+
+def test_waiting_jobs_age_ahead_of_newer_short_jobs(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(render_scheduler.time, "time", lambda: clock[0])
+    scheduler = RenderScheduler(dict(CAPACITY, in_process=1))
+    scheduler.submit("running", demand(in_process=1))
+    scheduler.submit("long", demand(seconds=300, in_process=1))
+    # A short job submitted once the long one has waited longer than the
+    # difference in predicted time queues behind it.
+    clock[0] += 300 / render_scheduler.AGING_RATE
+    scheduler.submit("short", demand(seconds=20, in_process=1))
+    assert scheduler.status("long")["position"] == 1
+    assert scheduler.status("short")["position"] == 2
+
+
+def test_rejects_when_queue_is_full():
+    scheduler = RenderScheduler(dict(CAPACITY), max_queue=1)
+    scheduler.submit("running", demand(in_process=1))
+    scheduler.submit("queued", demand(in_process=1))
+    ticket = scheduler.submit("rejected", demand(in_process=1))
+    assert ticket["status"] == "rejected"
+    assert ticket["retry_after"] >= render_scheduler.MIN_RETRY_AFTER
+    with pytest.raises(RenderRejected):
+        scheduler.ensure_room(1)
+
+
+def test_ensure_room_counts_the_jobs_to_come():
+    scheduler = RenderScheduler(dict(CAPACITY), max_queue=2)
+    scheduler.submit("running", demand(in_process=1))
+    scheduler.submit("queued", demand(in_process=1))
+    scheduler.ensure_room(1)
+    with pytest.raises(RenderRejected) as excinfo:
+        scheduler.ensure_room(2)
+    assert excinfo.value.retry_after >= render_scheduler.MIN_RETRY_AFTER
+
+
+def test_slot_times_out_and_leaves_the_queue():
+    scheduler = RenderScheduler(dict(CAPACITY))
+    scheduler.submit("running", demand(in_process=1))
+    with pytest.raises(RenderRejected):
+        with scheduler.slot("waiting", demand(in_process=1), timeout=0.01):
+            pass
+    assert scheduler.status("waiting")["status"] == "cancelled"
+    assert scheduler.load()["queued"] == 0
+
+
+def test_slot_releases_on_exit():
+    scheduler = RenderScheduler(dict(CAPACITY))
+    with scheduler.slot("preview", demand(in_process=1)):
+        assert scheduler.load()["reserved"]["in_process"] == 1
+    assert scheduler.load()["reserved"]["in_process"] == 0
+
+
+def test_failed_spawn_reserves_nothing(tmp_path):
+    scheduler = RenderScheduler(dict(CAPACITY))
+    ticket = scheduler.submit("broken", demand(), argv=[str(tmp_path / "missing-binary")])
+    assert ticket["status"] == "failed"
+    assert scheduler.wait("broken", timeout=0)
+    load = scheduler.load()
+    assert load["running"] == 0
+    assert all(value == 0 for value in load["reserved"].values())
+
+
+def test_subprocess_job_is_released_when_it_exits(monkeypatch, tmp_path):
+    monkeypatch.setattr(render_scheduler, "POLL_INTERVAL", 0.01)
+    scheduler = RenderScheduler(dict(CAPACITY))
+    log_path = tmp_path / "job.log"
+    ticket = scheduler.submit("job", demand(), argv=[sys.executable, "-c", "print('done')"], log_path=str(log_path))
+    assert ticket["status"] == "running"
+    monitor = scheduler._monitor
+    monitor.join(timeout=5)
+    assert scheduler.status("job")["status"] == "finished"
+    assert scheduler.load()["running"] == 0
+    assert log_path.read_text().strip() == "done"
@@ -0,0 +1,141 @@
+import pytest
+
+from scene_schemas import validate_scene, validate_video_json
+
+
+def title(**fields):
+    return dict({"type": "title", "main_text": "Hello", "voiceover": "Hello there."}, **fields)
+
+
+def video(*scenes, **fields):
+    return dict({"output_name": "demo", "scenes": list(scenes)}, **fields)
+
+
+def test_valid_video_needs_no_repairs():
+    json_content, repairs = validate_video_json(video(title()))
+    assert json_content["scenes"][0]["main_text"] == "Hello"
+    assert repairs == []
+
+
+def test_accepts_a_json_string():
+    json_content, _ = validate_video_json('{"scenes": [{"type": "title", "main_text": "A", "voiceover": "B"}]}')
+    assert json_content["scenes"][0]["type"] == "title"
+
+
+def test_defaults_are_filled_in():
+    scene = {"type": "image_text", "title": "T", "text": "Body", "voiceover": "V"}
+    normalized, errors, _ = validate_scene(scene)
+    assert errors == []
+    assert normalized["wikipedia_topic"] == "placeholder"
+    assert normalized["num_images"] == 1
+    assert normalized["duration"] == 5
+
+
+def test_wrong_shapes_are_repaired():
+    scene = {"type": "image_text", "title": 2024, "text": "Body", "voiceover": "V", "num_images": "2"}
+    normalized, errors, repairs = validate_scene(scene)
+    assert errors == []
+    assert normalized["title"] == "2024"
+    assert normalized["num_images"] == 2
+    assert len(repairs) == 2
+
+
+def test_reversed_highlight_lines_are_swapped():
+    scene = {
+        "type": "code",
+        "title": "Loop",
+        "code": "for i in range(3):\n    print(i)",
+        "intro": {"text": "A loop"},
+        "sections": [{"title": "Body", "highlight_start": 2, "highlight_end": 1, "voiceover": "Prints"}],
+        "conclusion": {"text": "Done"},
+    }
+    normalized, errors, repairs = validate_scene(scene)
+    assert errors == []
+    assert (normalized["sections"][0]["highlight_start"], normalized["sections"][0]["highlight_end"]) == (1, 2)
+    assert "swapped" in repairs[0]
+
+
+def test_invalid_optional_values_fall_back_instead_of_failing():
+    scene = {
+        "type": "image_text", "title": "T", "text": "Body", "voiceover": "V",
+        "num_images": 0, "duration": "soon",
+    }
+    normalized, errors, repairs = validate_scene(scene)
+    assert errors == []
+    assert normalized["num_images"] == 1
+    assert normalized["duration"] == 5
+    assert len(repairs) == 2
+
+
+def test_invalid_optional_values_without_default_are_dropped():
+    normalized, errors, repairs = validate_scene(title(subtitle=["not", "text"]))
+    assert errors == []
+    assert "subtitle" not in normalized
+    assert "dropped" in repairs[0]
+
+    concept_map = {"type": "visual_concept_map", "factors": [{"text": "Cost", "position": "middle"}]}
+    normalized, errors, _ = validate_scene(concept_map)
+    assert errors == []
+    assert normalized["factors"] == [{"text": "Cost"}]
+
+
+def test_video_level_optional_fields_are_lenient():
+    json_content, repairs = validate_video_json(video(title(), map_renderer="svg", deadline_at="never"))
+    assert "map_renderer" not in json_content
+    assert "deadline_at" not in json_content
+    assert len(repairs) == 2
+
+
+def test_every_unrepairable_problem_is_reported():
+    scenes = [
+        {"type": "title", "voiceover": "Missing main text"},
+        {"type": "no_such_type"},
+        "not a scene",
+        {"type": "image_text", "title": "T", "text": ["a"], "voiceover": "V"},
+    ]
+    with pytest.raises(ValueError) as excinfo:
+        validate_video_json(video(*scenes))
+    message = str(excinfo.value)
+    assert "(4 problems)" in message
+    assert "scenes[0].main_text: missing required field" in message
+    assert "scenes[1].type: unknown scene type 'no_such_type'" in message
+    assert "scenes[2]: expected an object" in message
+    assert "scenes[3].text: expected text" in message
+
+
+def test_video_needs_scenes():
+    with pytest.raises(ValueError, match="non-empty list of scenes"):
+        validate_video_json({"output_name": "empty", "scenes": []})
+
+
+def test_cross_field_checks():
+    sequence = {
+        "type": "sequence", "title": "Login", "actors": ["User", "Server"],
+        "interactions": [
+            {"type": "message", "from": "User", "to": "Database", "message": "query", "voiceover": "V"},
+            {"type": "message", "from": "User", "message": "hi", "voiceover": "V"},
+            {"type": "note", "from": "Server", "message": "thinks", "voiceover": "V"},
+        ],
+    }
+    _, errors, _ = validate_scene(sequence)
+    assert errors == [
+        "scene.interactions[0].to: unknown actor 'Database'",
+        "scene.interactions[1].to: missing required field",
+    ]
+
+    cycle = {
+        "type": "cycle_diagram", "voiceover": "V",
+        "boxes": [{"text": "A", "position": [0, 1]}],
+        "connections": [{"start_index": 0, "start_side": "top", "end_index": 3, "end_side": "left"}],
+    }
+    normalized, errors, _ = validate_scene(cycle)
+    assert normalized["boxes"][0]["position"] == [0, 1, 0]
+    assert errors == ["scene.connections[0].end_index: 3 is out of range for 1 boxes"]
+
+
+def test_internal_scene_types_are_not_accepted_from_users():
+    card = {"type": "fallback_card", "title": "Skipped"}
+    with pytest.raises(ValueError, match="unknown scene type 'fallback_card'"):
+        validate_video_json(video(card))
+    json_content, _ = validate_video_json(video(card), internal=True)
+    assert json_content["scenes"][0]["message"] == ""
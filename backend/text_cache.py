@@ -0,0 +1,127 @@
+"""
+Host-wide cache of the SVGs manim renders for Text/MarkupText and Tex.
+
+Last use is tracked explicitly: every time a render loads one of the cached
+SVGs its mtime is set to now (atime is useless on relatime/noatime mounts),
+and prune_text_cache evicts by that time. Pruning takes a file lock so only
+one process prunes at a time, but manim reads and writes the files without
+it. Files used within EVICTION_GRACE are never evicted, which covers a
+render that is running; a render that reuses an entry idle for longer than
+that can still lose it between manim's existence check and the read, and
+fails. The cache is therefore not strictly safe across processes.
+"""
+import fcntl
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from manim import SVGMobject, config
+
+DEFAULT_CACHE_DIR = "./media/text_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+# Files used this recently are never evicted, so a render running in
+# another process does not lose the SVGs it is working with.
+EVICTION_GRACE = 3600  # seconds
+LOCK_FILE = ".lock"
+
+logger = logging.getLogger(__name__)
+
+_cache_dirs = set()
+_tracking_lock = threading.Lock()
+
+
+def _touch_if_cached(path):
+    """Mark a cached SVG as used now"""
+    path = os.path.abspath(path)
+    if os.path.dirname(path) in _cache_dirs:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def _track_svg_use():
+    """Wrap SVGMobject.get_file_path once so every SVG manim loads from the cache is touched"""
+    get_file_path = SVGMobject.get_file_path
+    if getattr(get_file_path, "tracks_text_cache", False):
+        return
+
+    def tracked_get_file_path(self):
+        path = get_file_path(self)
+        _touch_if_cached(path)
+        return path
+
+    tracked_get_file_path.tracks_text_cache = True
+    SVGMobject.get_file_path = tracked_get_file_path
+
+
+def configure_text_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Point manim's Text/MarkupText and Tex output at a host-wide cache.
+
+    Manim already names these files after a hash of everything that affects
+    the output (string, font, size, weight, color, tex template, ...) and
+    reuses a file when it exists, so sharing the directories between jobs is
+    enough for common labels to be rasterized only once.
+    """
+    text_dir = os.path.join(cache_dir, "texts")
+    tex_dir = os.path.join(cache_dir, "tex")
+    os.makedirs(text_dir, exist_ok=True)
+    os.makedirs(tex_dir, exist_ok=True)
+    config.text_dir = os.path.abspath(text_dir)
+    config.tex_dir = os.path.abspath(tex_dir)
+    with _tracking_lock:
+        _cache_dirs.update((config.text_dir, config.tex_dir))
+        _track_svg_use()
+
+
+def _cache_entries(cache_dir):
+    """Group cache files by hash, since one Tex string leaves .tex/.dvi/.svg/... behind"""
+    entries = defaultdict(lambda: {"paths": [], "size": 0, "last_used": 0})
+    for subdir in ("texts", "tex"):
+        directory = os.path.join(cache_dir, subdir)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entry = entries[(subdir, name.split(".", 1)[0])]
+            entry["paths"].append(path)
+            entry["size"] += stat.st_size
+            # mtime is the creation time or the last use recorded by _touch_if_cached
+            entry["last_used"] = max(entry["last_used"], stat.st_mtime)
+    return entries
+
+
+def prune_text_cache(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Evict the least recently used text/tex files until the cache fits in max_bytes"""
+    if not os.path.isdir(cache_dir):
+        return
+    with open(os.path.join(cache_dir, LOCK_FILE), "w") as lock:
+        # Only one process prunes at a time; renders never take the lock.
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            entries = _cache_entries(cache_dir)
+            total = sum(entry["size"] for entry in entries.values())
+            if total <= max_bytes:
+                return
+
+            cutoff = time.time() - EVICTION_GRACE
+            freed = 0
+            for entry in sorted(entries.values(), key=lambda entry: entry["last_used"]):
+                if total - freed <= max_bytes or entry["last_used"] > cutoff:
+                    break
+                for path in entry["paths"]:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                freed += entry["size"]
+            logger.info(f"Pruned {freed} bytes from text cache ({total - freed} bytes left)")
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
@@ -10,6 +10,8 @@ import io
 from PIL import Image
 from typing import Optional 
 from manim.opengl import *
+from image_store import get_image_store
+from image_service import get_image_service
 
 class TimelineAnimation(VoiceoverScene, MovingCameraScene):
     def __init__(self):
@@ -20,7 +22,7 @@ class TimelineAnimation(VoiceoverScene, MovingCameraScene):
     
     def get_wikimedia_image(self, search_term: str) -> Optional[str]:
         """
-        Improved image fetcher from Wikimedia with better error handling and file management.
+        Fetch an image for a search term through the shared image service.
         
         Args:
             search_term: Term to search for images on Wikimedia
@@ -28,115 +30,7 @@ class TimelineAnimation(VoiceoverScene, MovingCameraScene):
         Returns:
             Path to downloaded image file or None if failed
         """
-        print(f"Searching Wikimedia for: {search_term}")
-        
-        try:
-            # Step 1: Search Wikipedia for relevant articles
-            search_params = {
-                "action": "query",
-                "format": "json",
-                "list": "search",
-                "srsearch": search_term,
-                "srlimit": 3
-            }
-            
-            response = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params=search_params,
-                headers=self.headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data.get('query', {}).get('search'):
-                print("No matching articles found")
-                return None
-                
-            article_title = data['query']['search'][0]['title']
-            print(f"Found article: {article_title}")
-            
-            # Step 2: Get images from the article
-            img_params = {
-                "action": "query",
-                "format": "json",
-                "titles": article_title,
-                "prop": "images",
-                "imlimit": 10
-            }
-            
-            img_response = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params=img_params,
-                headers=self.headers
-            )
-            img_response.raise_for_status()
-            img_data = img_response.json()
-            
-            pages = img_data['query']['pages']
-            page_id = list(pages.keys())[0]
-            
-            if 'images' not in pages[page_id]:
-                print("No images in article")
-                return None
-                
-            # Filter out SVGs and logos
-            image_titles = [
-                img['title'] for img in pages[page_id]['images']
-                if not img['title'].lower().endswith('.svg')
-                and 'logo' not in img['title'].lower()
-                and 'icon' not in img['title'].lower()
-            ]
-            
-            if not image_titles:
-                print("No suitable images found")
-                return None
-                
-            # Step 3: Get image URL
-            img_info_params = {
-                "action": "query",
-                "format": "json",
-                "titles": image_titles[0],
-                "prop": "imageinfo",
-                "iiprop": "url"
-            }
-            
-            img_info_response = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params=img_info_params,
-                headers=self.headers
-            )
-            img_info_response.raise_for_status()
-            img_info_data = img_info_response.json()
-            
-            img_info_pages = img_info_data['query']['pages']
-            img_info_id = list(img_info_pages.keys())[0]
-            
-            if 'imageinfo' not in img_info_pages[img_info_id]:
-                print("No image info available")
-                return None
-                
-            img_url = img_info_pages[img_info_id]['imageinfo'][0]['url']
-            print(f"Found image URL: {img_url}")
-            
-            # Step 4: Download and process image
-            img_response = requests.get(img_url, headers=self.headers)
-            img_response.raise_for_status()
-            
-            # Convert to RGB if needed and save as PNG
-            with Image.open(io.BytesIO(img_response.content)) as img:
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                temp_dir = tempfile.mkdtemp()
-                temp_path = os.path.join(temp_dir, f"wikimedia_{hash(search_term)}.png")
-                img.save(temp_path, format="PNG")
-                
-                print(f"Image saved to: {temp_path}")
-                return temp_path
-                
-        except Exception as e:
-            print(f"Error fetching Wikimedia image: {e}")
-            return None
+        return get_image_service().get_image(search_term)
     
     def create_image_mobject(self, image_path: str, scale_factor: float = 0.5, fixed_height: float = 1.5) -> ImageMobject:
         """
@@ -168,13 +62,13 @@ class TimelineAnimation(VoiceoverScene, MovingCameraScene):
                 new_height = int(fixed_height * 100)
                 resized_img = img.resize((new_width, new_height), Image.LANCZOS)
 
-                # Save resized image to a temporary file
-                temp_dir = tempfile.mkdtemp()
-                temp_path = os.path.join(temp_dir, f"resized_{hash(image_path)}.png")
-                resized_img.save(temp_path, format="PNG")
+                # Save resized image into the shared image store
+                buffer = io.BytesIO()
+                resized_img.save(buffer, format="PNG")
+                resized_path = get_image_store().add(buffer.getvalue())
 
             # Create Manim ImageMobject
-            img_mobject = OpenGLImageMobject(temp_path)
+            img_mobject = OpenGLImageMobject(resized_path)
             img_mobject.height = fixed_height  # Set consistent height
             img_mobject.scale(scale_factor)
 
@@ -1,3 +1,4 @@
+import copy
 import os
 import shutil
 import tempfile
@@ -7,18 +8,148 @@ from manim.mobject.types.image_mobject import ImageMobject
 from PIL import Image
 import numpy as np
 from manim.opengl import *
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+from image_store import find_image_store
+from text_cache import configure_text_cache, prune_text_cache
+
+MAX_CACHED_TEXTURES = 64
+
+_texture_images = OrderedDict()
+_texture_images_lock = threading.Lock()
+
+
+def get_texture_image(path):
+    """
+    Return a shared RGBA PIL image for a file, decoding it at most once per
+    process.
+
+    Stored images are built from the image store's pre-decoded RGBA data;
+    other files (backgrounds, bundled resources) are decoded on first use.
+    The same image object is returned for repeated loads, so the OpenGL
+    renderer's texture cache (keyed by image object) also reuses the uploaded
+    texture.
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    with _texture_images_lock:
+        if key in _texture_images:
+            _texture_images.move_to_end(key)
+            return _texture_images[key]
+
+    store = find_image_store(path)
+    if store is not None and store.get_entry(path) is not None:
+        pixels = store.load_normalized(path)
+        height, width = pixels.shape[:2]
+        image = Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+    else:
+        with Image.open(path) as img:
+            image = img.convert("RGBA")
+
+    with _texture_images_lock:
+        _texture_images[key] = image
+        while len(_texture_images) > MAX_CACHED_TEXTURES:
+            _texture_images.popitem(last=False)
+    return image
+
+
+class CachedImageMobject(OpenGLImageMobject):
+    """OpenGLImageMobject that takes its texture from the shared texture cache instead of decoding the file"""
+
+    def __init__(self, filename, **kwargs):
+        self.texture_image = get_texture_image(filename)
+        super().__init__(filename, **kwargs)
+
+    def get_image_from_file(self, image_file, image_mode):
+        if self.texture_image.mode == image_mode:
+            return self.texture_image
+        return self.texture_image.convert(image_mode)
+
+
+_backgrounds = {}
+_backgrounds_lock = threading.Lock()
+
+
+def get_background_mobject(path):
+    """
+    Return a full-frame background image fixed in the camera frame.
+
+    One prototype is built per file and frame size and copied for each scene,
+    so the image is decoded, meshed and uploaded once per worker: the copies
+    share the prototype's PIL images, and the OpenGL renderer keys its
+    textures by image object. Because the
+    background is fixed in frame it stays put under camera moves and zooms,
+    and never needs to be larger than the frame itself.
+    """
+    key = (os.path.abspath(path), os.path.getmtime(path), config.frame_width, config.frame_height)
+    with _backgrounds_lock:
+        prototype = _backgrounds.get(key)
+    if prototype is None:
+        prototype = CachedImageMobject(path)
+        # Cover the whole frame, cropping whichever side overflows.
+        prototype.scale(max(config.frame_width / prototype.width, config.frame_height / prototype.height))
+        prototype.move_to(ORIGIN)
+        prototype.fix_in_frame()
+        with _backgrounds_lock:
+            _backgrounds[key] = prototype
+    return _copy_sharing_images(prototype)
+
+
+def _copy_sharing_images(mobject):
+    """Deep copy of an image mobject that keeps its texture images instead of copying them"""
+    images = [mobject.texture_image, *mobject.texture_paths.values()]
+    memo = {id(image): image for image in images}
+    # As OpenGLMobject.deepcopy: the copy does not belong to the prototype's parents
+    parents = mobject.parents
+    mobject.parents = []
+    try:
+        return copy.deepcopy(mobject, memo)
+    finally:
+        mobject.parents = parents
+
+
+@contextmanager
+def still_frame_output(renderer):
+    """
+    Read the frame back from the GPU once and reuse those bytes for every frame
+    written inside the block.
+
+    Meant for frozen-frame holds, where the OpenGL renderer draws the scene
+    once but still reads the framebuffer back for each of the fps * duration
+    frames it sends to ffmpeg.
+    """
+    read_frame = renderer.get_raw_frame_buffer_object_data
+    frames = {}
+
+    def read_frame_once(dtype="f1"):
+        if dtype not in frames:
+            frames[dtype] = read_frame(dtype)
+        return frames[dtype]
+
+    renderer.get_raw_frame_buffer_object_data = read_frame_once
+    try:
+        yield
+    finally:
+        del renderer.get_raw_frame_buffer_object_data
 
 
 class VideoUtils:
     """Utility methods for video generation"""
     
     def add_background(self, path):
-        """Add a background image to the scene"""
+        """Add a shared full-frame background image behind everything else in the scene"""
         try:
-            background = OpenGLImageMobject(path)
-            self.add(background)
+            background = get_background_mobject(path)
         except OSError as e:
             print(f"Error loading background image: {e}")
+            return None
+        self.add(background)
+        self.bring_to_back(background)
+        return background
+
+    def load_image(self, path):
+        """Create an image mobject, using the pre-decoded store copy when available"""
+        return CachedImageMobject(path)
 
     def wrap_text(self, text, max_chars_per_line):
         """Return wrapped text as a string with newlines"""
@@ -93,6 +224,7 @@ class VideoUtils:
         config.tex_template = "custom_template.tex"
         
         config.partial_movie_dir = os.path.join(config.video_dir, "partial_movie_files", output_name)
+        configure_text_cache()
         
         print(f"Current config output_file: {config.output_file}")
         print(f"Using scene name: {output_name}")
@@ -113,10 +245,10 @@ class VideoUtils:
 
     def cleanup_temp_files(self, output_name):
         """Clean up temporary files after rendering"""
+        # Text/Tex output lives in the shared text cache and is only pruned by size.
+        prune_text_cache()
         temp_files = [
             f"{output_name}.log",
-            f"media/tex_files/{output_name}",
-            f"media/texts/{output_name}"
         ]
         
         for f in temp_files:
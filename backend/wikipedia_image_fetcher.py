@@ -1,9 +1,13 @@
 import os
 import requests
 from PIL import Image
-import cairosvg
 import concurrent.futures
 import logging
+import threading
+from image_store import DEFAULT_SVG_RASTER_WIDTH, get_image_store
+
+DEFAULT_HEDGE_AFTER = 2.0  # seconds before Openverse is queried alongside Wikipedia
+DEFAULT_REQUEST_TIMEOUT = 10  # seconds
 
 # Set up logging
 logging.basicConfig(
@@ -15,14 +19,37 @@ logging.basicConfig(
     ]
 )
 
+def _record_error(errors, error):
+    """Note a failed request, so a short result is not mistaken for a source having nothing more"""
+    if errors is not None:
+        errors.append(str(error))
+
+
 class WikipediaImageFetcher:
-    def __init__(self, headers=None):
+    def __init__(self, headers=None, store=None, hedge_after=DEFAULT_HEDGE_AFTER,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, session=None,
+                 svg_raster_width=DEFAULT_SVG_RASTER_WIDTH):
+        """
+        Args:
+            headers: HTTP headers sent to Wikipedia and image hosts.
+            store: ImageStore to download into; defaults to the shared store for save_dir.
+            hedge_after: Seconds to wait for Wikipedia before starting Openverse in
+                parallel. None disables hedging and only falls back once Wikipedia is done.
+            request_timeout: Timeout in seconds for every HTTP request.
+            session: requests.Session to reuse pooled keep-alive connections from.
+            svg_raster_width: Pixel width SVG results are rasterized to.
+        """
         self.headers = headers or {
             'User-Agent': 'DocVideoMaker/1.0 (https://example.com; contact@example.com)'
         }
+        self.store = store
+        self.hedge_after = hedge_after
+        self.request_timeout = request_timeout
+        self.session = session or requests.Session()
+        self.svg_raster_width = svg_raster_width
         self.logger = logging.getLogger(__name__)
 
-    def _get_openverse_images(self, query, num_images=2):
+    def _get_openverse_images(self, query, num_images=2, errors=None):
         """Private method to get images from Openverse as fallback"""
         self.logger.info(f"Attempting Openverse fallback for query: {query}")
         url = "https://api.openverse.engineering/v1/images/"
@@ -33,7 +60,8 @@ class WikipediaImageFetcher:
         }
         
         try:
-            response = requests.get(url, params=params, headers={"Accept": "application/json"})
+            response = self.session.get(url, params=params, headers={"Accept": "application/json"},
+                                    timeout=self.request_timeout)
             response.raise_for_status()
             data = response.json()
             
@@ -46,47 +74,87 @@ class WikipediaImageFetcher:
             return image_urls
         except Exception as e:
             self.logger.error(f"Openverse API error: {e}")
+            _record_error(errors, e)
             return []
 
-    def _download_image(self, url, save_dir):
-        """Helper method to download and verify an image"""
+    def _download_image(self, url, save_dir, errors=None):
+        """Helper method to download and verify an image into the shared image store"""
+        store = self.store or get_image_store(save_dir)
+        if os.path.basename(url).lower().endswith(".svg"):
+            return self._download_svg(url, store, errors)
+
+        cached_path = store.lookup_url(url)
+        if cached_path:
+            self.logger.info(f"Image already stored for URL: {url}")
+            return cached_path
+
         self.logger.info(f"Downloading image from URL: {url}")
         try:
-            file_name = os.path.basename(url)
-            save_path = os.path.join(save_dir, file_name)
-            
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers, timeout=self.request_timeout)
             response.raise_for_status()
-            
-            with open(save_path, "wb") as img_file:
-                img_file.write(response.content)
-
-            # Handle SVG conversion
-            if file_name.lower().endswith(".svg"):
-                self.logger.info("Converting SVG to PNG")
-                png_path = save_path.rsplit('.', 1)[0] + '.png'
-                cairosvg.svg2png(url=save_path, write_to=png_path)
-                os.unlink(save_path)
-                save_path = png_path
-
-            # Verify the image
-            with Image.open(save_path) as img:
-                img.verify()
-            
-            self.logger.info(f"Successfully downloaded image to: {save_path}")
+
+            save_path = store.add(response.content, source_url=url)
+            if save_path:
+                self.logger.info(f"Successfully downloaded image to: {save_path}")
             return save_path
         except Exception as e:
             self.logger.error(f"Error processing image: {e}")
-            if os.path.exists(save_path):
-                os.unlink(save_path)
+            _record_error(errors, e)
             return None
 
-    def get_wikipedia_images(self, article_title, num_images=2, save_dir="./downloaded_images"):
-        """Original method with Openverse fallback added"""
-        self.logger.info(f"Starting image fetch for: {article_title}")
-        os.makedirs(save_dir, exist_ok=True)
+    def _download_svg(self, url, store, errors=None):
+        """Fetch an SVG once and return a PNG rasterized at svg_raster_width"""
+        try:
+            svg_digest = store.lookup_svg(url)
+            if svg_digest is None:
+                self.logger.info(f"Downloading SVG from URL: {url}")
+                response = self.session.get(url, headers=self.headers, timeout=self.request_timeout)
+                response.raise_for_status()
+                svg_digest = store.add_svg(response.content, source_url=url)
+            else:
+                self.logger.info(f"SVG already stored for URL: {url}")
 
-        # First try Wikipedia (your original code)
+            save_path = store.rasterize_svg(svg_digest, self.svg_raster_width)
+            if save_path:
+                self.logger.info(f"SVG available as PNG at: {save_path}")
+            return save_path
+        except Exception as e:
+            self.logger.error(f"Error processing SVG: {e}")
+            _record_error(errors, e)
+            return None
+
+    def _download_all(self, urls, save_dir, cancelled, errors=None):
+        """Download several image URLs in parallel, skipping work once cancelled"""
+        if not urls:
+            return []
+
+        def download(url):
+            if cancelled.is_set():
+                return None
+            return self._download_image(url, save_dir, errors)
+
+        image_paths = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(5, len(urls))) as executor:
+            for path in executor.map(download, urls):
+                if path:
+                    image_paths.append(path)
+        return image_paths
+
+    def _fetch_openverse_images(self, query, num_images, save_dir, cancelled, errors=None):
+        """Query Openverse and download its results"""
+        if cancelled.is_set():
+            return []
+        urls = self._get_openverse_images(query, num_images, errors)
+        image_paths = self._download_all(urls, save_dir, cancelled, errors)
+        self.logger.info(f"Got {len(image_paths)} images from Openverse for: {query}")
+        return image_paths
+
+    def _fetch_wikipedia_images(self, article_title, num_images, save_dir, cancelled, errors=None):
+        """
+        Resolve an article (falling back to a search) and download up to
+        num_images of its images. Returns (resolved_title, image_paths).
+        Failed API requests raise; failed image requests are added to errors.
+        """
         url = "https://en.wikipedia.org/w/api.php"
         params = {
             "action": "query",
@@ -97,7 +165,8 @@ class WikipediaImageFetcher:
         }
 
         self.logger.info("Making initial Wikipedia API request")
-        response = requests.get(url, params=params, headers=self.headers)
+        response = self.session.get(url, params=params, headers=self.headers, timeout=self.request_timeout)
+        response.raise_for_status()
         data = response.json()
         self.logger.debug(f"Initial Wikipedia response: {data}")
 
@@ -105,10 +174,11 @@ class WikipediaImageFetcher:
         page_id = list(pages.keys())[0] if pages else None
 
         if not page_id or "missing" in pages[page_id]:
+            if cancelled.is_set():
+                return article_title, []
             self.logger.warning(f"No article found for topic: {article_title}")
             self.logger.info("Searching for related articles...")
-            
-            search_url = "https://en.wikipedia.org/w/api.php"
+
             search_params = {
                 "action": "query",
                 "format": "json",
@@ -116,43 +186,35 @@ class WikipediaImageFetcher:
                 "srsearch": article_title,
                 "srlimit": 1
             }
-            
-            search_response = requests.get(search_url, params=search_params, headers=self.headers)
+
+            search_response = self.session.get(url, params=search_params, headers=self.headers,
+                                           timeout=self.request_timeout)
+            search_response.raise_for_status()
             search_data = search_response.json()
             self.logger.debug(f"Wikipedia search response: {search_data}")
 
-            if "query" in search_data and "search" in search_data["query"]:
-                article_title = search_data["query"]["search"][0]["title"]
-                self.logger.info(f"Using related article title: {article_title}")
-            else:
-                self.logger.warning(f"No related articles found, switching to Openverse fallback")
-                openverse_urls = self._get_openverse_images(article_title, num_images)
-                image_paths = []
-                for url in openverse_urls:
-                    path = self._download_image(url, save_dir)
-                    if path:
-                        image_paths.append(path)
-                self.logger.info(f"Returning {len(image_paths)} images from Openverse fallback")
-                return image_paths
-
-        params["titles"] = article_title
-        response = requests.get(url, params=params, headers=self.headers)
-        data = response.json()
-        self.logger.debug(f"Updated Wikipedia response: {data}")
+            search_results = search_data.get("query", {}).get("search", [])
+            if not search_results:
+                self.logger.warning(f"No related articles found for: {article_title}")
+                return article_title, []
+
+            article_title = search_results[0]["title"]
+            self.logger.info(f"Using related article title: {article_title}")
+
+            if cancelled.is_set():
+                return article_title, []
+            params["titles"] = article_title
+            response = self.session.get(url, params=params, headers=self.headers, timeout=self.request_timeout)
+            response.raise_for_status()
+            data = response.json()
+            self.logger.debug(f"Updated Wikipedia response: {data}")
+
+            pages = data.get("query", {}).get("pages", {})
+            page_id = list(pages.keys())[0] if pages else None
 
-        pages = data.get("query", {}).get("pages", {})
-        page_id = list(pages.keys())[0] if pages else None
         if not page_id or "images" not in pages[page_id]:
             self.logger.warning(f"No images found in article: {article_title}")
-            self.logger.info("Switching to Openverse fallback")
-            openverse_urls = self._get_openverse_images(article_title, num_images)
-            image_paths = []
-            for url in openverse_urls:
-                path = self._download_image(url, save_dir)
-                if path:
-                    image_paths.append(path)
-            self.logger.info(f"Returning {len(image_paths)} images from Openverse fallback")
-            return image_paths
+            return article_title, []
 
         # Include SVGs in the filtered image titles
         image_titles = [
@@ -162,9 +224,12 @@ class WikipediaImageFetcher:
         self.logger.info(f"Found {len(image_titles)} candidate images after filtering")
 
         image_titles = image_titles[:num_images]
-        image_paths = []
+        if not image_titles:
+            return article_title, []
 
         def download_single_image(title):
+            if cancelled.is_set():
+                return None
             self.logger.info(f"Processing image title: {title}")
             img_params = {
                 "action": "query",
@@ -174,39 +239,129 @@ class WikipediaImageFetcher:
                 "iiprop": "url"
             }
 
-            img_response = requests.get(url, params=img_params, headers=self.headers)
+            img_response = self.session.get(url, params=img_params, headers=self.headers,
+                                        timeout=self.request_timeout)
+            img_response.raise_for_status()
             img_data = img_response.json()
             self.logger.debug(f"Image URL response: {img_data}")
 
             img_pages = img_data.get("query", {}).get("pages", {})
             img_id = list(img_pages.keys())[0] if img_pages else None
-            if img_id and "imageinfo" in img_pages[img_id]:
+            if img_id and "imageinfo" in img_pages[img_id] and not cancelled.is_set():
                 img_url = img_pages[img_id]["imageinfo"][0]["url"]
                 self.logger.info(f"Found image URL: {img_url}")
-                return self._download_image(img_url, save_dir)
+                return self._download_image(img_url, save_dir, errors)
             return None
 
+        image_paths = []
         # Use ThreadPoolExecutor for parallel downloads
         with concurrent.futures.ThreadPoolExecutor(max_workers=min(5, len(image_titles))) as executor:
             future_to_title = {executor.submit(download_single_image, title): title for title in image_titles}
-            
+
             for future in concurrent.futures.as_completed(future_to_title):
-                result = future.result()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error processing image {future_to_title[future]}: {e}")
+                    _record_error(errors, e)
+                    continue
                 if result:
                     image_paths.append(result)
                     self.logger.info(f"Successfully processed image: {result}")
 
-        # If we didn't get enough images from Wikipedia, try Openverse
+        return article_title, image_paths
+
+    def _get_images_sequential(self, article_title, num_images, save_dir, errors=None):
+        """Wikipedia first, then Openverse for whatever is still missing"""
+        cancelled = threading.Event()
+        try:
+            resolved_title, image_paths = self._fetch_wikipedia_images(
+                article_title, num_images, save_dir, cancelled, errors
+            )
+        except Exception as e:
+            self.logger.error(f"Wikipedia lookup failed for {article_title}: {e}")
+            _record_error(errors, e)
+            resolved_title, image_paths = article_title, []
+
         if len(image_paths) < num_images:
             needed = num_images - len(image_paths)
             self.logger.info(f"Only got {len(image_paths)} images from Wikipedia, need {needed} more")
-            self.logger.info("Attempting Openverse fallback for remaining images")
-            openverse_urls = self._get_openverse_images(article_title, needed)
-            for url in openverse_urls:
-                path = self._download_image(url, save_dir)
-                if path:
-                    image_paths.append(path)
-                    self.logger.info(f"Added fallback image: {path}")
+            image_paths += self._fetch_openverse_images(resolved_title, needed, save_dir, cancelled, errors)
+        return image_paths
+
+    def _get_images_hedged(self, article_title, num_images, save_dir, errors=None):
+        """
+        Start Wikipedia immediately and Openverse once hedge_after seconds have
+        passed without a full result. The first source that delivers num_images
+        wins and the other is told to stop; if neither does, results are merged.
+        """
+        wikipedia_cancelled = threading.Event()
+        openverse_cancelled = threading.Event()
+        # Not used as a context manager: the losing lookup must not hold up the caller.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            wikipedia_future = executor.submit(
+                self._fetch_wikipedia_images, article_title, num_images, save_dir, wikipedia_cancelled, errors
+            )
+            results = {}
+
+            def collect(future):
+                try:
+                    value = future.result()
+                except Exception as e:
+                    self.logger.error(f"Image lookup failed for {article_title}: {e}")
+                    _record_error(errors, e)
+                    return []
+                return value[1] if future is wikipedia_future else value
+
+            done, _ = concurrent.futures.wait([wikipedia_future], timeout=self.hedge_after)
+            if done:
+                results[wikipedia_future] = collect(wikipedia_future)
+                if len(results[wikipedia_future]) >= num_images:
+                    return results[wikipedia_future][:num_images]
+            else:
+                self.logger.info(f"Wikipedia slower than {self.hedge_after}s for {article_title}, hedging with Openverse")
+
+            openverse_future = executor.submit(
+                self._fetch_openverse_images, article_title, num_images, save_dir, openverse_cancelled, errors
+            )
+            pending = {openverse_future} | ({wikipedia_future} - set(results))
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    results[future] = collect(future)
+                    if len(results[future]) >= num_images:
+                        winner = "Wikipedia" if future is wikipedia_future else "Openverse"
+                        self.logger.info(f"{winner} won the hedged lookup for {article_title}")
+                        wikipedia_cancelled.set()
+                        openverse_cancelled.set()
+                        return results[future][:num_images]
+
+            merged = results.get(wikipedia_future, []) + results.get(openverse_future, [])
+            return merged[:num_images]
+        finally:
+            executor.shutdown(wait=False)
+
+    def fetch_images(self, article_title, num_images=2, save_dir="./downloaded_images"):
+        """
+        Fetch images for a topic and return (image_paths, complete).
+
+        complete is False when any request failed (timeouts, rate limits,
+        server errors), so fewer than num_images paths may only mean a
+        source was unavailable rather than that it has nothing more.
+        """
+        self.logger.info(f"Starting image fetch for: {article_title}")
+        os.makedirs(save_dir, exist_ok=True)
+
+        errors = []
+        if self.hedge_after is None:
+            image_paths = self._get_images_sequential(article_title, num_images, save_dir, errors)
+        else:
+            image_paths = self._get_images_hedged(article_title, num_images, save_dir, errors)
 
         self.logger.info(f"Final image count: {len(image_paths)}")
-        return image_paths[:num_images]
\ No newline at end of file
+        return image_paths[:num_images], not errors
+
+    def get_wikipedia_images(self, article_title, num_images=2, save_dir="./downloaded_images"):
+        """Fetch images for a topic from Wikipedia with Openverse as a fallback or hedge"""
+        return self.fetch_images(article_title, num_images, save_dir)[0]